@@ -294,6 +294,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "products": {
+            "handlers": ["console", "scheduler_file"],
+            "level": "INFO",
+            "propagate": False,
+        },
         "apscheduler": {
             "handlers": ["console", "scheduler_file"],
             "level": "INFO",
@@ -0,0 +1,140 @@
+import numpy as np
+
+from products.simulation import PRODUCT_TYPES, get_derived_matrix, top_n_indices
+
+# 금리 점수 (최대 40점): 최고 금리 x 4
+RATE_WEIGHT = 4.0
+MAX_RATE_SCORE = 40.0
+# 투자 성향 점수 (최대 30점): 상품 종류별
+TENDENCY_SCORES = {
+    "deposit": {"stable": 30, "stable_seeking": 25, "neutral": 20, "active_investment": 17, "aggressive": 15},
+    "saving": {"stable": 25, "stable_seeking": 30, "neutral": 25, "active_investment": 22, "aggressive": 20},
+}
+# 투자 기간 점수 (최대 20점): 희망 기간과 같으면 20점, 기간 차이(개월)만큼 감점
+MAX_TERM_SCORE = 20.0
+TERM_PENALTY_PER_MONTH = 20.0 / 24
+# 금액 점수 (최대 10점): 한도가 없거나 투자 가능 금액이 한도 안이면 10점, 넘으면 한도 비율만큼
+MAX_AMOUNT_SCORE = 10.0
+# 가입제한 감점 (1:제한없음, 2:서민전용, 3:일부제한)
+JOIN_DENY_PENALTY = {"2": 10.0, "3": 5.0}
+
+
+class OptionFeatureMatrix:
+    """
+    예금/적금 전체 옵션의 추천 점수 계산용 특성 행렬 (열 단위 NumPy 배열).
+    시뮬레이션의 금리 행렬(RateMatrix)을 이어 붙여 만들고, 같은 상품의 옵션이 연속되도록
+    (상품 종류, 상품 코드, 옵션 ID) 순으로 정렬해 둡니다.
+    """
+
+    def __init__(self, matrices):
+        parts = [matrices[product_type] for product_type in PRODUCT_TYPES]
+        product_types = np.concatenate(
+            [np.full(len(part), part.product_type, dtype=object) for part in parts]
+        )
+        option_ids = np.concatenate([part.option_ids for part in parts])
+        product_codes = np.concatenate([part.product_codes for part in parts])
+        order = np.array(
+            sorted(
+                range(len(option_ids)),
+                key=lambda index: (product_types[index], product_codes[index], option_ids[index]),
+            ),
+            dtype=np.int64,
+        )
+
+        def column(name):
+            return np.concatenate([getattr(part, name) for part in parts])[order]
+
+        self.product_types = product_types[order]
+        self.is_saving = self.product_types == "saving"
+        self.option_ids = option_ids[order]
+        self.product_codes = product_codes[order]
+        self.product_names = column("product_names")
+        self.company_names = column("company_names")
+        self.terms = column("terms")
+        self.compound = column("compound")
+        self.intr_rate = column("intr_rate")
+        # 최고 금리: 최고 우대금리와 기본 금리 중 큰 값 (둘 다 없으면 NaN)
+        self.best_rate = np.fmax(self.intr_rate, column("intr_rate2"))
+        self.max_limit = column("max_limits")
+        self.join_penalty = np.array(
+            [JOIN_DENY_PENALTY.get(join_deny, 0.0) for join_deny in column("join_deny")], dtype=np.float64
+        )
+        # 금리가 없는 옵션은 후보에서 제외
+        self.valid = ~np.isnan(self.best_rate)
+        # 상품별 옵션 구간의 시작 위치 (np.maximum.reduceat 용)
+        keys = list(zip(self.product_types, self.product_codes))
+        self.group_starts = np.array(
+            [index for index, key in enumerate(keys) if index == 0 or key != keys[index - 1]], dtype=np.int64
+        )
+        self.group_ends = np.append(self.group_starts[1:], len(keys)).astype(np.int64)
+
+    def __len__(self):
+        return len(self.option_ids)
+
+    def score(self, tendency=None, term=None, amount=None):
+        """
+        프로필 하나에 대한 전체 옵션 점수 (금리 40 + 투자 성향 30 + 기간 20 + 금액 10 - 가입제한 감점).
+        금리가 없는 옵션은 -inf
+        """
+        scores = np.minimum(self.best_rate * RATE_WEIGHT, MAX_RATE_SCORE)
+        if tendency:
+            scores += np.where(
+                self.is_saving,
+                TENDENCY_SCORES["saving"].get(tendency, 0),
+                TENDENCY_SCORES["deposit"].get(tendency, 0),
+            )
+        if term:
+            scores += np.maximum(MAX_TERM_SCORE - np.abs(self.terms - term) * TERM_PENALTY_PER_MONTH, 0.0)
+        if amount:
+            scores += MAX_AMOUNT_SCORE * np.minimum(self.max_limit / amount, 1.0)
+        else:
+            scores += MAX_AMOUNT_SCORE
+        scores -= self.join_penalty
+        return np.where(self.valid, scores, -np.inf)
+
+    def top_products(self, scores, limit):
+        """
+        상품별 최고 점수 옵션 하나씩, 점수가 높은 상위 limit 개 옵션의 인덱스.
+        상품별 최댓값은 reduceat 으로 구하고 상위 limit 개는 argpartition 으로 고릅니다.
+        """
+        if not len(scores):
+            return []
+        group_scores = np.maximum.reduceat(scores, self.group_starts)
+        chosen = [
+            group for group in top_n_indices(group_scores, limit) if np.isfinite(group_scores[group])
+        ]
+        return [
+            int(self.group_starts[group] + np.argmax(scores[self.group_starts[group] : self.group_ends[group]]))
+            for group in chosen
+        ]
+
+
+def get_feature_matrix():
+    """현재 카탈로그 버전의 특성 행렬 (금리 행렬 캐시에 함께 보관되어 버전이 바뀐 경우에만 다시 만듦)"""
+    return get_derived_matrix("recommendation_features", OptionFeatureMatrix)
+
+
+def score_candidates(tendency=None, term=None, amount=None, limit=5):
+    """
+    프로필(투자 성향, 희망 기간, 투자 가능 금액)에 맞는 추천 후보 상위 limit 개.
+    상품마다 점수가 가장 높은 옵션 하나만 후보로 사용합니다.
+    """
+    matrix = get_feature_matrix()
+    if limit <= 0:
+        return []
+    scores = matrix.score(tendency=tendency, term=term, amount=amount)
+    return [
+        {
+            "product_type": matrix.product_types[index],
+            "fin_prdt_cd": matrix.product_codes[index],
+            "fin_prdt_nm": matrix.product_names[index],
+            "kor_co_nm": matrix.company_names[index],
+            "option_id": int(matrix.option_ids[index]),
+            "save_trm": int(matrix.terms[index]),
+            "intr_rate_type": "M" if matrix.compound[index] else "S",
+            "intr_rate": None if np.isnan(matrix.intr_rate[index]) else round(float(matrix.intr_rate[index]), 2),
+            "max_rate": round(float(matrix.best_rate[index]), 2),
+            "score": round(float(scores[index]), 1),
+        }
+        for index in matrix.top_products(scores, limit)
+    ]
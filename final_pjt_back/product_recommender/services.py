@@ -1,14 +1,11 @@
-from django.db.models import Q
-from products.models import DepositProduct, SavingProduct
-import openai
+from .scoring import score_candidates
+from openai import OpenAI
 from django.conf import settings
-import json
 
 class ProductRecommender:
     def __init__(self, user):
         self.user = user
         self.profile = user.profile
-        openai.api_key = settings.GPT_API_KEY
         
     def get_gpt_recommendation(self, product_info):
         """GPT를 사용하여 상품 추천 이유를 생성합니다."""
@@ -34,7 +31,8 @@ class ProductRecommender:
             4. 투자 시 고려사항
             """
             
-            response = openai.ChatCompletion.create(
+            client = OpenAI(api_key=settings.GPT_API_KEY)
+            response = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -72,143 +70,52 @@ class ProductRecommender:
             print(f"GPT API 호출 실패: {str(e)}")
             return self._get_recommendation_reason(product_info, 0, product_info['type'])
         
-    def calculate_deposit_score(self, product):
-        """예금 상품 점수 계산"""
-        score = 0
-        
-        # 금리 점수 (최대 40점)
-        max_rate = float(product.max_rate)
-        score += min(max_rate * 4, 40)
-        
-        # 투자 성향 점수 (최대 30점)
-        if self.profile.investment_tendency == 'stable':
-            score += 30
-        elif self.profile.investment_tendency == 'stable_seeking':
-            score += 25
-        elif self.profile.investment_tendency == 'neutral':
-            score += 20
-        elif self.profile.investment_tendency == 'aggressive':
-            score += 15
-            
-        # 투자 기간 점수 (최대 20점)
-        term = int(self.profile.investment_term)
-        if term == 6:
-            score += 10
-        elif term == 12:
-            score += 15
-        elif term == 24:
-            score += 20
-        elif term == 36:
-            score += 20
-            
-        # 금액 점수 (최대 10점)
-        if self.profile.amount_available >= product.min_amount:
-            score += 10
-            
-        return score
-        
-    def calculate_saving_score(self, product):
-        """적금 상품 점수 계산"""
-        score = 0
-        
-        # 금리 점수 (최대 40점)
-        max_rate = float(product.max_rate)
-        score += min(max_rate * 4, 40)
-        
-        # 투자 성향 점수 (최대 30점)
-        if self.profile.investment_tendency == 'stable':
-            score += 25
-        elif self.profile.investment_tendency == 'stable_seeking':
-            score += 30
-        elif self.profile.investment_tendency == 'neutral':
-            score += 25
-        elif self.profile.investment_tendency == 'aggressive':
-            score += 20
-            
-        # 투자 기간 점수 (최대 20점)
-        term = int(self.profile.investment_term)
-        if term == 6:
-            score += 10
-        elif term == 12:
-            score += 15
-        elif term == 24:
-            score += 20
-        elif term == 36:
-            score += 20
-            
-        # 금액 점수 (최대 10점)
-        if self.profile.amount_available >= product.min_amount:
-            score += 10
-            
-        return score
-        
-    def get_recommendations(self, limit=5):
-        """추천 상품 목록 조회"""
+    def get_candidates(self, limit=5):
+        """
+        프로필에 맞는 추천 후보 상품 (상품별 최적 옵션 1개).
+        전체 예금/적금 옵션의 특성 행렬에 대해 한 번에 점수를 계산합니다. (scoring.score_candidates)
+        """
+        return score_candidates(
+            tendency=self.profile.investment_tendency,
+            term=self.profile.investment_term,
+            amount=float(self.profile.amount_available) if self.profile.amount_available else None,
+            limit=limit,
+        )
+
+    def get_recommendations(self, limit=5, use_gpt=True):
+        """추천 상품 목록 조회 (추천 이유는 점수 상위 limit 개 상품에 대해서만 생성)"""
         recommendations = []
-        
-        # 예금 상품 점수 계산
-        deposit_products = DepositProduct.objects.all()
-        for product in deposit_products:
-            score = self.calculate_deposit_score(product)
-            if score > 0:
-                product_info = {
-                    'name': product.name,
-                    'type': 'deposit',
-                    'max_rate': product.max_rate,
-                    'term': product.term
-                }
-                
-                # GPT를 사용하여 추천 이유 생성
-                recommendation_reason = self.get_gpt_recommendation(product_info)
-                
-                recommendations.append({
-                    'product_name': product.name,
-                    'product_type': 'deposit',
-                    'score': round(score, 1),
-                    'max_rate': product.max_rate,
-                    'term': f"{product.term}개월",
-                    'reason': recommendation_reason,
-                    'deposit_product': {
-                        'id': product.id,
-                        'name': product.name,
-                        'max_rate': product.max_rate,
-                        'term': product.term
-                    }
-                })
-        
-        # 적금 상품 점수 계산
-        saving_products = SavingProduct.objects.all()
-        for product in saving_products:
-            score = self.calculate_saving_score(product)
-            if score > 0:
-                product_info = {
-                    'name': product.name,
-                    'type': 'saving',
-                    'max_rate': product.max_rate,
-                    'term': product.term
-                }
-                
+        for candidate in self.get_candidates(limit):
+            product_type = candidate['product_type']
+            product_info = {
+                'name': candidate['fin_prdt_nm'],
+                'type': product_type,
+                'max_rate': candidate['max_rate'],
+                'term': candidate['save_trm'],
+            }
+            if use_gpt:
                 # GPT를 사용하여 추천 이유 생성
                 recommendation_reason = self.get_gpt_recommendation(product_info)
-                
-                recommendations.append({
-                    'product_name': product.name,
-                    'product_type': 'saving',
-                    'score': round(score, 1),
-                    'max_rate': product.max_rate,
-                    'term': f"{product.term}개월",
-                    'reason': recommendation_reason,
-                    'saving_product': {
-                        'id': product.id,
-                        'name': product.name,
-                        'max_rate': product.max_rate,
-                        'term': product.term
-                    }
-                })
-        
-        # 점수 기준으로 정렬하고 상위 N개 반환
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        return recommendations[:limit]
+            else:
+                recommendation_reason = self._get_recommendation_reason(product_info, candidate['score'], product_type)
+
+            recommendations.append({
+                'product_name': candidate['fin_prdt_nm'],
+                'product_type': product_type,
+                'score': candidate['score'],
+                'max_rate': candidate['max_rate'],
+                'term': f"{candidate['save_trm']}개월",
+                'reason': recommendation_reason,
+                f'{product_type}_product': {
+                    'id': candidate['fin_prdt_cd'],
+                    'name': candidate['fin_prdt_nm'],
+                    'bank_name': candidate['kor_co_nm'],
+                    'option_id': candidate['option_id'],
+                    'max_rate': candidate['max_rate'],
+                    'term': candidate['save_trm'],
+                },
+            })
+        return recommendations
         
     def _get_recommendation_reason(self, product, score, product_type):
         """기본 추천 이유 생성 (GPT API 실패 시 사용)"""
@@ -227,7 +134,7 @@ class ProductRecommender:
             reasons.append("수익 추구에 적합")
             
         # 기간 관련 이유
-        if int(self.profile.investment_term) == product['term']:
+        if self.profile.investment_term and int(self.profile.investment_term) == product['term']:
             reasons.append("선호하는 투자 기간과 일치")
             
         return ", ".join(reasons) 
\ No newline at end of file
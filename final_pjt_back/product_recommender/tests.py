@@ -1,3 +1,109 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from accounts.models import Profile
+from products.ingest import ingest_deposit_products, ingest_saving_products
+from products.simulation import clear_rate_matrices
+
+from .scoring import get_feature_matrix, score_candidates
+
+
+def option(code, save_trm, intr_rate, intr_rate2, intr_rate_type="S"):
+    return {
+        "fin_prdt_cd": code,
+        "intr_rate_type": intr_rate_type,
+        "intr_rate_type_nm": "복리" if intr_rate_type == "M" else "단리",
+        "save_trm": save_trm,
+        "intr_rate": intr_rate,
+        "intr_rate2": intr_rate2,
+    }
+
+
+class ScoreCandidatesTests(TestCase):
+    """전체 옵션 특성 행렬에 대한 벡터화 점수 계산과 상위 후보 선택 확인"""
+
+    def setUp(self):
+        clear_rate_matrices()
+        ingest_deposit_products(
+            [
+                {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1", "join_deny": "1"},
+                {"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "D2", "fin_prdt_nm": "예금2", "join_deny": "2"},
+            ],
+            [
+                option("D1", "12", "3.00", "3.50"),
+                option("D1", "24", "3.10", "3.60"),
+                option("D2", "12", "3.00", "3.50"),
+            ],
+        )
+        ingest_saving_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "S1", "fin_prdt_nm": "적금1",
+              "rsrv_type": "S", "rsrv_type_nm": "정액적립식", "max_limit": 500000}],
+            [option("S1", "12", "4.00", "5.00", "M"), option("S1", "6", None, None)],
+        )
+
+    def test_best_option_per_product(self):
+        candidates = score_candidates(tendency="stable", term=12, amount=1000000, limit=10)
+        # 적금 6개월 옵션은 금리가 없어 제외, 상품마다 가장 점수가 높은 옵션 하나
+        self.assertEqual(
+            [(row["fin_prdt_cd"], row["save_trm"], row["score"]) for row in candidates],
+            [("D1", 12, 74.0), ("S1", 12, 70.0), ("D2", 12, 64.0)],
+        )
+        self.assertEqual(candidates[1]["intr_rate_type"], "M")
+
+        # 희망 기간이 24개월이면 D1 의 24개월 옵션이 선택됨
+        candidates = score_candidates(tendency="aggressive", term=24, amount=1000000, limit=2)
+        self.assertEqual(
+            [(row["fin_prdt_cd"], row["save_trm"], row["score"]) for row in candidates],
+            [("D1", 24, 59.4), ("S1", 12, 55.0)],
+        )
+
+    def test_matrix_rebuilt_per_catalog_version(self):
+        matrix = get_feature_matrix()
+        self.assertIs(get_feature_matrix(), matrix)
+        self.assertEqual(len(matrix), 5)
+        ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1", "join_deny": "1"}],
+            [option("D1", "12", "3.00", "9.00")],
+        )
+        self.assertIsNot(get_feature_matrix(), matrix)
+        self.assertEqual(score_candidates(limit=1)[0]["max_rate"], 9.0)
+
+
+class RecommendationViewTests(APITestCase):
+    """프로필 기반 추천 API (GPT 없이 점수 상위 상품과 기본 추천 이유)"""
+
+    def setUp(self):
+        clear_rate_matrices()
+        ingest_deposit_products(
+            [
+                {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1", "join_deny": "1"},
+                {"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "D2", "fin_prdt_nm": "예금2", "join_deny": "2"},
+            ],
+            [option("D1", "12", "3.00", "4.50"), option("D2", "12", "3.00", "3.50")],
+        )
+        self.user = get_user_model().objects.create_user(username="tester", email="t@example.com", password="pw")
+        profile = self.user.profile
+        profile.investment_tendency = "stable"
+        profile.investment_term = 12
+        profile.amount_available = 1000000
+        profile.save()
+        self.client.force_authenticate(self.user)
+
+    def test_recommendations_from_profile(self):
+        response = self.client.get("/api/v1/product-recommender/recommendations/", {"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        recommendations = response.data["recommendations"]
+        self.assertEqual([row["deposit_product"]["id"] for row in recommendations], ["D1"])
+        self.assertEqual(recommendations[0]["reason"], "높은 금리, 안정적인 수익 추구에 적합, 선호하는 투자 기간과 일치")
+
+    def test_invalid_limit(self):
+        for limit in ("abc", "0", "21"):
+            response = self.client.get("/api/v1/product-recommender/recommendations/", {"limit": limit})
+            self.assertEqual(response.status_code, 400)
+
+    def test_missing_profile(self):
+        Profile.objects.filter(user=self.user).delete()
+        self.user.refresh_from_db()
+        response = self.client.get("/api/v1/product-recommender/recommendations/")
+        self.assertEqual(response.status_code, 400)
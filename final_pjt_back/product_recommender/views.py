@@ -9,6 +9,9 @@ import json
 import os
 import base64
 
+from accounts.models import Profile
+from .services import ProductRecommender
+
 # Create your views here.
 
 @api_view(['GET'])
@@ -16,11 +19,24 @@ import base64
 def get_recommendations(request):
     """
     사용자의 프로필 정보를 기반으로 실시간으로 금융상품을 추천합니다.
+    쿼리 파라미터: limit (기본 5, 최대 20), use_gpt=true 이면 GPT로 추천 이유를 생성
     """
+    try:
+        limit = int(request.query_params.get('limit', 5))
+    except ValueError:
+        return Response({'status': 'error', 'message': 'limit 은 정수여야 합니다.'}, status=400)
+    if not 1 <= limit <= 20:
+        return Response({'status': 'error', 'message': 'limit 은 1~20 사이여야 합니다.'}, status=400)
+    use_gpt = request.query_params.get('use_gpt', '').lower() == 'true'
+
+    try:
+        recommender = ProductRecommender(request.user)
+    except Profile.DoesNotExist:
+        return Response({'status': 'error', 'message': '프로필 정보가 필요합니다.'}, status=400)
     try:
         return Response({
             'status': 'success',
-            'message': 'This endpoint is deprecated. Please use the GPT endpoint instead.'
+            'recommendations': recommender.get_recommendations(limit=limit, use_gpt=use_gpt),
         })
     except Exception as e:
         return Response({
@@ -6,12 +6,44 @@ from .models import (
     SavingOption,
     DepositSubscription,
     SavingSubscription,
+    FinancialCompany,
+    ProductChange,
+    CatalogState,
+    SyncRun,
+    EmailOutbox,
+    DepositOptionRateHistory,
+    SavingOptionRateHistory,
+    DepositConditionTag,
+    SavingConditionTag,
+    IdempotencyKey,
 )
+from .ingest import SPECS_BY_OPTION_MODEL, update_options
+
+
+class OptionAdmin(admin.ModelAdmin):
+    """옵션 수정 시 금리 변경을 적재와 같은 방식(변경 이력, 카탈로그 버전, 안내 메일)으로 반영"""
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        fields = [field.name for field in obj._meta.concrete_fields if not field.primary_key]
+        update_options(SPECS_BY_OPTION_MODEL[type(obj)], [obj], fields)
+
 
 # Register your models here.
 admin.site.register(DepositProduct)
-admin.site.register(DepositOption)
+admin.site.register(DepositOption, OptionAdmin)
 admin.site.register(SavingProduct)
-admin.site.register(SavingOption)
+admin.site.register(SavingOption, OptionAdmin)
 admin.site.register(DepositSubscription)
 admin.site.register(SavingSubscription)
+admin.site.register(FinancialCompany)
+admin.site.register(ProductChange)
+admin.site.register(CatalogState)
+admin.site.register(SyncRun)
+admin.site.register(EmailOutbox)
+admin.site.register(DepositOptionRateHistory)
+admin.site.register(SavingOptionRateHistory)
+admin.site.register(DepositConditionTag)
+admin.site.register(SavingConditionTag)
+admin.site.register(IdempotencyKey)
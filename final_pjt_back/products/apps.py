@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'products'
+
+    def ready(self):
+        # 금감원 상품 동기화 작업을 market_indices 의 공용 스케줄러에 등록
+        # (스케줄러 시작은 MarketIndicesConfig.ready 에서 처리)
+        from .jobs import register_product_jobs
+
+        register_product_jobs()
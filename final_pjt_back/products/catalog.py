@@ -0,0 +1,30 @@
+from .models import CatalogState
+
+# 카탈로그 상태는 항상 pk=1 인 단일 행으로 관리
+CATALOG_STATE_PK = 1
+
+
+def get_catalog_version():
+    """현재 카탈로그 버전을 반환합니다. (적재 이력이 없으면 0)"""
+    version = (
+        CatalogState.objects.filter(pk=CATALOG_STATE_PK)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def lock_catalog_state():
+    """
+    트랜잭션 안에서 카탈로그 상태 행을 잠근 채로 반환합니다.
+    동시에 실행된 적재가 버전을 같은 순서로 올리도록 적재 전체를 직렬화합니다.
+    """
+    state, _ = CatalogState.objects.select_for_update().get_or_create(pk=CATALOG_STATE_PK)
+    return state
+
+
+def bump_catalog_version(state):
+    """잠근 상태 행의 버전을 1 올리고 새 버전을 반환합니다."""
+    state.version += 1
+    state.save(update_fields=["version", "updated_at"])
+    return state.version
@@ -0,0 +1,176 @@
+"""
+우대조건(spcl_cnd) 자유 텍스트에서 조건 태그를 뽑아내는 추출기.
+
+적재 시 상품마다 한 번만 실행해 결과를 조건 태그 테이블(DepositConditionTag / SavingConditionTag)에 저장하고,
+조건 필터와 "내 조건으로 받을 수 있는 최고 금리" 계산은 텍스트 대신 태그를 사용합니다.
+"""
+import heapq
+import re
+from decimal import Decimal, InvalidOperation
+
+# 태그 -> 화면 표시 이름
+CONDITION_LABELS = {
+    "salary": "급여이체",
+    "card": "카드 사용",
+    "first": "첫 거래 고객",
+    "online": "비대면 가입/거래",
+    "age": "연령 조건",
+}
+
+# 항목 안에 이 표현이 있으면 해당 태그 (연령은 AGE_RANGE/AGE_MIN/AGE_MAX 로 별도 처리)
+TAG_PATTERNS = {
+    "salary": re.compile(r"급여|연금\s*(?:이체|수령)"),
+    "card": re.compile(r"카드"),
+    "first": re.compile(
+        r"첫\s*거래|최초\s*거래|처음\s*거래|첫\s*고객|신규\s*고객|신규\s*거래\s*고객|미보유\s*고객"
+    ),
+    "online": re.compile(r"비대면|인터넷\s*(?:뱅킹|가입)|스마트\s*(?:뱅킹|폰)|모바일|온라인"),
+}
+
+# "만 19~34세", "만19세 ~ 만34세", "만 65세 이상", "만 35세 미만"
+AGE_RANGE = re.compile(r"만\s*(\d{1,2})\s*세?\s*[~∼\-]\s*(?:만\s*)?(\d{1,2})\s*세")
+AGE_MIN = re.compile(r"만\s*(\d{1,2})\s*세\s*이상")
+AGE_MAX = re.compile(r"만\s*(\d{1,2})\s*세\s*(이하|미만)")
+
+# "연 0.3%p", "최고 1.0%", "0.05%" (금액/횟수는 % 가 없으므로 제외됨)
+RATE_PATTERN = re.compile(r"(\d{1,2}(?:\.\d{1,2})?)\s*%")
+# "항목별 0.1%p", "항목 당 각 연0.1%p" 처럼 항목마다 같은 우대금리를 주는 경우
+PER_ITEM_RATE_PATTERN = re.compile(r"(?:항목\s*(?:별|당)|각)\s*(?:각\s*)?(?:연\s*)?(\d{1,2}(?:\.\d{1,2})?)\s*%")
+# 이보다 큰 값은 우대금리가 아니라 상품 금리 등으로 보고 무시
+MAX_BONUS_RATE = Decimal("10.00")
+
+# 줄 맨 앞의 목록 기호 (①, 1., 1), -, *, ※ 등). 기호가 없는 줄은 앞 항목에 이어 붙임
+ITEM_MARKER = re.compile(r"^\s*(?:[①-⑳]|\(?\d{1,2}[.)]|[가-하][.)]|[-*•·※▶○●■□]|<)")
+
+TWO_PLACES = Decimal("0.01")
+
+
+def split_items(text):
+    """우대조건 텍스트를 목록 기호 기준의 항목으로 나눕니다. (줄바꿈으로 끊긴 문장은 앞 항목에 합침)"""
+    items = []
+    for line in (text or "").splitlines():
+        if not line.strip():
+            continue
+        if items and not ITEM_MARKER.match(line):
+            items[-1] += " " + line.strip()
+        else:
+            items.append(line.strip())
+    return items
+
+
+def parse_bonus_rate(item):
+    """항목 안의 우대금리(%) 중 가장 큰 값 (없으면 None)"""
+    rates = []
+    for match in RATE_PATTERN.finditer(item):
+        try:
+            rate = Decimal(match.group(1)).quantize(TWO_PLACES)
+        except InvalidOperation:
+            continue
+        if 0 < rate <= MAX_BONUS_RATE:
+            rates.append(rate)
+    return max(rates) if rates else None
+
+
+def parse_age_range(item):
+    """항목 안의 연령 조건 (min_age, max_age). 연령 표현이 없으면 None"""
+    match = AGE_RANGE.search(item)
+    if match:
+        low, high = sorted((int(match.group(1)), int(match.group(2))))
+        return low, high
+    min_age = max_age = None
+    match = AGE_MIN.search(item)
+    if match:
+        min_age = int(match.group(1))
+    match = AGE_MAX.search(item)
+    if match:
+        max_age = int(match.group(1)) - (1 if match.group(2) == "미만" else 0)
+    if min_age is None and max_age is None:
+        return None
+    return min_age, max_age
+
+
+def _merge_rate(current, rate):
+    if current is None:
+        return rate
+    if rate is None:
+        return current
+    return max(current, rate)
+
+
+def extract_condition_tags(text):
+    """
+    우대조건 텍스트에서 조건 태그를 추출합니다.
+    같은 태그가 여러 항목에 나오면 우대금리는 가장 큰 값을 사용합니다.
+    항목에 우대금리가 없으면 "항목별 0.1%p" 같은 공통 우대금리를, 그것도 없으면 None 을 사용합니다.
+
+    :return: {tag: {"bonus_rate": Decimal|None, "min_age": int|None, "max_age": int|None}}
+    """
+    tags = {}
+    for item in split_items(text):
+        rate = parse_bonus_rate(item)
+        found = [tag for tag, pattern in TAG_PATTERNS.items() if pattern.search(item)]
+        for tag in found:
+            values = tags.setdefault(tag, {"bonus_rate": None, "min_age": None, "max_age": None})
+            values["bonus_rate"] = _merge_rate(values["bonus_rate"], rate)
+        age_range = parse_age_range(item)
+        if age_range:
+            values = tags.setdefault("age", {"bonus_rate": None, "min_age": None, "max_age": None})
+            values["bonus_rate"] = _merge_rate(values["bonus_rate"], rate)
+            values["min_age"] = age_range[0] if values["min_age"] is None else values["min_age"]
+            values["max_age"] = age_range[1] if values["max_age"] is None else values["max_age"]
+
+    per_item = PER_ITEM_RATE_PATTERN.search(text or "")
+    if per_item:
+        per_item_rate = parse_bonus_rate(per_item.group(0))
+        for values in tags.values():
+            if values["bonus_rate"] is None:
+                values["bonus_rate"] = per_item_rate
+    return tags
+
+
+def condition_met(tag, values, conditions, age=None):
+    """사용자가 고른 조건(conditions)과 나이(age)로 태그 조건을 충족하는지 여부"""
+    if tag == "age":
+        if age is None:
+            return False
+        min_age, max_age = values["min_age"], values["max_age"]
+        return (min_age is None or age >= min_age) and (max_age is None or age <= max_age)
+    return tag in conditions
+
+
+def achievable_rate(entry, rate_field, conditions, age=None):
+    """
+    스냅샷 상품 한 건에서 사용자 조건으로 받을 수 있는 금리.
+    기본 금리(rate_field) + 충족한 태그의 우대금리 합계를 상품의 최고 우대금리(best_intr_rate2)로 제한합니다.
+
+    :return: (받을 수 있는 금리, 기본 금리, 우대금리 합계, 충족한 태그, 우대금리를 알 수 없는 충족 태그)
+             기본 금리가 없는 상품(해당 기간 옵션 없음)은 None
+    """
+    base_rate = entry.sort_values[rate_field]
+    if base_rate is None:
+        return None
+    bonus_rate = Decimal("0.00")
+    met, unpriced = [], []
+    for tag, values in entry.conditions.items():
+        if not condition_met(tag, values, conditions, age):
+            continue
+        met.append(tag)
+        if values["bonus_rate"] is None:
+            unpriced.append(tag)
+        else:
+            bonus_rate += values["bonus_rate"]
+    rate = base_rate + bonus_rate
+    max_rate = entry.sort_values["best_intr_rate2"]
+    if max_rate:
+        rate = min(rate, max(max_rate, base_rate))
+    return rate, base_rate, bonus_rate, met, unpriced
+
+
+def rank_achievable_rates(entries, rate_field, conditions, age=None, limit=20):
+    """받을 수 있는 금리가 높은 순서로 상위 limit 개 [(entry, achievable_rate 결과), ...]"""
+    scored = []
+    for entry in entries:
+        result = achievable_rate(entry, rate_field, conditions, age)
+        if result is not None:
+            scored.append((entry, result))
+    return heapq.nlargest(limit, scored, key=lambda item: (item[1][0], item[1][1]))
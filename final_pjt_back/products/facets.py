@@ -0,0 +1,194 @@
+import threading
+from collections import Counter
+
+from .conditions import CONDITION_LABELS
+
+# 패싯 이름과 응답에 쓸 값 이름
+FACET_NAMES = ("bank", "term", "rate_type", "join_deny", "condition")
+RATE_TYPE_LABELS = {"S": "단리", "M": "복리"}
+JOIN_DENY_LABELS = {"1": "제한없음", "2": "서민전용", "3": "일부제한"}
+
+# 스냅샷(카탈로그 버전)마다 보관할 최대 필터 조합 수
+FACET_CACHE_SIZE = 256
+
+
+# 프론트엔드 은행 버튼이 보내던 기존 bank_id (금융회사명 부분 일치로 해석)
+LEGACY_BANK_NAMES = {
+    "2": "국민은행",
+    "3": "신한은행",
+    "4": "우리은행",
+    "5": "하나은행",
+    "6": "농협은행",
+}
+
+
+def get_bank_ids(request):
+    """
+    bank_id 쿼리 파라미터를 목록으로 읽습니다.
+    ?bank_id=0010001&bank_id=0010002 또는 ?bank_id=0010001,0010002 형태를 모두 허용합니다.
+    """
+    bank_ids = []
+    for value in request.query_params.getlist("bank_id"):
+        bank_ids.extend(part.strip() for part in value.split(",") if part.strip())
+    return bank_ids
+
+
+def resolve_legacy_banks(entries):
+    """
+    기존 bank_id(2~6)를 스냅샷 항목의 금융회사 코드(fin_co_no) 집합으로 바꿔 둡니다.
+    스냅샷을 만들 때 한 번만 계산하므로 요청마다 금융회사 테이블을 이름으로 검색하지 않습니다.
+    :return: {bank_id: frozenset(fin_co_no)}
+    """
+    return {
+        bank_id: frozenset(
+            entry.company_id for entry in entries if entry.company_id and name in entry.kor_co_nm
+        )
+        for bank_id, name in LEGACY_BANK_NAMES.items()
+    }
+
+
+def resolve_bank_filter(bank_ids, catalog):
+    """
+    bank_id 목록을 금융회사 코드(fin_co_no) 집합으로 바꿉니다. (기존 bank_id 는 스냅샷에 계산해 둔 코드 사용)
+    금융회사 코드가 없는 상품(금융회사 정보 적재 전)은 기존 bank_id 의 은행명으로 비교하도록 이름 목록을 함께 반환합니다.
+    :return: (company_ids, fallback_names)
+    """
+    company_ids = set()
+    fallback_names = []
+    for bank_id in bank_ids:
+        if bank_id in LEGACY_BANK_NAMES:
+            company_ids |= catalog.legacy_bank_ids[bank_id]
+            fallback_names.append(LEGACY_BANK_NAMES[bank_id])
+        else:
+            company_ids.add(bank_id)
+    return company_ids, fallback_names
+
+
+def get_list_param(request, name):
+    """?name=a&name=b 또는 ?name=a,b 형태의 쿼리 파라미터를 집합으로 읽습니다. (없으면 None)"""
+    values = set()
+    for value in request.query_params.getlist(name):
+        values.update(part.strip() for part in value.split(",") if part.strip())
+    values.discard("all")  # period=all 등 '전체' 선택은 필터 없음
+    return values or None
+
+
+class ProductFilters:
+    """
+    목록/패싯 공용 상품 필터 (스냅샷 항목 기준).
+    패싯 개수는 자기 자신의 필터만 빼고 나머지 필터를 적용해 셉니다. (여러 값 선택 UI 용)
+    """
+
+    def __init__(self, catalog, bank_ids=None, terms=None, rate_types=None, join_deny=None, conditions=None):
+        self.bank_ids = sorted(bank_ids or [])
+        self.company_ids, self.fallback_names = (
+            resolve_bank_filter(self.bank_ids, catalog) if self.bank_ids else (set(), [])
+        )
+        self.terms = terms
+        self.rate_types = rate_types
+        self.join_deny = join_deny
+        # 우대조건 태그 (여러 개면 그중 하나라도 있는 상품)
+        self.conditions = conditions
+
+    @classmethod
+    def from_request(cls, request, catalog, include_terms=True):
+        return cls(
+            catalog,
+            bank_ids=get_bank_ids(request),
+            terms=get_list_param(request, "period") if include_terms else None,
+            rate_types=get_list_param(request, "rate_type"),
+            join_deny=get_list_param(request, "join_deny"),
+            conditions=get_list_param(request, "condition"),
+        )
+
+    def cache_key(self):
+        return tuple(
+            tuple(sorted(values or ()))
+            for values in (self.bank_ids, self.terms, self.rate_types, self.join_deny, self.conditions)
+        )
+
+    def _bank_matches(self, entry):
+        return entry.company_id in self.company_ids or (
+            entry.company_id is None and any(name in entry.kor_co_nm for name in self.fallback_names)
+        )
+
+    def matches(self, entry, skip=None):
+        if self.bank_ids and skip != "bank" and not self._bank_matches(entry):
+            return False
+        if self.terms and skip != "term" and self.terms.isdisjoint(entry.terms):
+            return False
+        if self.rate_types and skip != "rate_type" and self.rate_types.isdisjoint(entry.rate_types):
+            return False
+        if self.join_deny and skip != "join_deny" and entry.join_deny not in self.join_deny:
+            return False
+        if self.conditions and skip != "condition" and self.conditions.isdisjoint(entry.conditions):
+            return False
+        return True
+
+    def apply(self, entries):
+        if not (self.bank_ids or self.terms or self.rate_types or self.join_deny or self.conditions):
+            return entries
+        return [entry for entry in entries if self.matches(entry)]
+
+
+def count_facets(catalog, filters):
+    """카탈로그 스냅샷 한 번 순회로 모든 패싯 개수와 전체 결과 수를 셉니다."""
+    counters = {name: Counter() for name in FACET_NAMES}
+    bank_labels = {}
+    total = 0
+    for entry in catalog.entries:
+        if filters.matches(entry):
+            total += 1
+        if filters.matches(entry, skip="bank"):
+            bank_key = entry.company_id or entry.kor_co_nm
+            counters["bank"][bank_key] += 1
+            bank_labels[bank_key] = entry.kor_co_nm
+        if filters.matches(entry, skip="term"):
+            counters["term"].update(entry.terms)
+        if filters.matches(entry, skip="rate_type"):
+            counters["rate_type"].update(entry.rate_types)
+        if filters.matches(entry, skip="join_deny") and entry.join_deny:
+            counters["join_deny"][entry.join_deny] += 1
+        if filters.matches(entry, skip="condition"):
+            counters["condition"].update(entry.conditions.keys())
+
+    labels = {
+        "bank": bank_labels,
+        "rate_type": RATE_TYPE_LABELS,
+        "join_deny": JOIN_DENY_LABELS,
+        "condition": CONDITION_LABELS,
+    }
+    facets = {}
+    for name, counter in counters.items():
+        if name == "term":
+            # 기간은 숫자 순서
+            items = sorted(counter.items(), key=lambda item: int(item[0]) if item[0].isdigit() else 0)
+        else:
+            items = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+        facets[name] = []
+        for value, count in items:
+            item = {"value": value, "count": count}
+            if name in labels:
+                item["label"] = labels[name].get(value, value)
+            facets[name].append(item)
+    return {"total": total, "facets": facets}
+
+
+_facet_cache_lock = threading.Lock()
+
+
+def get_facets(catalog, filters):
+    """
+    필터 조합별 패싯 결과를 스냅샷에 보관합니다.
+    스냅샷은 카탈로그 버전이 바뀌면(적재 후) 새로 만들어지므로 캐시도 함께 비워집니다.
+    """
+    key = filters.cache_key()
+    cached = catalog.facet_cache.get(key)
+    if cached is not None:
+        return cached
+    result = count_facets(catalog, filters)
+    with _facet_cache_lock:
+        if len(catalog.facet_cache) >= FACET_CACHE_SIZE:
+            catalog.facet_cache.pop(next(iter(catalog.facet_cache)))
+        catalog.facet_cache[key] = result
+    return result
@@ -0,0 +1,160 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+FSS_API_BASE_URL = "http://finlife.fss.or.kr/finlifeapi"
+
+# 상품 종류별 금감원 API 엔드포인트
+PRODUCT_ENDPOINTS = {
+    "deposit": "depositProductsSearch.json",
+    "saving": "savingProductsSearch.json",
+}
+
+# 권역 코드 (020000: 은행, 030300: 저축은행)
+# settings.FSS_TOP_FIN_GRP_NOS 로 조회 대상 권역을 바꿀 수 있습니다.
+DEFAULT_TOP_FIN_GRP_NOS = ("020000", "030300")
+
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10  # 초
+
+
+class FssApiError(Exception):
+    """금감원 API가 오류 코드를 응답했거나 응답 형식이 올바르지 않은 경우"""
+
+
+def get_top_fin_grp_nos():
+    return tuple(getattr(settings, "FSS_TOP_FIN_GRP_NOS", DEFAULT_TOP_FIN_GRP_NOS))
+
+
+def build_session(pool_size=MAX_WORKERS):
+    """
+    워커 수만큼 커넥션을 재사용하는 requests 세션을 만듭니다.
+    일시적인 5xx 응답은 짧은 백오프로 재시도합니다.
+    settings.FSS_STANDIN 이 있으면 금감원 API 대역 세션을 반환합니다.
+    """
+    standin = getattr(settings, "FSS_STANDIN", None)
+    if standin:
+        # 로컬 개발/벤치마크: 실제 API 대신 덤프 기반 대역 사용 (products.standin 참고)
+        from .standin import build_standin_session
+
+        return build_standin_session(**standin)
+
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_page(session, kind, top_fin_grp_no, page_no):
+    """
+    금감원 API 한 페이지를 조회해 result 딕셔너리를 반환합니다.
+    """
+    response = session.get(
+        f"{FSS_API_BASE_URL}/{PRODUCT_ENDPOINTS[kind]}",
+        params={
+            "auth": settings.FIN_API_KEY,
+            "topFinGrpNo": top_fin_grp_no,
+            "pageNo": page_no,
+        },
+        timeout=REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    result = response.json().get("result")
+    if result is None:
+        raise FssApiError(f"Invalid API response format ({kind}, {top_fin_grp_no}, page {page_no})")
+    if result.get("err_cd", "000") != "000":
+        raise FssApiError(
+            f"{result.get('err_cd')}: {result.get('err_msg')} ({kind}, {top_fin_grp_no}, page {page_no})"
+        )
+    return result
+
+
+def iter_product_pages(
+    kind,
+    top_fin_grp_nos=None,
+    session=None,
+    max_workers=MAX_WORKERS,
+    skip_pages=None,
+    max_page_nos=None,
+):
+    """
+    요청한 모든 권역의 페이지를 동시에 조회하며, 완료되는 순서대로
+    (권역 코드, 페이지 번호, result) 를 내보냅니다.
+
+    각 권역의 1페이지에서 max_page_no 를 읽은 뒤 나머지 페이지를
+    같은 워커 풀에 바로 추가하므로 전체 소요 시간은 가장 느린 페이지에 수렴합니다.
+
+    이어받기용 옵션:
+    :param skip_pages: 이미 받아 둔 (권역 코드, 페이지 번호) 집합 (다시 조회하지 않음)
+    :param max_page_nos: 이미 알고 있는 권역별 max_page_no (있으면 1페이지 조회를 생략)
+    """
+    top_fin_grp_nos = tuple(top_fin_grp_nos or get_top_fin_grp_nos())
+    skip_pages = set(skip_pages or ())
+    max_page_nos = dict(max_page_nos or {})
+    owns_session = session is None
+    if owns_session:
+        session = build_session(max_workers)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+
+    def submit_remaining(grp_no, max_page_no):
+        for next_page in range(2, max_page_no + 1):
+            if (grp_no, next_page) in skip_pages:
+                continue
+            next_future = executor.submit(fetch_page, session, kind, grp_no, next_page)
+            pending[next_future] = (grp_no, next_page)
+
+    try:
+        for grp_no in top_fin_grp_nos:
+            if (grp_no, 1) in skip_pages and grp_no in max_page_nos:
+                submit_remaining(grp_no, max_page_nos[grp_no])
+                continue
+            future = executor.submit(fetch_page, session, kind, grp_no, 1)
+            pending[future] = (grp_no, 1)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                grp_no, page_no = pending.pop(future)
+                result = future.result()
+                if page_no == 1:
+                    submit_remaining(grp_no, int(result.get("max_page_no") or 1))
+                yield grp_no, page_no, result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if owns_session:
+            session.close()
+
+
+def page_batch(grp_no, base_list, option_list):
+    """
+    한 페이지의 (baseList, optionList) 묶음.
+    금융회사 권역 구분을 위해 상품마다 페이지의 권역 코드(top_fin_grp_no)를 붙입니다.
+    """
+    return [dict(entry, top_fin_grp_no=grp_no) for entry in base_list or []], list(option_list or [])
+
+
+def fetch_products(kind, top_fin_grp_nos=None, session=None, max_workers=MAX_WORKERS):
+    """
+    페이지를 받는 대로 (baseList, optionList) 묶음을 하나씩 내보냅니다. (전체 응답을 모아 두지 않음)
+    ingest.ingest_product_pages 에 그대로 넘기면 받은 페이지부터 바로 적재합니다.
+    """
+    for grp_no, page_no, result in iter_product_pages(
+        kind, top_fin_grp_nos, session=session, max_workers=max_workers
+    ):
+        logger.info(f"[{kind}] {grp_no} {page_no}페이지 수신")
+        yield page_batch(grp_no, result.get("baseList"), result.get("optionList"))
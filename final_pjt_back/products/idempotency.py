@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+# 이 시간이 지난 키는 새 요청으로 취급하고, 정리 작업에서 삭제
+KEY_TTL = timedelta(hours=24)
+
+
+def request_fingerprint(request):
+    """같은 키로 다른 요청(메서드/경로/본문)을 보냈는지 구분하기 위한 해시"""
+    payload = json.dumps(
+        [request.method, request.path, request.data], sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _claim(user, key, request_hash):
+    """
+    키를 선점합니다. (INSERT 한 번, 이미 있으면 유니크 제약 위반으로 실패)
+    만료된 키는 조건부 UPDATE 로 다시 선점합니다.
+    :return: (선점한 행, None) 또는 (None, 기존 행)
+    """
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, request_hash=request_hash), None
+    except IntegrityError:
+        pass
+    now = timezone.now()
+    reclaimed = IdempotencyKey.objects.filter(user=user, key=key, created_at__lt=now - KEY_TTL).update(
+        request_hash=request_hash, status_code=None, response_body=None, created_at=now
+    )
+    if reclaimed:
+        return IdempotencyKey.objects.get(user=user, key=key), None
+    return None, IdempotencyKey.objects.filter(user=user, key=key).first()
+
+
+def idempotent(view):
+    """
+    Idempotency-Key 헤더가 있으면 (사용자, 키)마다 처음 한 번만 뷰를 실행하고,
+    같은 키로 다시 온 요청에는 저장해 둔 응답(상태 코드 + 본문)을 그대로 돌려주는 데코레이터.
+    헤더가 없으면 아무 일도 하지 않습니다. (@api_view 아래에 두어 DRF 요청/인증 사용자를 받음)
+
+    키 선점, 뷰의 쓰기, 응답 저장은 한 트랜잭션이므로 처리 도중 프로세스가 죽으면 키도 함께 롤백되어
+    같은 키로 다시 시도할 수 있습니다. 같은 키의 동시 요청은 먼저 온 요청이 커밋될 때까지 키 INSERT 에서
+    기다렸다가 저장된 응답을 돌려받습니다.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"error": f"{IDEMPOTENCY_HEADER} 는 {MAX_KEY_LENGTH}자 이하여야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_hash = request_fingerprint(request)
+        with transaction.atomic():
+            record, existing = _claim(request.user, key, request_hash)
+            if record is None:
+                if existing is None or existing.request_hash != request_hash:
+                    return Response(
+                        {"error": f"같은 {IDEMPOTENCY_HEADER} 로 다른 요청을 보낼 수 없습니다."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                if existing.status_code is None:
+                    return Response(
+                        {"error": f"같은 {IDEMPOTENCY_HEADER} 의 요청이 아직 처리 중입니다."},
+                        status=status.HTTP_409_CONFLICT,
+                    )
+                return Response(
+                    existing.response_body,
+                    status=existing.status_code,
+                    headers={"Idempotent-Replayed": "true"},
+                )
+
+            # 뷰에서 예외가 나면 키와 쓰기가 함께 롤백되어 같은 키로 다시 시도할 수 있음
+            response = view(request, *args, **kwargs)
+            if response.status_code >= 500:
+                transaction.set_rollback(True)
+            else:
+                IdempotencyKey.objects.filter(pk=record.pk).update(
+                    status_code=response.status_code, response_body=response.data
+                )
+        return response
+
+    return wrapper
+
+
+def purge_idempotency_keys():
+    """만료된 Idempotency-Key 를 삭제합니다. (스케줄러에서 주기적으로 실행)"""
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - KEY_TTL).delete()
+    if deleted:
+        logger.info(f"만료된 Idempotency-Key {deleted}건 삭제")
+    return deleted
@@ -0,0 +1,778 @@
+import hashlib
+import json
+import logging
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from .catalog import bump_catalog_version, lock_catalog_state
+from .conditions import extract_condition_tags
+from .models import (
+    DepositProduct,
+    DepositOption,
+    SavingProduct,
+    SavingOption,
+    DepositSubscription,
+    SavingSubscription,
+    DepositOptionRateHistory,
+    SavingOptionRateHistory,
+    DepositConditionTag,
+    SavingConditionTag,
+    FinancialCompany,
+    ProductChange,
+)
+from .utils import build_rate_changes, enqueue_rate_change_emails
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 INSERT/UPDATE 문에 담을 최대 행 수
+BATCH_SIZE = 500
+
+# 금감원 API 응답 필드 중 상품 테이블에 그대로 저장하는 필드
+BASE_PRODUCT_FIELDS = [
+    "kor_co_nm",
+    "fin_prdt_nm",
+    "join_way",
+    "mtrt_int",
+    "spcl_cnd",
+    "join_deny",
+    "join_member",
+    "etc_note",
+    "max_limit",
+    "dcls_strt_day",
+    "dcls_end_day",
+    "fin_co_subm_day",
+]
+# 옵션 키(intr_rate_type, save_trm)를 제외한 옵션 갱신 대상 필드
+BASE_OPTION_FIELDS = ["intr_rate_type_nm", "intr_rate", "intr_rate2"]
+
+RATE_FIELDS = ("intr_rate", "intr_rate2")
+TWO_PLACES = Decimal("0.01")
+ZERO_RATE = Decimal("0.00")
+
+# 옵션에서 계산해 상품에 저장하는 정렬/필터용 금리 컬럼
+BEST_RATE_FIELDS = ["best_intr_rate", "best_intr_rate2"] + [
+    f"best_rate_{term}" for term in DepositProduct.BEST_RATE_TERMS
+]
+
+
+class IngestSpec:
+    """
+    상품 종류(예금/적금)별 적재 설정.
+    null_rate: API가 금리를 비워 보냈을 때 저장할 값 (예금은 기존처럼 0.00, 적금은 None)
+    """
+
+    def __init__(
+        self,
+        product_type,
+        product_model,
+        option_model,
+        subscription_model,
+        product_fields,
+        option_fields,
+        null_rate,
+        history_model,
+        tag_model,
+    ):
+        self.product_type = product_type
+        self.product_model = product_model
+        self.option_model = option_model
+        self.subscription_model = subscription_model
+        self.product_fields = product_fields
+        self.option_fields = option_fields
+        self.null_rate = null_rate
+        self.history_model = history_model
+        self.tag_model = tag_model
+
+
+DEPOSIT_SPEC = IngestSpec(
+    "deposit",
+    DepositProduct,
+    DepositOption,
+    DepositSubscription,
+    BASE_PRODUCT_FIELDS,
+    BASE_OPTION_FIELDS,
+    null_rate=Decimal("0.00"),
+    history_model=DepositOptionRateHistory,
+    tag_model=DepositConditionTag,
+)
+SAVING_SPEC = IngestSpec(
+    "saving",
+    SavingProduct,
+    SavingOption,
+    SavingSubscription,
+    BASE_PRODUCT_FIELDS + ["rsrv_type", "rsrv_type_nm"],
+    BASE_OPTION_FIELDS + ["acc_type_nm"],
+    null_rate=None,
+    history_model=SavingOptionRateHistory,
+    tag_model=SavingConditionTag,
+)
+SPECS_BY_OPTION_MODEL = {spec.option_model: spec for spec in (DEPOSIT_SPEC, SAVING_SPEC)}
+
+
+def normalize_rate(value, null_rate):
+    """API 금리 값을 DecimalField(소수점 2자리)와 같은 형태로 정규화합니다."""
+    if value is None or value == "":
+        return null_rate
+    try:
+        return Decimal(str(value)).quantize(TWO_PLACES)
+    except (InvalidOperation, ValueError, TypeError):
+        return null_rate
+
+
+def normalize_value(value):
+    """문자열 앞뒤 공백을 제거하고 빈 문자열은 None 으로 통일합니다."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def content_hash(values):
+    """정규화된 필드 값으로 32자리 해시를 계산합니다."""
+    payload = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _product_values(spec, entry):
+    values = {field: normalize_value(entry.get(field)) for field in spec.product_fields}
+    values["company_id"] = normalize_value(entry.get("fin_co_no"))
+    if values["max_limit"] is not None:
+        try:
+            values["max_limit"] = int(values["max_limit"])
+        except (ValueError, TypeError):
+            values["max_limit"] = None
+    return values
+
+
+def _option_values(spec, entry):
+    values = {field: normalize_value(entry.get(field)) for field in spec.option_fields}
+    for key in RATE_FIELDS:
+        values[key] = normalize_rate(values[key], spec.null_rate)
+    return values
+
+
+def _option_key(product_code, intr_rate_type, save_trm):
+    return (product_code, intr_rate_type, str(save_trm))
+
+
+def _changed_fields(instance, values):
+    return [field for field, value in values.items() if getattr(instance, field) != value]
+
+
+def ingest_products(spec, base_lst, option_lst, prune=False):
+    """금감원 API 응답(baseList, optionList) 한 묶음을 적재합니다. (ingest_product_pages 참고)"""
+    return ingest_product_pages(spec, [(base_lst, option_lst)], prune=prune)
+
+
+def ingest_product_pages(spec, pages, prune=False, notify=True):
+    """
+    금감원 API 응답을 페이지 단위 (baseList, optionList) 묶음으로 받아 한 트랜잭션 안에서 반영합니다.
+    전체 응답을 메모리에 모으지 않고 페이지마다 바로 저장하며, 페이지를 넘겨 가며 들고 있는 것은
+    상품/옵션 키와 해시, 변경 이력뿐입니다.
+
+    상품/옵션마다 정규화된 필드의 해시(content_hash)를 저장해 두고,
+    기존 해시와 같은 행은 읽지도 쓰지도 않습니다. 실제로 바뀐 행만 bulk 쿼리로 저장하고
+    ProductChange 에 변경 이력(sync_id, 카탈로그 버전, 변경 필드, 이전/이후 금리)을 남깁니다.
+    변경이 하나라도 있으면 카탈로그 버전을 1 올립니다.
+
+    prune=True 이면 전체 응답을 받은 것으로 보고, 응답에 없는 상품/옵션을 삭제합니다.
+    단, 사용자가 가입 중인 상품/옵션은 가입 정보를 지키기 위해 남겨 둡니다.
+    반환값의 new_products/updated_products는 기존 뷰가 응답하던 값과 같은 의미입니다.
+
+    notify=False 이면 금리 변경 안내 메일을 넣지 않습니다. (queued_emails=None)
+    예금/적금을 함께 동기화할 때 호출한 쪽이 모든 적재가 끝난 뒤 collect_rate_changes 로
+    변경 이력을 모아 사용자마다 한 통으로 넣습니다.
+    """
+    product_model = spec.product_model
+    option_model = spec.option_model
+    sync_id = uuid.uuid4()
+
+    with transaction.atomic():
+        catalog_state = lock_catalog_state()
+
+        # 해시 비교에 필요한 컬럼만 읽음 (긴 텍스트 컬럼은 변경된 상품만 다시 읽음)
+        existing_hashes = dict(product_model.objects.values_list("fin_prdt_cd", "content_hash"))
+        stored_codes = set(existing_hashes)
+        existing_options = {
+            _option_key(row["product_id"], row["intr_rate_type"], row["save_trm"]): row
+            for row in option_model.objects.values(
+                "id", "product_id", "intr_rate_type", "save_trm", "content_hash", *spec.option_fields
+            )
+        }
+
+        incoming_codes = set()
+        incoming_option_keys = set()
+        new_codes = []
+        # 변경 이력은 페이지마다 저장 (카탈로그 버전은 이번 적재의 첫 변경에서 한 번만 올림)
+        version = None
+        change_count = 0
+        updated_product_count = 0
+        new_option_count = 0
+        updated_option_count = 0
+        rate_changes = []
+        missing_product_codes = set()
+        # 정렬용 최고 금리 컬럼을 다시 계산할 상품 (신규 상품 + 옵션이 바뀐 상품)
+        rate_affected_codes = set()
+        skipped_options = 0
+
+        for base_lst, option_lst in pages:
+            upsert_companies(base_lst)
+
+            # 같은 상품/옵션이 한 페이지에 중복으로 내려오면 마지막 값을 사용
+            page_products = {}
+            for entry in base_lst:
+                code = normalize_value(entry.get("fin_prdt_cd"))
+                if code:
+                    page_products[code] = _product_values(spec, entry)
+            page_options = {}
+            for entry in option_lst:
+                code = normalize_value(entry.get("fin_prdt_cd"))
+                if not code or not entry.get("intr_rate_type") or not entry.get("save_trm"):
+                    continue
+                key = _option_key(code, entry["intr_rate_type"], entry["save_trm"])
+                page_options[key] = _option_values(spec, entry)
+            incoming_codes.update(page_products)
+            incoming_option_keys.update(page_options)
+
+            # 상품: 해시가 다른 것만 골라 INSERT ... ON CONFLICT DO UPDATE 로 한 번에 저장
+            products = {}
+            products_to_write = []
+            page_new_codes = []
+            changed_codes = []
+            for code, values in page_products.items():
+                digest = content_hash(values)
+                product = product_model(fin_prdt_cd=code, content_hash=digest, **values)
+                products[code] = product
+                if code not in existing_hashes:
+                    page_new_codes.append(code)
+                    products_to_write.append(product)
+                elif existing_hashes[code] != digest:
+                    changed_codes.append(code)
+                    products_to_write.append(product)
+
+            changes = [
+                ProductChange(
+                    sync_id=sync_id,
+                    product_type=spec.product_type,
+                    fin_prdt_cd=code,
+                    change_type="created",
+                )
+                for code in page_new_codes
+            ]
+            # 우대조건 태그를 다시 추출할 상품 (신규 + 우대조건 텍스트가 바뀐 상품)
+            tag_codes = list(page_new_codes)
+            if changed_codes:
+                old_products = product_model.objects.in_bulk(changed_codes)
+                for code in changed_codes:
+                    fields = _changed_fields(old_products[code], page_products[code])
+                    # 해시가 없던 기존 행은 값이 같아도 해시만 채워 넣고 이력은 남기지 않음
+                    if "spcl_cnd" in fields:
+                        tag_codes.append(code)
+                    if fields:
+                        updated_product_count += 1
+                        changes.append(
+                            ProductChange(
+                                sync_id=sync_id,
+                                product_type=spec.product_type,
+                                fin_prdt_cd=code,
+                                change_type="updated",
+                                changed_fields=fields,
+                            )
+                        )
+
+            if products_to_write:
+                product_model.objects.bulk_create(
+                    products_to_write,
+                    batch_size=BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=["fin_prdt_cd"],
+                    update_fields=spec.product_fields + ["company_id", "content_hash"],
+                )
+            refresh_condition_tags(
+                spec, {code: page_products[code]["spcl_cnd"] for code in tag_codes}, page_new_codes
+            )
+            for product in products_to_write:
+                existing_hashes[product.fin_prdt_cd] = product.content_hash
+            new_codes.extend(page_new_codes)
+            rate_affected_codes.update(page_new_codes)
+
+            # 옵션: 신규는 bulk_create, 해시가 달라진 것만 bulk_update
+            options_to_create = []
+            options_to_update = []
+            page_rate_changes = []
+            for key, values in page_options.items():
+                product_code, intr_rate_type, save_trm = key
+                if product_code not in existing_hashes:
+                    skipped_options += 1
+                    continue
+
+                digest = content_hash(values)
+                current = existing_options.get(key)
+                if current is not None and current["content_hash"] == digest:
+                    continue
+
+                option = option_model(
+                    product_id=product_code,
+                    intr_rate_type=intr_rate_type,
+                    save_trm=save_trm,
+                    content_hash=digest,
+                    **values,
+                )
+                if current is None:
+                    options_to_create.append(option)
+                    changes.append(
+                        ProductChange(
+                            sync_id=sync_id,
+                            product_type=spec.product_type,
+                            fin_prdt_cd=product_code,
+                            intr_rate_type=intr_rate_type,
+                            save_trm=save_trm,
+                            change_type="created",
+                            new_intr_rate=values["intr_rate"],
+                            new_intr_rate2=values["intr_rate2"],
+                        )
+                    )
+                    continue
+
+                option.pk = current["id"]
+                options_to_update.append(option)
+                fields = [field for field, value in values.items() if current[field] != value]
+                if not fields:
+                    # 해시가 없던 기존 행은 값이 같아도 해시만 채워 넣고 이력은 남기지 않음
+                    continue
+                changes.append(
+                    ProductChange(
+                        sync_id=sync_id,
+                        product_type=spec.product_type,
+                        fin_prdt_cd=product_code,
+                        intr_rate_type=intr_rate_type,
+                        save_trm=save_trm,
+                        change_type="updated",
+                        changed_fields=fields,
+                        old_intr_rate=current["intr_rate"],
+                        new_intr_rate=values["intr_rate"],
+                        old_intr_rate2=current["intr_rate2"],
+                        new_intr_rate2=values["intr_rate2"],
+                    )
+                )
+                rate_change = build_rate_changes(
+                    current["intr_rate"], current["intr_rate2"], values["intr_rate"], values["intr_rate2"]
+                )
+                if rate_change:
+                    # 안내 메일에 쓸 상품명 (이 페이지에 없는 상품은 마지막에 한 번에 조회)
+                    if product_code in products:
+                        option.product = products[product_code]
+                    else:
+                        missing_product_codes.add(product_code)
+                    page_rate_changes.append((option, rate_change))
+
+            if options_to_create:
+                option_model.objects.bulk_create(options_to_create, batch_size=BATCH_SIZE)
+            # 금리 이력: 새 옵션의 첫 금리와 금리가 바뀐 옵션만 기록
+            record_rate_history(spec, options_to_create + [option for option, _ in page_rate_changes])
+            if options_to_update:
+                option_model.objects.bulk_update(
+                    options_to_update, spec.option_fields + ["content_hash"], batch_size=BATCH_SIZE
+                )
+            for option in options_to_create + options_to_update:
+                key = _option_key(option.product_id, option.intr_rate_type, option.save_trm)
+                row = existing_options.get(key) or {"id": option.pk}
+                row.update(
+                    product_id=option.product_id,
+                    intr_rate_type=option.intr_rate_type,
+                    save_trm=option.save_trm,
+                    content_hash=option.content_hash,
+                    **{field: getattr(option, field) for field in spec.option_fields},
+                )
+                existing_options[key] = row
+                rate_affected_codes.add(option.product_id)
+            new_option_count += len(options_to_create)
+            updated_option_count += len(options_to_update)
+            rate_changes.extend(page_rate_changes)
+            version = _write_changes(catalog_state, changes, version)
+            change_count += len(changes)
+
+        if skipped_options:
+            logger.warning(f"상품 정보가 없는 옵션 {skipped_options}건을 건너뛰었습니다.")
+
+        removed_products = []
+        removed_options = []
+        if prune and incoming_codes:
+            removed_products, removed_options = _prune_missing(
+                spec, incoming_codes, incoming_option_keys, stored_codes, existing_options
+            )
+            changes = [
+                ProductChange(
+                    sync_id=sync_id,
+                    product_type=spec.product_type,
+                    fin_prdt_cd=code,
+                    change_type="removed",
+                )
+                for code in removed_products
+            ]
+            changes.extend(
+                ProductChange(
+                    sync_id=sync_id,
+                    product_type=spec.product_type,
+                    fin_prdt_cd=row["product_id"],
+                    intr_rate_type=row["intr_rate_type"],
+                    save_trm=row["save_trm"],
+                    change_type="removed",
+                    old_intr_rate=row["intr_rate"],
+                    old_intr_rate2=row["intr_rate2"],
+                )
+                for row in removed_options
+            )
+            version = _write_changes(catalog_state, changes, version)
+            change_count += len(changes)
+            rate_affected_codes.update(row["product_id"] for row in removed_options)
+
+        # 옵션이 바뀐 상품만 정렬용 최고 금리 컬럼을 다시 계산
+        refresh_best_rates(spec, rate_affected_codes)
+
+        if missing_product_codes:
+            products = product_model.objects.in_bulk(missing_product_codes)
+            for option, _ in rate_changes:
+                if option.product_id in missing_product_codes:
+                    option.product = products[option.product_id]
+
+        # bulk 쿼리는 모델 save()를 거치지 않으므로 금리 변경 안내는 여기서 직접 처리
+        # (같은 트랜잭션에서 발송 대기열에 저장하고, 발송은 백그라운드 작업이 담당)
+        queued_emails = None
+        if notify:
+            queued_emails = enqueue_rate_change_emails(rate_changes) if rate_changes else 0
+
+    return {
+        "sync_id": str(sync_id),
+        "version": catalog_state.version if version is None else version,
+        "new_products": len(new_codes),
+        "updated_products": len(incoming_codes) - len(new_codes),
+        "changed_products": updated_product_count,
+        "new_options": new_option_count,
+        "updated_options": updated_option_count,
+        "removed_products": len(removed_products),
+        "removed_options": len(removed_options),
+        "changes": change_count,
+        "queued_emails": queued_emails,
+    }
+
+
+def _write_changes(catalog_state, changes, version):
+    """
+    변경 이력을 저장하고 이번 적재의 카탈로그 버전을 반환합니다.
+    아직 버전을 올리지 않았다면(version=None) 첫 변경을 저장할 때 한 번만 올립니다.
+    """
+    if not changes:
+        return version
+    if version is None:
+        version = bump_catalog_version(catalog_state)
+    for change in changes:
+        change.version = version
+    ProductChange.objects.bulk_create(changes, batch_size=BATCH_SIZE)
+    return version
+
+
+def collect_rate_changes(sync_ids):
+    """
+    변경 이력(ProductChange)에서 주어진 적재들의 옵션 금리 변경을 모아 (옵션, 변경 사항) 목록으로 반환합니다.
+    같은 옵션이 여러 번 바뀌었으면 처음의 이전 금리와 마지막의 이후 금리를 비교하고,
+    그 사이 삭제된 옵션은 건너뜁니다. (변경 이력 조회 1회 + 상품 종류별 옵션 조회 1회)
+    """
+    rates = {}
+    changes = (
+        ProductChange.objects.filter(sync_id__in=list(sync_ids), change_type="updated")
+        .exclude(save_trm="")
+        .order_by("version", "id")
+        .values_list(
+            "product_type",
+            "fin_prdt_cd",
+            "intr_rate_type",
+            "save_trm",
+            "old_intr_rate",
+            "old_intr_rate2",
+            "new_intr_rate",
+            "new_intr_rate2",
+        )
+    )
+    for product_type, code, intr_rate_type, save_trm, old_rate, old_rate2, new_rate, new_rate2 in changes:
+        key = (product_type, _option_key(code, intr_rate_type, save_trm))
+        first = rates.get(key)
+        rates[key] = (first[0] if first else (old_rate, old_rate2), (new_rate, new_rate2))
+
+    rate_changes = []
+    for spec in (DEPOSIT_SPEC, SAVING_SPEC):
+        keys = {key: value for (product_type, key), value in rates.items() if product_type == spec.product_type}
+        if not keys:
+            continue
+        options = spec.option_model.objects.select_related("product").filter(
+            product_id__in={key[0] for key in keys}
+        )
+        for option in options:
+            key = _option_key(option.product_id, option.intr_rate_type, option.save_trm)
+            if key not in keys:
+                continue
+            (old_rate, old_rate2), (new_rate, new_rate2) = keys[key]
+            rate_change = build_rate_changes(old_rate, old_rate2, new_rate, new_rate2)
+            if rate_change:
+                rate_changes.append((option, rate_change))
+    return rate_changes
+
+
+def upsert_companies(base_lst):
+    """
+    응답에 포함된 금융회사(fin_co_no, kor_co_nm, 권역 코드)를 FinancialCompany 에 반영합니다.
+    회사 수는 수백 건 수준이라 전체를 읽어 비교하고, 새로 생기거나 바뀐 회사만 한 번에 저장합니다.
+    상품의 company_id 가 항상 존재하는 회사를 가리키도록 fin_co_no 가 있으면 회사명이 비어 있어도 저장합니다.
+    """
+    incoming = {}
+    for entry in base_lst:
+        fin_co_no = normalize_value(entry.get("fin_co_no"))
+        if not fin_co_no:
+            continue
+        kor_co_nm = normalize_value(entry.get("kor_co_nm")) or ""
+        top_fin_grp_no = normalize_value(entry.get("top_fin_grp_no")) or ""
+        # 같은 회사가 여러 번 내려오면 비어 있지 않은 값을 우선
+        previous = incoming.get(fin_co_no, ("", ""))
+        incoming[fin_co_no] = (kor_co_nm or previous[0], top_fin_grp_no or previous[1])
+    if not incoming:
+        return 0
+
+    existing = {
+        fin_co_no: (kor_co_nm, top_fin_grp_no)
+        for fin_co_no, kor_co_nm, top_fin_grp_no in FinancialCompany.objects.values_list(
+            "fin_co_no", "kor_co_nm", "top_fin_grp_no"
+        )
+    }
+    companies = []
+    for fin_co_no, (kor_co_nm, top_fin_grp_no) in incoming.items():
+        # 회사명/권역 코드가 빠진 응답(직접 호출 등)이면 기존 값을 유지
+        stored_co_nm, stored_grp_no = existing.get(fin_co_no, ("", ""))
+        kor_co_nm = kor_co_nm or stored_co_nm
+        top_fin_grp_no = top_fin_grp_no or stored_grp_no
+        if existing.get(fin_co_no) != (kor_co_nm, top_fin_grp_no):
+            companies.append(
+                FinancialCompany(
+                    fin_co_no=fin_co_no, kor_co_nm=kor_co_nm, top_fin_grp_no=top_fin_grp_no
+                )
+            )
+    if companies:
+        FinancialCompany.objects.bulk_create(
+            companies,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["fin_co_no"],
+            update_fields=["kor_co_nm", "top_fin_grp_no"],
+        )
+    return len(companies)
+
+
+def refresh_condition_tags(spec, texts, new_codes=()):
+    """
+    상품별 우대조건 텍스트({상품 코드: spcl_cnd})에서 조건 태그를 추출해 태그 테이블을 교체합니다.
+    (기존 상품의 태그 삭제 1회 + bulk INSERT, 새로 추가된 상품은 삭제할 태그가 없으므로 제외)
+    """
+    if not texts:
+        return 0
+    tag_model = spec.tag_model
+    tags = [
+        tag_model(product_id=code, tag=tag, **values)
+        for code, text in texts.items()
+        for tag, values in extract_condition_tags(text).items()
+    ]
+    existing_codes = set(texts) - set(new_codes)
+    if existing_codes:
+        tag_model.objects.filter(product_id__in=existing_codes).delete()
+    tag_model.objects.bulk_create(tags, batch_size=BATCH_SIZE)
+    return len(tags)
+
+
+def detect_rate_changes(option_model, options):
+    """
+    저장하려는 옵션들을 DB 의 기존 금리와 비교해 (옵션, 변경 사항) 목록을 반환합니다.
+    옵션마다 기존 행을 다시 읽지 않고 기존 금리를 한 번의 쿼리로 읽어 비교합니다.
+    """
+    old_rates = {
+        pk: (intr_rate, intr_rate2)
+        for pk, intr_rate, intr_rate2 in option_model.objects.filter(
+            pk__in=[option.pk for option in options if option.pk]
+        ).values_list("pk", "intr_rate", "intr_rate2")
+    }
+    rate_changes = []
+    for option in options:
+        if option.pk not in old_rates:
+            continue
+        old_rate, old_rate2 = old_rates[option.pk]
+        rate_change = build_rate_changes(old_rate, old_rate2, option.intr_rate, option.intr_rate2)
+        if rate_change:
+            rate_changes.append((option, rate_change, old_rate, old_rate2))
+    return rate_changes
+
+
+def update_options(spec, options, fields):
+    """
+    적재 외의 경로(관리자 화면 등)에서 수정한 기존 옵션들을 한 번에 저장합니다.
+    금리 변경은 detect_rate_changes 로 한꺼번에 찾아 적재와 같은 방식으로
+    변경 이력, 카탈로그 버전, 정렬용 최고 금리, 안내 메일 대기열에 반영합니다.
+    content_hash 도 수정한 값으로 다시 계산하므로, 다음 적재에서 API 값과 다르면 API 값으로 되돌아갑니다.
+    """
+    options = list(options)
+    for option in options:
+        values = _option_values(spec, {field: getattr(option, field) for field in spec.option_fields})
+        option.content_hash = content_hash(values)
+    if "content_hash" not in fields:
+        fields = list(fields) + ["content_hash"]
+    with transaction.atomic():
+        catalog_state = lock_catalog_state()
+        rate_changes = detect_rate_changes(spec.option_model, options)
+        spec.option_model.objects.bulk_update(options, fields, batch_size=BATCH_SIZE)
+        if not rate_changes:
+            return 0
+
+        sync_id = uuid.uuid4()
+        version = bump_catalog_version(catalog_state)
+        ProductChange.objects.bulk_create(
+            [
+                ProductChange(
+                    sync_id=sync_id,
+                    version=version,
+                    product_type=spec.product_type,
+                    fin_prdt_cd=option.product_id,
+                    intr_rate_type=option.intr_rate_type,
+                    save_trm=option.save_trm,
+                    change_type="updated",
+                    changed_fields=[
+                        field
+                        for field, old in (("intr_rate", old_rate), ("intr_rate2", old_rate2))
+                        if getattr(option, field) != old
+                    ],
+                    old_intr_rate=old_rate,
+                    new_intr_rate=option.intr_rate,
+                    old_intr_rate2=old_rate2,
+                    new_intr_rate2=option.intr_rate2,
+                )
+                for option, _, old_rate, old_rate2 in rate_changes
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        refresh_best_rates(spec, {option.product_id for option, _, _, _ in rate_changes})
+        record_rate_history(spec, [option for option, _, _, _ in rate_changes])
+        enqueue_rate_change_emails([(option, rate_change) for option, rate_change, _, _ in rate_changes])
+    return len(rate_changes)
+
+
+def record_rate_history(spec, options):
+    """
+    옵션들의 현재 금리를 오늘 날짜의 금리 이력으로 저장합니다.
+    같은 날 여러 번 바뀌면 그날의 마지막 금리만 남깁니다.
+    """
+    if not options:
+        return 0
+    if any(option.pk is None for option in options):
+        # bulk_create 가 pk 를 돌려주지 않는 DB 에서는 옵션 키로 한 번에 다시 조회
+        ids = {
+            _option_key(product_id, intr_rate_type, save_trm): pk
+            for pk, product_id, intr_rate_type, save_trm in spec.option_model.objects.filter(
+                product_id__in={option.product_id for option in options}
+            ).values_list("pk", "product_id", "intr_rate_type", "save_trm")
+        }
+        for option in options:
+            if option.pk is None:
+                option.pk = ids.get(_option_key(option.product_id, option.intr_rate_type, option.save_trm))
+    today = timezone.localdate()
+    spec.history_model.objects.bulk_create(
+        [
+            spec.history_model(
+                option_id=option.pk,
+                date=today,
+                intr_rate=option.intr_rate,
+                intr_rate2=option.intr_rate2,
+            )
+            for option in options
+            if option.pk is not None
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["option", "date"],
+        update_fields=["intr_rate", "intr_rate2"],
+    )
+    return len(options)
+
+
+def refresh_best_rates(spec, codes):
+    """
+    주어진 상품들의 best_* 컬럼을 옵션 금리로부터 다시 계산해 한 번에 저장합니다.
+    (옵션 조회 1회 + bulk UPDATE)
+    """
+    codes = set(codes)
+    if not codes:
+        return 0
+    product_model = spec.product_model
+    empty = {field: None for field in BEST_RATE_FIELDS}
+    empty.update(best_intr_rate=ZERO_RATE, best_intr_rate2=ZERO_RATE)
+    best = {code: dict(empty) for code in codes}
+    for product_id, save_trm, intr_rate, intr_rate2 in spec.option_model.objects.filter(
+        product_id__in=codes
+    ).values_list("product_id", "save_trm", "intr_rate", "intr_rate2"):
+        values = best[product_id]
+        intr_rate = intr_rate if intr_rate is not None else ZERO_RATE
+        intr_rate2 = intr_rate2 if intr_rate2 is not None else ZERO_RATE
+        values["best_intr_rate"] = max(values["best_intr_rate"], intr_rate)
+        values["best_intr_rate2"] = max(values["best_intr_rate2"], intr_rate2)
+        term_field = product_model.best_rate_field(save_trm)
+        if term_field:
+            values[term_field] = max(values[term_field] or ZERO_RATE, intr_rate)
+
+    product_model.objects.bulk_update(
+        [product_model(fin_prdt_cd=code, **values) for code, values in best.items()],
+        BEST_RATE_FIELDS,
+        batch_size=BATCH_SIZE,
+    )
+    return len(best)
+
+
+def _prune_missing(spec, incoming_codes, incoming_option_keys, stored_codes, existing_options):
+    """
+    이번 응답에 없는 상품/옵션을 삭제하고 (삭제된 상품 코드 목록, 삭제된 옵션 행 목록)을 반환합니다.
+    응답에 없는 상품의 옵션은 상품 삭제 시 함께 지워집니다.
+    """
+    subscription_model = spec.subscription_model
+    stale_codes = set(stored_codes) - set(incoming_codes)
+    stale_options = {
+        row["id"]: row
+        for key, row in existing_options.items()
+        if key not in incoming_option_keys and row["product_id"] in incoming_codes
+    }
+    if not stale_codes and not stale_options:
+        return [], []
+
+    held_codes = set(
+        subscription_model.objects.filter(product_id__in=stale_codes).values_list(
+            "product_id", flat=True
+        )
+    )
+    held_option_ids = set(
+        subscription_model.objects.filter(option_id__in=stale_options).values_list(
+            "option_id", flat=True
+        )
+    )
+    removed_codes = sorted(stale_codes - held_codes)
+    removed_options = [row for pk, row in stale_options.items() if pk not in held_option_ids]
+
+    if removed_options:
+        spec.option_model.objects.filter(pk__in=[row["id"] for row in removed_options]).delete()
+    if removed_codes:
+        spec.product_model.objects.filter(fin_prdt_cd__in=removed_codes).delete()
+    return removed_codes, removed_options
+
+
+def ingest_deposit_products(base_lst, option_lst, prune=False):
+    """예금 상품/옵션 일괄 적재"""
+    return ingest_products(DEPOSIT_SPEC, base_lst, option_lst, prune=prune)
+
+
+def ingest_saving_products(base_lst, option_lst, prune=False):
+    """적금 상품/옵션 일괄 적재"""
+    return ingest_products(SAVING_SPEC, base_lst, option_lst, prune=prune)
@@ -0,0 +1,311 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django_apscheduler import util
+
+from .fetchers import get_top_fin_grp_nos, iter_product_pages, page_batch
+from .ingest import DEPOSIT_SPEC, SAVING_SPEC, collect_rate_changes, ingest_product_pages
+from .models import SyncRun, SyncRunPage
+from .idempotency import purge_idempotency_keys
+from .outbox import drain_email_outbox
+from .utils import enqueue_rate_change_emails
+
+logger = logging.getLogger(__name__)
+
+INGEST_SPECS = {
+    "deposit": DEPOSIT_SPEC,
+    "saving": SAVING_SPEC,
+}
+
+# 실패한 실행을 이어받는 최대 횟수 (초과하면 새 실행을 만듦)
+MAX_ATTEMPTS = 3
+# 이 시간 이상 running 상태로 남은 실행은 워커가 죽은 것으로 보고 이어받음
+STALE_RUNNING_AFTER = timedelta(hours=1)
+
+
+def create_sync_run(kind, top_fin_grp_nos=None):
+    """
+    동기화 실행을 만듭니다. 같은 종류의 실행이 이미 대기/실행 중이면 그 실행을 반환합니다.
+    :return: (SyncRun, created)
+    """
+    with transaction.atomic():
+        active = (
+            SyncRun.objects.select_for_update()
+            .filter(kind=kind, status__in=["pending", "running"])
+            .order_by("-created_at")
+            .first()
+        )
+        if active and not _is_stale(active):
+            return active, False
+        run = SyncRun.objects.create(
+            kind=kind,
+            top_fin_grp_nos=list(top_fin_grp_nos or get_top_fin_grp_nos()),
+        )
+        return run, True
+
+
+def enqueue_sync_run(kind):
+    """
+    동기화 실행을 만들고(또는 실패한 실행을 이어받고) 공용 스케줄러에 즉시 실행 작업으로 등록합니다.
+    HTTP 요청에서는 이 함수만 호출하고 실제 조회/적재는 스케줄러 스레드에서 처리합니다.
+    """
+    from market_indices.jobs import scheduler
+
+    run = find_resumable_run(kind)
+    # 실패한 실행이 있으면 새로 만들지 않고 이어받음 (그 사이 다른 요청이 먼저 이어받았으면 건너뜀)
+    if run is not None and SyncRun.objects.filter(pk=run.pk, status=run.status).update(status="pending"):
+        run.status = "pending"
+        created = True
+    else:
+        run, created = create_sync_run(kind)
+    if created:
+        scheduler.add_job(
+            run_sync_job,
+            trigger="date",
+            run_date=timezone.now(),
+            args=[run.pk],
+            id=f"product_sync_run_{run.pk}",
+            replace_existing=True,
+            misfire_grace_time=3600,
+        )
+        logger.info(f"상품 동기화 실행 #{run.pk} ({kind}) 을 등록했습니다.")
+    return run
+
+
+def _is_stale(run):
+    return (
+        run.status == "running"
+        and run.started_at is not None
+        and timezone.now() - run.started_at > STALE_RUNNING_AFTER
+    )
+
+
+def find_resumable_run(kind):
+    """이어받을 수 있는 가장 최근의 실패(또는 중단된) 실행을 반환합니다."""
+    run = (
+        SyncRun.objects.filter(kind=kind, status__in=["failed", "running"])
+        .order_by("-created_at")
+        .first()
+    )
+    if run is None or run.attempts >= MAX_ATTEMPTS:
+        return None
+    if run.status == "running" and not _is_stale(run):
+        return None
+    # 더 최근에 성공한 실행이 있으면 이어받을 필요 없음
+    if SyncRun.objects.filter(kind=kind, status="success", created_at__gt=run.created_at).exists():
+        return None
+    return run
+
+
+def claim_sync_run(run):
+    """
+    실행을 선점합니다. 대기/실패 상태이거나 워커가 죽은(오래된 running) 실행만
+    조건부 UPDATE 한 번으로 running 으로 바꾸므로, 같은 실행을 두 워커가 동시에 처리하지 않습니다.
+    :return: 선점했으면 True
+    """
+    now = timezone.now()
+    claimable = Q(status__in=["pending", "failed"]) | Q(
+        status="running", started_at__lt=now - STALE_RUNNING_AFTER
+    )
+    return bool(
+        SyncRun.objects.filter(claimable, pk=run.pk).update(
+            status="running",
+            attempts=F("attempts") + 1,
+            started_at=now,
+            finished_at=None,
+            error="",
+        )
+    )
+
+
+def execute_sync_run(run, notify=True):
+    """
+    동기화 실행 하나를 처리합니다.
+
+    1) 아직 받지 않은 페이지만 금감원 API에서 조회하고, 받는 즉시 SyncRunPage 에 저장
+    2) 모든 페이지가 모이면 저장된 페이지를 하나씩 읽어 한 트랜잭션으로 적재 (응답에 없는 상품 정리 포함)
+    3) notify=True 이면 금리 변경 안내 메일을 넣음 (notify_sync_runs 참고)
+    중간에 실패하면 받아 둔 페이지는 남겨 두므로 다음 실행에서 마지막으로 받은 페이지 이후부터 이어받습니다.
+    다른 워커가 이미 처리 중이거나 끝낸 실행이면 아무것도 하지 않습니다.
+    """
+    if not claim_sync_run(run):
+        run.refresh_from_db()
+        logger.info(f"상품 동기화 실행 #{run.pk} ({run.kind}) 은 이미 처리 중이거나 끝났습니다 ({run.status}).")
+        return run
+    run.refresh_from_db()
+    logger.info(f"상품 동기화 실행 #{run.pk} ({run.kind}) 시작 (시도 {run.attempts}회)")
+
+    try:
+        fetch_started = time.monotonic()
+        stored_pages = set(run.pages.values_list("top_fin_grp_no", "page_no"))
+        max_page_nos = dict(run.max_page_nos)
+        for grp_no, page_no, result in iter_product_pages(
+            run.kind,
+            run.top_fin_grp_nos,
+            skip_pages=stored_pages,
+            max_page_nos=max_page_nos,
+        ):
+            SyncRunPage.objects.update_or_create(
+                run=run,
+                top_fin_grp_no=grp_no,
+                page_no=page_no,
+                defaults={
+                    "base_list": result.get("baseList") or [],
+                    "option_list": result.get("optionList") or [],
+                },
+            )
+            if page_no == 1:
+                max_page_nos[grp_no] = int(result.get("max_page_no") or 1)
+                SyncRun.objects.filter(pk=run.pk).update(max_page_nos=max_page_nos)
+        run.fetch_seconds = round(time.monotonic() - fetch_started, 3)
+
+        ingest_started = time.monotonic()
+        # 전체 응답을 메모리에 모으지 않고 저장된 페이지를 하나씩 읽어 넘김
+        pages = (
+            page_batch(grp_no, base_list, option_list)
+            for grp_no, base_list, option_list in run.pages.order_by("top_fin_grp_no", "page_no")
+            .values_list("top_fin_grp_no", "base_list", "option_list")
+            .iterator(chunk_size=1)
+        )
+        # 안내 메일은 실행이 끝난 뒤 변경 이력에서 모아 넣음
+        result = ingest_product_pages(INGEST_SPECS[run.kind], pages, prune=True, notify=False)
+        run.ingest_seconds = round(time.monotonic() - ingest_started, 3)
+        result["total_products"] = result["new_products"] + result["updated_products"]
+        if not result["total_products"]:
+            raise ValueError("No data available")
+
+        run.status = "success"
+        run.result = result
+        run.max_page_nos = max_page_nos
+        run.finished_at = timezone.now()
+        run.save(
+            update_fields=[
+                "status",
+                "result",
+                "max_page_nos",
+                "fetch_seconds",
+                "ingest_seconds",
+                "finished_at",
+            ]
+        )
+        run.pages.all().delete()
+        logger.info(
+            f"상품 동기화 실행 #{run.pk} 완료: 조회 {run.fetch_seconds}s, 적재 {run.ingest_seconds}s, {result}"
+        )
+    except Exception as e:
+        run.status = "failed"
+        run.error = str(e)
+        run.finished_at = timezone.now()
+        run.save(update_fields=["status", "error", "fetch_seconds", "finished_at"])
+        logger.error(f"상품 동기화 실행 #{run.pk} 실패: {e}")
+    if notify and run.status == "success":
+        notify_sync_runs()
+    return run
+
+
+def notify_sync_runs():
+    """
+    성공한 실행 중 아직 금리 변경 안내 메일을 넣지 않은 실행(result.queued_emails 가 null)을 모아
+    변경 이력에서 금리 변경을 찾고, 사용자마다 메일 한 통으로 발송 대기열에 넣습니다.
+    예금/적금 실행을 모두 마친 뒤 한 번 호출하면 두 종류의 변경이 한 메일로 묶이고,
+    적재 후 메일을 넣기 전에 프로세스가 죽었어도 다음 호출에서 이어서 넣습니다.
+    :return: 저장한 메일 수
+    """
+    with transaction.atomic():
+        runs = list(
+            SyncRun.objects.select_for_update().filter(status="success", result__queued_emails=None)
+        )
+        if not runs:
+            return 0
+        rate_changes = collect_rate_changes(run.result["sync_id"] for run in runs)
+        queued = enqueue_rate_change_emails(rate_changes) if rate_changes else 0
+        for run in runs:
+            run.result["queued_emails"] = queued
+        SyncRun.objects.bulk_update(runs, ["result"])
+    logger.info(f"상품 동기화 실행 {[run.pk for run in runs]} 의 금리 변경 안내 메일 {queued}건을 넣었습니다.")
+    return queued
+
+
+@util.close_old_connections
+def run_sync_job(run_id):
+    """스케줄러에서 등록된 실행 하나를 처리하는 작업"""
+    run = SyncRun.objects.filter(pk=run_id).first()
+    if run is None or run.status == "success":
+        return
+    execute_sync_run(run)
+
+
+@util.close_old_connections
+def sync_fss_products_job():
+    """
+    매일 예금/적금 상품을 동기화하는 스케줄링 작업.
+    직전 실행이 실패했다면 새로 시작하지 않고 그 실행을 이어받습니다.
+    금리 변경 안내 메일은 두 종류를 모두 적재한 뒤 사용자마다 한 통으로 넣습니다.
+    """
+    for kind in INGEST_SPECS:
+        run = find_resumable_run(kind)
+        if run is None:
+            run, created = create_sync_run(kind)
+            if not created:
+                # 이미 대기(스케줄러에 등록됨) 또는 실행 중인 실행은 그 작업에 맡김
+                logger.info(f"상품 동기화 실행 #{run.pk} ({kind}) 이 이미 {run.get_status_display()} 상태입니다.")
+                continue
+        execute_sync_run(run, notify=False)
+    notify_sync_runs()
+
+
+@util.close_old_connections
+def drain_email_outbox_job():
+    """발송 대기 메일(금리 변경 안내 등)을 보내는 스케줄링 작업"""
+    drain_email_outbox()
+
+
+@util.close_old_connections
+def purge_idempotency_keys_job():
+    """만료된 가입/해지 Idempotency-Key 를 정리하는 스케줄링 작업"""
+    purge_idempotency_keys()
+
+
+def register_product_jobs():
+    """
+    market_indices.jobs 에서 시작하는 공용 스케줄러에 상품 동기화 작업을 등록합니다.
+    """
+    from market_indices.jobs import scheduler
+
+    try:
+        scheduler.add_job(
+            sync_fss_products_job,
+            trigger="cron",
+            hour=6,
+            minute=0,  # 매일 06:00 (UTC)
+            id="sync_fss_products_job",
+            replace_existing=True,
+            misfire_grace_time=3600,
+        )
+        logger.info("금감원 상품 동기화 작업이 스케줄러에 등록되었습니다 (매일 실행).")
+        scheduler.add_job(
+            drain_email_outbox_job,
+            trigger="interval",
+            minutes=1,
+            id="drain_email_outbox_job",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+        logger.info("발송 대기 메일 처리 작업이 스케줄러에 등록되었습니다 (1분마다 실행).")
+        scheduler.add_job(
+            purge_idempotency_keys_job,
+            trigger="interval",
+            hours=1,
+            id="purge_idempotency_keys_job",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+        logger.info("만료된 Idempotency-Key 정리 작업이 스케줄러에 등록되었습니다 (1시간마다 실행).")
+    except Exception as e:
+        logger.error(f"상품 동기화 작업 등록 중 오류 발생: {e}")
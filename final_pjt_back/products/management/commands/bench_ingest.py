@@ -0,0 +1,128 @@
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from products.fetchers import fetch_products
+from products.ingest import DEPOSIT_SPEC, SAVING_SPEC, ingest_product_pages
+from products.standin import build_standin_session
+
+SPECS = {"deposit": DEPOSIT_SPEC, "saving": SAVING_SPEC}
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE")
+
+
+class StatementCounter:
+    """connection.execute_wrapper 로 실행된 SQL 문 수와 쓰기 문이 바꾼 행 수를 셉니다."""
+
+    def __init__(self):
+        self.statements = 0
+        self.rows_written = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.statements += 1
+        if sql.lstrip().upper().startswith(WRITE_VERBS):
+            rowcount = getattr(context["cursor"], "rowcount", -1)
+            if rowcount and rowcount > 0:
+                self.rows_written += rowcount
+        return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks FSS product ingestion against the local API stand-in built from "
+        "fixtures/products_dump.json. Reports wall time, SQL statements and rows written per phase. "
+        "All writes are rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", action="append", choices=sorted(SPECS), help="Repeatable. Defaults to every kind.")
+        parser.add_argument("--scale", type=int, default=1, help="Product multiplier (e.g. 10, 100).")
+        parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per API page (seconds).")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected 503 per page.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for injected errors.")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent page fetches.")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Commit the ingested data instead of rolling back (existing products are not cleared).",
+        )
+
+    def handle(self, *args, **options):
+        session_options = {
+            "scale": options["scale"],
+            "latency": options["latency"],
+            "error_rate": options["error_rate"],
+            "seed": options["seed"],
+        }
+        rows = []
+        try:
+            with transaction.atomic():
+                for kind in options["kind"] or list(SPECS):
+                    rows.extend(self.bench_kind(kind, session_options, options))
+                if not options["keep"]:
+                    transaction.set_rollback(True)
+        except requests.RequestException as e:
+            raise CommandError(f"Fetching from the stand-in failed (injected errors are not retried): {e}")
+
+        self.stdout.write(f"{'phase':<28}{'seconds':>10}{'statements':>12}{'rows':>10}  detail")
+        for phase, seconds, counter, detail in rows:
+            self.stdout.write(
+                f"{phase:<28}{seconds:>10.3f}{counter.statements:>12}{counter.rows_written:>10}  {detail}"
+            )
+        if not options["keep"]:
+            self.stdout.write(self.style.WARNING("All benchmark writes were rolled back."))
+
+    def measure(self, phase, func):
+        counter = StatementCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            result = func()
+        return (phase, time.perf_counter() - started, counter, result)
+
+    def bench_kind(self, kind, session_options, options):
+        spec = SPECS[kind]
+        workers = options["workers"]
+        rows = []
+
+        session = build_standin_session(**session_options)
+        # 같은 응답을 여러 단계에서 다시 적재하므로 페이지 묶음을 모아 둠
+        phase, seconds, counter, pages = self.measure(
+            f"{kind}:fetch", lambda: list(fetch_products(kind, session=session, max_workers=workers))
+        )
+        product_count = sum(len(base) for base, _ in pages)
+        option_count = sum(len(opts) for _, opts in pages)
+        detail = f"{len(pages)} pages, {product_count} products, {option_count} options"
+        rows.append((phase, seconds, counter, detail))
+
+        if not options["keep"]:
+            # 빈 테이블에서의 최초 적재를 재는 것이므로 기존 상품을 지움 (마지막에 롤백됨)
+            spec.product_model.objects.all().delete()
+
+        for phase in ("ingest:initial", "ingest:unchanged"):
+            rows.append(self._ingest(kind, phase, spec, pages, False))
+
+        changed_session = build_standin_session(**dict(session_options, error_rate=0.0, rate_shift="0.05"))
+        changed_pages = list(fetch_products(kind, session=changed_session, max_workers=workers))
+        rows.append(self._ingest(kind, "ingest:rate-change", spec, changed_pages, False))
+
+        # 상품 10% 가 응답에서 빠진 전체 동기화 (각 페이지의 앞쪽 90% 만 남김)
+        kept_pages = []
+        for base, opts in changed_pages:
+            kept_base = base[: max(len(base) * 9 // 10, 1)]
+            kept_codes = {entry["fin_prdt_cd"] for entry in kept_base}
+            kept_pages.append((kept_base, [entry for entry in opts if entry["fin_prdt_cd"] in kept_codes]))
+        rows.append(self._ingest(kind, "ingest:prune", spec, kept_pages, True))
+        return rows
+
+    def _ingest(self, kind, phase, spec, pages, prune):
+        phase, seconds, counter, result = self.measure(
+            f"{kind}:{phase}", lambda: ingest_product_pages(spec, pages, prune=prune)
+        )
+        detail = ", ".join(
+            f"{key}={result[key]}"
+            for key in ("new_products", "changed_products", "new_options", "updated_options", "removed_products")
+            if result.get(key)
+        )
+        return (phase, seconds, counter, detail or "no changes")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.catalog import bump_catalog_version, lock_catalog_state
+from products.ingest import BATCH_SIZE, DEPOSIT_SPEC, SAVING_SPEC, refresh_condition_tags
+
+SPECS = {"deposit": DEPOSIT_SPEC, "saving": SAVING_SPEC}
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-extracts condition tags from every stored product's spcl_cnd text. "
+        "Run after migrating to 0010 or after changing the extraction rules in products/conditions.py."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", action="append", choices=sorted(SPECS), help="Repeatable. Defaults to every kind.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            catalog_state = lock_catalog_state()
+            total = 0
+            for kind in options["kind"] or list(SPECS):
+                spec = SPECS[kind]
+                texts = {}
+                tag_count = 0
+                for code, spcl_cnd in spec.product_model.objects.values_list("fin_prdt_cd", "spcl_cnd"):
+                    texts[code] = spcl_cnd
+                    if len(texts) >= BATCH_SIZE:
+                        tag_count += refresh_condition_tags(spec, texts)
+                        texts = {}
+                tag_count += refresh_condition_tags(spec, texts)
+                total += tag_count
+                self.stdout.write(f"{kind}: {tag_count} tag(s)")
+            # 스냅샷의 조건 태그가 바뀌었으므로 카탈로그 버전을 올려 다시 만들게 함
+            version = bump_catalog_version(catalog_state)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total} condition tag(s) (catalog version {version})."))
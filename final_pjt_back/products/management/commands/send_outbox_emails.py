@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from products.outbox import SEND_BATCH_SIZE, drain_email_outbox
+
+
+class Command(BaseCommand):
+    help = "Sends pending EmailOutbox messages over a single mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEND_BATCH_SIZE,
+            help="Number of messages passed to each send_messages call.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches (default: until the outbox is empty).",
+        )
+
+    def handle(self, *args, **options):
+        summary = drain_email_outbox(
+            batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        style = self.style.ERROR if summary["failed"] else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"Sent {summary['sent']} message(s), {summary['failed']} failed "
+                f"in {summary['batches']} batch(es)."
+            )
+        )
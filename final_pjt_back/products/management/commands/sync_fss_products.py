@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.jobs import INGEST_SPECS, create_sync_run, execute_sync_run, find_resumable_run, notify_sync_runs
+from products.models import SyncRun
+
+
+class Command(BaseCommand):
+    help = "Fetches deposit/saving products from the FSS API and ingests them, resuming the last failed run when possible."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=sorted(INGEST_SPECS),
+            help="Product kind to sync (repeatable). Defaults to every kind.",
+        )
+        parser.add_argument(
+            "--run-id",
+            type=int,
+            help="Resume a specific SyncRun instead of picking one automatically.",
+        )
+        parser.add_argument(
+            "--fresh",
+            action="store_true",
+            help="Always start a new run instead of resuming a failed one.",
+        )
+
+    def handle(self, *args, **options):
+        if options["run_id"]:
+            run = SyncRun.objects.filter(pk=options["run_id"]).first()
+            if run is None:
+                raise CommandError(f"SyncRun #{options['run_id']} does not exist.")
+            runs = [run]
+        else:
+            runs = []
+            for kind in options["kind"] or list(INGEST_SPECS):
+                run = None if options["fresh"] else find_resumable_run(kind)
+                if run is None:
+                    run, created = create_sync_run(kind)
+                    if not created and run.status == "running":
+                        self.stdout.write(
+                            self.style.WARNING(f"SyncRun #{run.pk} ({kind}) is already running, skipping.")
+                        )
+                        continue
+                runs.append(run)
+
+        failed = False
+        for run in runs:
+            self.stdout.write(self.style.HTTP_INFO(f"Running SyncRun #{run.pk} ({run.kind})..."))
+            # 안내 메일은 모든 실행이 끝난 뒤 사용자마다 한 통으로 넣음
+            run = execute_sync_run(run, notify=False)
+            if run.status == "success":
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"SyncRun #{run.pk} succeeded: fetch {run.fetch_seconds}s, "
+                        f"ingest {run.ingest_seconds}s, {run.result}"
+                    )
+                )
+            else:
+                failed = True
+                self.stderr.write(self.style.ERROR(f"SyncRun #{run.pk} failed: {run.error}"))
+
+        queued = notify_sync_runs()
+        self.stdout.write(f"Queued {queued} rate change email(s).")
+
+        if failed:
+            raise CommandError("One or more sync runs failed. Re-run this command to resume them.")
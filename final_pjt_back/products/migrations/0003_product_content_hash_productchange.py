@@ -0,0 +1,57 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_alter_depositsubscription_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositoption',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='정규화된 API 필드 해시 (변경 감지용)', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='정규화된 API 필드 해시 (변경 감지용)', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='savingoption',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='정규화된 API 필드 해시 (변경 감지용)', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='정규화된 API 필드 해시 (변경 감지용)', max_length=32),
+        ),
+        migrations.CreateModel(
+            name='ProductChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sync_id', models.UUIDField(db_index=True, help_text='적재 실행 ID')),
+                ('product_type', models.CharField(choices=[('deposit', '예금'), ('saving', '적금')], max_length=10)),
+                ('fin_prdt_cd', models.CharField(help_text='금융상품 코드', max_length=100)),
+                ('intr_rate_type', models.CharField(blank=True, default='', max_length=1)),
+                ('save_trm', models.CharField(blank=True, default='', max_length=3)),
+                ('change_type', models.CharField(choices=[('created', '신규'), ('updated', '변경')], max_length=10)),
+                ('changed_fields', models.JSONField(default=list, help_text='변경된 필드 목록')),
+                ('old_intr_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('new_intr_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('old_intr_rate2', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('new_intr_rate2', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '상품 변경 이력',
+                'verbose_name_plural': '상품 변경 이력 목록',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['product_type', 'fin_prdt_cd'], name='productchange_product_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_content_hash_productchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0, help_text='카탈로그 버전')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '상품 카탈로그 상태',
+                'verbose_name_plural': '상품 카탈로그 상태',
+            },
+        ),
+        migrations.AddField(
+            model_name='productchange',
+            name='version',
+            field=models.PositiveBigIntegerField(db_index=True, default=0, help_text='이 변경이 반영된 카탈로그 버전'),
+        ),
+        migrations.AlterField(
+            model_name='productchange',
+            name='change_type',
+            field=models.CharField(choices=[('created', '신규'), ('updated', '변경'), ('removed', '삭제')], max_length=10),
+        ),
+    ]
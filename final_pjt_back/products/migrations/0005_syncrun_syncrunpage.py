@@ -0,0 +1,54 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_catalogstate_productchange_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('deposit', '예금'), ('saving', '적금')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '실행 중'), ('success', '성공'), ('failed', '실패')], db_index=True, default='pending', max_length=10)),
+                ('top_fin_grp_nos', models.JSONField(default=list, help_text='조회 대상 권역 코드')),
+                ('max_page_nos', models.JSONField(default=dict, help_text='권역별 전체 페이지 수')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='실행(재시도) 횟수')),
+                ('result', models.JSONField(blank=True, default=dict, help_text='적재 결과 요약')),
+                ('error', models.TextField(blank=True, default='')),
+                ('fetch_seconds', models.FloatField(blank=True, help_text='API 조회 소요 시간(초)', null=True)),
+                ('ingest_seconds', models.FloatField(blank=True, help_text='DB 적재 소요 시간(초)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': '상품 동기화 실행',
+                'verbose_name_plural': '상품 동기화 실행 목록',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncRunPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('top_fin_grp_no', models.CharField(max_length=6)),
+                ('page_no', models.PositiveIntegerField()),
+                ('base_list', models.JSONField(default=list)),
+                ('option_list', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField(auto_now_add=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pages', to='products.syncrun')),
+            ],
+            options={
+                'verbose_name': '상품 동기화 페이지',
+                'verbose_name_plural': '상품 동기화 페이지 목록',
+                'unique_together': {('run', 'top_fin_grp_no', 'page_no')},
+            },
+        ),
+    ]
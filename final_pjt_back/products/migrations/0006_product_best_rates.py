@@ -0,0 +1,160 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:34
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+BEST_RATE_TERMS = ("6", "12", "24", "36")
+ZERO_RATE = Decimal("0.00")
+
+
+def backfill_best_rates(apps, schema_editor):
+    """기존 옵션 금리로 상품별 최고 금리 컬럼을 채웁니다."""
+    for product_name, option_name in (
+        ("DepositProduct", "DepositOption"),
+        ("SavingProduct", "SavingOption"),
+    ):
+        product_model = apps.get_model("products", product_name)
+        option_model = apps.get_model("products", option_name)
+        best = {}
+        for product_id, save_trm, intr_rate, intr_rate2 in option_model.objects.values_list(
+            "product_id", "save_trm", "intr_rate", "intr_rate2"
+        ):
+            values = best.setdefault(
+                product_id, {"best_intr_rate": ZERO_RATE, "best_intr_rate2": ZERO_RATE}
+            )
+            intr_rate = intr_rate if intr_rate is not None else ZERO_RATE
+            intr_rate2 = intr_rate2 if intr_rate2 is not None else ZERO_RATE
+            values["best_intr_rate"] = max(values["best_intr_rate"], intr_rate)
+            values["best_intr_rate2"] = max(values["best_intr_rate2"], intr_rate2)
+            if str(save_trm) in BEST_RATE_TERMS:
+                field = f"best_rate_{save_trm}"
+                values[field] = max(values.get(field) or ZERO_RATE, intr_rate)
+
+        fields = ["best_intr_rate", "best_intr_rate2"] + [f"best_rate_{term}" for term in BEST_RATE_TERMS]
+        products = []
+        for code, values in best.items():
+            product = product_model(fin_prdt_cd=code)
+            for field in fields:
+                setattr(product, field, values.get(field))
+            products.append(product)
+        product_model.objects.bulk_update(products, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_syncrun_syncrunpage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_intr_rate',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='옵션 중 최고 저축 금리', max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_intr_rate2',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='옵션 중 최고 우대금리', max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_rate_12',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='12개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_rate_24',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='24개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_rate_36',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='36개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='best_rate_6',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='6개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='best_intr_rate',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='옵션 중 최고 저축 금리', max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='best_intr_rate2',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='옵션 중 최고 우대금리', max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='best_rate_12',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='12개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='best_rate_24',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='24개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='best_rate_36',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='36개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='best_rate_6',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='6개월 옵션 최고 저축 금리', max_digits=5, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['kor_co_nm'], name='depositproduct_co_nm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['-best_intr_rate', 'kor_co_nm'], name='depositproduct_best_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['-best_rate_6', 'kor_co_nm'], name='depositproduct_best6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['-best_rate_12', 'kor_co_nm'], name='depositproduct_best12_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['-best_rate_24', 'kor_co_nm'], name='depositproduct_best24_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['-best_rate_36', 'kor_co_nm'], name='depositproduct_best36_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['kor_co_nm'], name='savingproduct_co_nm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['-best_intr_rate', 'kor_co_nm'], name='savingproduct_best_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['-best_rate_6', 'kor_co_nm'], name='savingproduct_best6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['-best_rate_12', 'kor_co_nm'], name='savingproduct_best12_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['-best_rate_24', 'kor_co_nm'], name='savingproduct_best24_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['-best_rate_36', 'kor_co_nm'], name='savingproduct_best36_idx'),
+        ),
+        migrations.RunPython(backfill_best_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+PRODUCT_MODELS = {"deposit": "DepositProduct", "saving": "SavingProduct"}
+
+
+def _value(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return value or ""
+
+
+def backfill_companies(apps, schema_editor):
+    """
+    저장되어 있는 동기화 페이지 응답으로 금융회사와 기존 상품의 company_id 를 채웁니다.
+    상품 테이블에는 금융회사 코드가 없으므로, 페이지가 남아 있지 않은 상품은 content_hash 를 비워
+    다음 동기화에서 해시 비교를 건너뛰지 않고 company_id 를 채우도록 합니다.
+    """
+    company_model = apps.get_model("products", "FinancialCompany")
+    page_model = apps.get_model("products", "SyncRunPage")
+
+    companies = {}
+    product_companies = {kind: {} for kind in PRODUCT_MODELS}
+    # 최근에 받은 페이지의 값이 남도록 받은 순서대로 덮어씀
+    for kind, top_fin_grp_no, base_list in page_model.objects.order_by("fetched_at", "id").values_list(
+        "run__kind", "top_fin_grp_no", "base_list"
+    ).iterator():
+        for entry in base_list or []:
+            fin_co_no = _value(entry.get("fin_co_no"))
+            if not fin_co_no:
+                continue
+            kor_co_nm = _value(entry.get("kor_co_nm")) or companies.get(fin_co_no, ("", ""))[0]
+            companies[fin_co_no] = (kor_co_nm, top_fin_grp_no or "")
+            code = _value(entry.get("fin_prdt_cd"))
+            if code and kind in product_companies:
+                product_companies[kind][code] = fin_co_no
+
+    company_model.objects.bulk_create(
+        [
+            company_model(fin_co_no=fin_co_no, kor_co_nm=kor_co_nm, top_fin_grp_no=top_fin_grp_no)
+            for fin_co_no, (kor_co_nm, top_fin_grp_no) in companies.items()
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    for kind, model_name in PRODUCT_MODELS.items():
+        product_model = apps.get_model("products", model_name)
+        codes = set(product_model.objects.values_list("fin_prdt_cd", flat=True)) & set(product_companies[kind])
+        product_model.objects.bulk_update(
+            [
+                product_model(fin_prdt_cd=code, company_id=product_companies[kind][code])
+                for code in codes
+            ],
+            ["company_id"],
+            batch_size=500,
+        )
+        product_model.objects.filter(company_id__isnull=True).update(content_hash="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_best_rates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinancialCompany',
+            fields=[
+                ('fin_co_no', models.CharField(help_text='금융회사 코드', max_length=20, primary_key=True, serialize=False)),
+                ('kor_co_nm', models.CharField(help_text='금융회사명', max_length=100)),
+                ('top_fin_grp_no', models.CharField(blank=True, default='', help_text='권역 코드 (020000:은행, 030300:저축은행)', max_length=6)),
+            ],
+            options={
+                'verbose_name': '금융회사',
+                'verbose_name_plural': '금융회사 목록',
+                'ordering': ['kor_co_nm'],
+            },
+        ),
+        migrations.AddField(
+            model_name='depositproduct',
+            name='company',
+            field=models.ForeignKey(blank=True, help_text='금융회사', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)ss', to='products.financialcompany'),
+        ),
+        migrations.AddField(
+            model_name='savingproduct',
+            name='company',
+            field=models.ForeignKey(blank=True, help_text='금융회사', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)ss', to='products.financialcompany'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['company', '-best_intr_rate'], name='depositproduct_co_best_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['company', '-best_intr_rate'], name='savingproduct_co_best_idx'),
+        ),
+        migrations.RunPython(backfill_companies, migrations.RunPython.noop),
+    ]
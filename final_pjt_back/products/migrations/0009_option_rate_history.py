@@ -0,0 +1,76 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def seed_rate_history(apps, schema_editor):
+    """현재 옵션 금리를 오늘 날짜의 첫 이력으로 저장합니다."""
+    today = timezone.localdate()
+    for option_name, history_name in (
+        ("DepositOption", "DepositOptionRateHistory"),
+        ("SavingOption", "SavingOptionRateHistory"),
+    ):
+        option_model = apps.get_model("products", option_name)
+        history_model = apps.get_model("products", history_name)
+        history_model.objects.bulk_create(
+            [
+                history_model(option_id=pk, date=today, intr_rate=intr_rate, intr_rate2=intr_rate2)
+                for pk, intr_rate, intr_rate2 in option_model.objects.values_list(
+                    "pk", "intr_rate", "intr_rate2"
+                )
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavingOptionRateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='금리 적용(변경 확인) 일자')),
+                ('intr_rate', models.DecimalField(blank=True, decimal_places=2, help_text='저축 금리', max_digits=5, null=True)),
+                ('intr_rate2', models.DecimalField(blank=True, decimal_places=2, help_text='최고 우대금리', max_digits=5, null=True)),
+                ('option', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rate_history', to='products.savingoption')),
+            ],
+            options={
+                'verbose_name': '적금 옵션 금리 이력',
+                'verbose_name_plural': '적금 옵션 금리 이력',
+                'ordering': ['option', 'date'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DepositOptionRateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='금리 적용(변경 확인) 일자')),
+                ('intr_rate', models.DecimalField(blank=True, decimal_places=2, help_text='저축 금리', max_digits=5, null=True)),
+                ('intr_rate2', models.DecimalField(blank=True, decimal_places=2, help_text='최고 우대금리', max_digits=5, null=True)),
+                ('option', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rate_history', to='products.depositoption')),
+            ],
+            options={
+                'verbose_name': '예금 옵션 금리 이력',
+                'verbose_name_plural': '예금 옵션 금리 이력',
+                'ordering': ['option', 'date'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='savingoptionratehistory',
+            constraint=models.UniqueConstraint(fields=('option', 'date'), name='savingratehistory_option_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='depositoptionratehistory',
+            constraint=models.UniqueConstraint(fields=('option', 'date'), name='depositratehistory_option_date'),
+        ),
+        migrations.RunPython(seed_rate_history, migrations.RunPython.noop),
+    ]
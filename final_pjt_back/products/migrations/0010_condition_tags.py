@@ -0,0 +1,63 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_option_rate_history'),
+    ]
+
+    # 기존 상품의 태그는 비워 두고 마이그레이션 후 `manage.py refresh_condition_tags` 로 채움
+    # (마이그레이션이 products.conditions 의 현재 추출 규칙에 묶이지 않도록 앱 코드를 import 하지 않음)
+    operations = [
+        migrations.CreateModel(
+            name='DepositConditionTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(choices=[('salary', '급여이체'), ('card', '카드 사용'), ('first', '첫 거래 고객'), ('online', '비대면 가입/거래'), ('age', '연령 조건')], help_text='우대조건 종류', max_length=10)),
+                ('bonus_rate', models.DecimalField(blank=True, decimal_places=2, help_text='우대금리 (%p, 읽을 수 없으면 NULL)', max_digits=5, null=True)),
+                ('min_age', models.PositiveSmallIntegerField(blank=True, help_text='연령 조건 최소 나이', null=True)),
+                ('max_age', models.PositiveSmallIntegerField(blank=True, help_text='연령 조건 최대 나이', null=True)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='condition_tags', to='products.depositproduct')),
+            ],
+            options={
+                'verbose_name': '예금 우대조건 태그',
+                'verbose_name_plural': '예금 우대조건 태그',
+                'ordering': ['product', 'tag'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SavingConditionTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(choices=[('salary', '급여이체'), ('card', '카드 사용'), ('first', '첫 거래 고객'), ('online', '비대면 가입/거래'), ('age', '연령 조건')], help_text='우대조건 종류', max_length=10)),
+                ('bonus_rate', models.DecimalField(blank=True, decimal_places=2, help_text='우대금리 (%p, 읽을 수 없으면 NULL)', max_digits=5, null=True)),
+                ('min_age', models.PositiveSmallIntegerField(blank=True, help_text='연령 조건 최소 나이', null=True)),
+                ('max_age', models.PositiveSmallIntegerField(blank=True, help_text='연령 조건 최대 나이', null=True)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='condition_tags', to='products.savingproduct')),
+            ],
+            options={
+                'verbose_name': '적금 우대조건 태그',
+                'verbose_name_plural': '적금 우대조건 태그',
+                'ordering': ['product', 'tag'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['tag', '-bonus_rate'], name='savingconditiontag_tag_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='savingconditiontag',
+            constraint=models.UniqueConstraint(fields=('product', 'tag'), name='savingconditiontag_product_tag'),
+        ),
+        migrations.AddIndex(
+            model_name='depositconditiontag',
+            index=models.Index(fields=['tag', '-bonus_rate'], name='depositconditiontag_tag_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='depositconditiontag',
+            constraint=models.UniqueConstraint(fields=('product', 'tag'), name='depositconditiontag_product_tag'),
+        ),
+    ]
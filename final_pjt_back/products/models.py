@@ -1,6 +1,25 @@
 from django.db import models
 from django.conf import settings
-from .utils import get_subscribers_and_send_emails
+from django.utils import timezone
+
+from .conditions import CONDITION_LABELS
+
+
+# 금융회사 (금감원 API의 fin_co_no / kor_co_nm, 적재 시 갱신)
+class FinancialCompany(models.Model):
+    fin_co_no = models.CharField(max_length=20, primary_key=True, help_text="금융회사 코드")
+    kor_co_nm = models.CharField(max_length=100, help_text="금융회사명")
+    top_fin_grp_no = models.CharField(
+        max_length=6, blank=True, default="", help_text="권역 코드 (020000:은행, 030300:저축은행)"
+    )
+
+    class Meta:
+        ordering = ["kor_co_nm"]
+        verbose_name = "금융회사"
+        verbose_name_plural = "금융회사 목록"
+
+    def __str__(self):
+        return f"{self.kor_co_nm} ({self.fin_co_no})"
 
 
 # 추상 기본 상품 클래스
@@ -8,6 +27,14 @@ class BaseProduct(models.Model):
     fin_prdt_cd = models.CharField(
         max_length=100, primary_key=True, help_text="금융상품 코드"
     )
+    company = models.ForeignKey(
+        FinancialCompany,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="%(class)ss",
+        help_text="금융회사",
+    )
     kor_co_nm = models.CharField(max_length=100, help_text="금융회사명")
     fin_prdt_nm = models.CharField(max_length=255, help_text="금융상품명")
     join_way = models.TextField(blank=True, null=True, help_text="가입 방법")
@@ -31,13 +58,54 @@ class BaseProduct(models.Model):
     fin_co_subm_day = models.CharField(
         max_length=12, blank=True, null=True, help_text="금융회사 제출일"
     )
+    content_hash = models.CharField(
+        max_length=32, blank=True, default="", help_text="정규화된 API 필드 해시 (변경 감지용)"
+    )
+    # 옵션에서 미리 계산해 두는 정렬/필터용 금리 (적재 시 갱신)
+    # 금리가 없는 경우는 기존 예금 적재와 같이 0.00 으로 보고, 기간별 컬럼은 해당 기간 옵션이 없을 때만 NULL
+    best_intr_rate = models.DecimalField(
+        max_digits=5, decimal_places=2, default=0, help_text="옵션 중 최고 저축 금리"
+    )
+    best_intr_rate2 = models.DecimalField(
+        max_digits=5, decimal_places=2, default=0, help_text="옵션 중 최고 우대금리"
+    )
+    best_rate_6 = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="6개월 옵션 최고 저축 금리"
+    )
+    best_rate_12 = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="12개월 옵션 최고 저축 금리"
+    )
+    best_rate_24 = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="24개월 옵션 최고 저축 금리"
+    )
+    best_rate_36 = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="36개월 옵션 최고 저축 금리"
+    )
+
+    # 기간별 최고 금리 컬럼을 두는 저축 기간 (개월)
+    BEST_RATE_TERMS = ("6", "12", "24", "36")
 
     class Meta:
         abstract = True
+        indexes = [
+            models.Index(fields=["kor_co_nm"], name="%(class)s_co_nm_idx"),
+            models.Index(fields=["-best_intr_rate", "kor_co_nm"], name="%(class)s_best_idx"),
+            models.Index(fields=["company", "-best_intr_rate"], name="%(class)s_co_best_idx"),
+            models.Index(fields=["-best_rate_6", "kor_co_nm"], name="%(class)s_best6_idx"),
+            models.Index(fields=["-best_rate_12", "kor_co_nm"], name="%(class)s_best12_idx"),
+            models.Index(fields=["-best_rate_24", "kor_co_nm"], name="%(class)s_best24_idx"),
+            models.Index(fields=["-best_rate_36", "kor_co_nm"], name="%(class)s_best36_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.kor_co_nm}] {self.fin_prdt_nm} ({self.fin_prdt_cd})"
 
+    @classmethod
+    def best_rate_field(cls, save_trm):
+        """저축 기간에 해당하는 기간별 최고 금리 컬럼명 (지원하지 않는 기간이면 None)"""
+        save_trm = str(save_trm)
+        return f"best_rate_{save_trm}" if save_trm in cls.BEST_RATE_TERMS else None
+
 
 # 추상 기본 옵션 클래스
 class BaseOption(models.Model):
@@ -62,6 +130,9 @@ class BaseOption(models.Model):
         blank=True,
         help_text="최고 우대금리 (소수점 2자리)",
     )
+    content_hash = models.CharField(
+        max_length=32, blank=True, default="", help_text="정규화된 API 필드 해시 (변경 감지용)"
+    )
 
     class Meta:
         abstract = True
@@ -92,40 +163,6 @@ class DepositOption(BaseOption):
     # option_id를 AutoField로 자동 생성되도록 하거나, 복합키 역할을 하는 필드들로 unique_together 설정
     # 여기서는 Django의 관례에 따라 AutoField를 PK로 사용하고, 필요시 unique_together 추가
 
-    def save(self, *args, **kwargs):
-        old_instance = None
-        if self.pk:  # 기존 인스턴스인 경우
-            try:
-                old_instance = DepositOption.objects.get(pk=self.pk)
-            except DepositOption.DoesNotExist:
-                pass  # 새로 생성되는 경우와 동일하게 처리
-
-        super().save(*args, **kwargs)  # 먼저 저장하여 self.pk가 확실히 있도록 함
-
-        if old_instance:
-            changes = {}
-            if old_instance.intr_rate != self.intr_rate:
-                changes["기본 금리"] = (
-                    (
-                        f"{old_instance.intr_rate:.2f}"
-                        if old_instance.intr_rate is not None
-                        else "N/A"
-                    ),
-                    f"{self.intr_rate:.2f}" if self.intr_rate is not None else "N/A",
-                )
-            if old_instance.intr_rate2 != self.intr_rate2:
-                changes["최고 우대금리"] = (
-                    (
-                        f"{old_instance.intr_rate2:.2f}"
-                        if old_instance.intr_rate2 is not None
-                        else "N/A"
-                    ),
-                    f"{self.intr_rate2:.2f}" if self.intr_rate2 is not None else "N/A",
-                )
-
-            if changes:
-                get_subscribers_and_send_emails(self, changes)
-
     class Meta(BaseOption.Meta):  # 부모 Meta 상속
         unique_together = (
             ("product", "intr_rate_type", "save_trm"),
@@ -164,40 +201,6 @@ class SavingOption(BaseOption):
         max_length=20, blank=True, null=True, help_text="적금 종류명(청년/일반 등)"
     )  # 금융감독원 API에 있는 필드
 
-    def save(self, *args, **kwargs):
-        old_instance = None
-        if self.pk:  # 기존 인스턴스인 경우
-            try:
-                old_instance = SavingOption.objects.get(pk=self.pk)
-            except SavingOption.DoesNotExist:
-                pass
-
-        super().save(*args, **kwargs)
-
-        if old_instance:
-            changes = {}
-            if old_instance.intr_rate != self.intr_rate:
-                changes["기본 금리"] = (
-                    (
-                        f"{old_instance.intr_rate:.2f}"
-                        if old_instance.intr_rate is not None
-                        else "N/A"
-                    ),
-                    f"{self.intr_rate:.2f}" if self.intr_rate is not None else "N/A",
-                )
-            if old_instance.intr_rate2 != self.intr_rate2:
-                changes["최고 우대금리"] = (
-                    (
-                        f"{old_instance.intr_rate2:.2f}"
-                        if old_instance.intr_rate2 is not None
-                        else "N/A"
-                    ),
-                    f"{self.intr_rate2:.2f}" if self.intr_rate2 is not None else "N/A",
-                )
-
-            if changes:
-                get_subscribers_and_send_emails(self, changes)
-
     class Meta(BaseOption.Meta):  # 부모 Meta 상속
         unique_together = (("product", "intr_rate_type", "save_trm"),)
 
@@ -205,6 +208,117 @@ class SavingOption(BaseOption):
         return f"{self.product.fin_prdt_nm} 옵션: {super().__str__()}"
 
 
+# 추상 옵션 금리 이력 (금리가 바뀐 날만 한 행씩 추가)
+class BaseOptionRateHistory(models.Model):
+    date = models.DateField(help_text="금리 적용(변경 확인) 일자")
+    intr_rate = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="저축 금리"
+    )
+    intr_rate2 = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="최고 우대금리"
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ["option", "date"]
+
+    def __str__(self):
+        return f"{self.option_id} {self.date}: {self.intr_rate}% / {self.intr_rate2}%"
+
+
+# 예금 옵션 금리 이력
+class DepositOptionRateHistory(BaseOptionRateHistory):
+    option = models.ForeignKey(
+        DepositOption,
+        on_delete=models.CASCADE,
+        related_name="rate_history",
+        db_index=False,  # (option, date) 고유 제약의 인덱스로 충분
+    )
+
+    class Meta(BaseOptionRateHistory.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["option", "date"], name="depositratehistory_option_date")
+        ]
+        verbose_name = "예금 옵션 금리 이력"
+        verbose_name_plural = "예금 옵션 금리 이력"
+
+
+# 적금 옵션 금리 이력
+class SavingOptionRateHistory(BaseOptionRateHistory):
+    option = models.ForeignKey(
+        SavingOption,
+        on_delete=models.CASCADE,
+        related_name="rate_history",
+        db_index=False,  # (option, date) 고유 제약의 인덱스로 충분
+    )
+
+    class Meta(BaseOptionRateHistory.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["option", "date"], name="savingratehistory_option_date")
+        ]
+        verbose_name = "적금 옵션 금리 이력"
+        verbose_name_plural = "적금 옵션 금리 이력"
+
+
+# 추상 우대조건 태그 (적재 시 spcl_cnd 에서 추출, 상품당 태그 하나에 한 행)
+class BaseConditionTag(models.Model):
+    TAG_CHOICES = list(CONDITION_LABELS.items())
+
+    tag = models.CharField(max_length=10, choices=TAG_CHOICES, help_text="우대조건 종류")
+    bonus_rate = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True, help_text="우대금리 (%p, 읽을 수 없으면 NULL)"
+    )
+    min_age = models.PositiveSmallIntegerField(null=True, blank=True, help_text="연령 조건 최소 나이")
+    max_age = models.PositiveSmallIntegerField(null=True, blank=True, help_text="연령 조건 최대 나이")
+
+    class Meta:
+        abstract = True
+        ordering = ["product", "tag"]
+        indexes = [
+            # 조건 필터: 태그로 상품 찾기 (우대금리 큰 순)
+            models.Index(fields=["tag", "-bonus_rate"], name="%(class)s_tag_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} {self.get_tag_display()} ({self.bonus_rate}%p)"
+
+
+# 예금 우대조건 태그
+class DepositConditionTag(BaseConditionTag):
+    product = models.ForeignKey(
+        DepositProduct,
+        on_delete=models.CASCADE,
+        related_name="condition_tags",
+        to_field="fin_prdt_cd",
+        db_index=False,  # (product, tag) 고유 제약의 인덱스로 충분
+    )
+
+    class Meta(BaseConditionTag.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["product", "tag"], name="depositconditiontag_product_tag")
+        ]
+        verbose_name = "예금 우대조건 태그"
+        verbose_name_plural = "예금 우대조건 태그"
+
+
+# 적금 우대조건 태그
+class SavingConditionTag(BaseConditionTag):
+    product = models.ForeignKey(
+        SavingProduct,
+        on_delete=models.CASCADE,
+        related_name="condition_tags",
+        to_field="fin_prdt_cd",
+        db_index=False,  # (product, tag) 고유 제약의 인덱스로 충분
+    )
+
+    class Meta(BaseConditionTag.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["product", "tag"], name="savingconditiontag_product_tag")
+        ]
+        verbose_name = "적금 우대조건 태그"
+        verbose_name_plural = "적금 우대조건 태그"
+
+
 # 예금 상품 구독
 class DepositSubscription(models.Model):
     user = models.ForeignKey(
@@ -271,3 +385,172 @@ class SavingSubscription(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.product.fin_prdt_nm}"
+
+
+# 상품 카탈로그 버전 (적재로 변경이 생길 때마다 1씩 증가하는 단일 행)
+class CatalogState(models.Model):
+    version = models.PositiveBigIntegerField(default=0, help_text="카탈로그 버전")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "상품 카탈로그 상태"
+        verbose_name_plural = "상품 카탈로그 상태"
+
+    def __str__(self):
+        return f"catalog v{self.version}"
+
+
+# 상품 적재 변경 이력 (적재 1회마다 실제로 바뀐 상품/옵션만 기록)
+class ProductChange(models.Model):
+    PRODUCT_TYPE_CHOICES = [
+        ("deposit", "예금"),
+        ("saving", "적금"),
+    ]
+    CHANGE_TYPE_CHOICES = [
+        ("created", "신규"),
+        ("updated", "변경"),
+        ("removed", "삭제"),
+    ]
+
+    sync_id = models.UUIDField(db_index=True, help_text="적재 실행 ID")
+    version = models.PositiveBigIntegerField(
+        default=0, db_index=True, help_text="이 변경이 반영된 카탈로그 버전"
+    )
+    product_type = models.CharField(max_length=10, choices=PRODUCT_TYPE_CHOICES)
+    fin_prdt_cd = models.CharField(max_length=100, help_text="금융상품 코드")
+    # 옵션 변경인 경우에만 채워짐 (상품 자체 변경이면 빈 문자열)
+    intr_rate_type = models.CharField(max_length=1, blank=True, default="")
+    save_trm = models.CharField(max_length=3, blank=True, default="")
+    change_type = models.CharField(max_length=10, choices=CHANGE_TYPE_CHOICES)
+    changed_fields = models.JSONField(default=list, help_text="변경된 필드 목록")
+    old_intr_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    new_intr_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    old_intr_rate2 = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    new_intr_rate2 = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["product_type", "fin_prdt_cd"], name="productchange_product_idx"),
+        ]
+        verbose_name = "상품 변경 이력"
+        verbose_name_plural = "상품 변경 이력 목록"
+
+    @property
+    def is_option_change(self):
+        return bool(self.save_trm)
+
+    def __str__(self):
+        target = f"{self.fin_prdt_cd} {self.save_trm}개월" if self.is_option_change else self.fin_prdt_cd
+        return f"[{self.get_change_type_display()}] {target}"
+
+
+# 금감원 상품 동기화 실행 기록 (스케줄러/관리 명령/수동 요청 공용)
+class SyncRun(models.Model):
+    KIND_CHOICES = [
+        ("deposit", "예금"),
+        ("saving", "적금"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "대기"),
+        ("running", "실행 중"),
+        ("success", "성공"),
+        ("failed", "실패"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default="pending", db_index=True
+    )
+    top_fin_grp_nos = models.JSONField(default=list, help_text="조회 대상 권역 코드")
+    max_page_nos = models.JSONField(default=dict, help_text="권역별 전체 페이지 수")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="실행(재시도) 횟수")
+    result = models.JSONField(default=dict, blank=True, help_text="적재 결과 요약")
+    error = models.TextField(blank=True, default="")
+    fetch_seconds = models.FloatField(null=True, blank=True, help_text="API 조회 소요 시간(초)")
+    ingest_seconds = models.FloatField(null=True, blank=True, help_text="DB 적재 소요 시간(초)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "상품 동기화 실행"
+        verbose_name_plural = "상품 동기화 실행 목록"
+
+    def __str__(self):
+        return f"#{self.pk} {self.get_kind_display()} ({self.get_status_display()})"
+
+
+# 동기화 중 받아 둔 API 페이지 (실패 후 이어받기용, 성공하면 삭제)
+class SyncRunPage(models.Model):
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="pages")
+    top_fin_grp_no = models.CharField(max_length=6)
+    page_no = models.PositiveIntegerField()
+    base_list = models.JSONField(default=list)
+    option_list = models.JSONField(default=list)
+    fetched_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (("run", "top_fin_grp_no", "page_no"),)
+        verbose_name = "상품 동기화 페이지"
+        verbose_name_plural = "상품 동기화 페이지 목록"
+
+    def __str__(self):
+        return f"run #{self.run_id} {self.top_fin_grp_no} p{self.page_no}"
+
+
+# 발송 대기 이메일 (금리 변경 안내 등). 변경과 같은 트랜잭션에서 저장하고 백그라운드 작업이 발송
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "대기"),
+        ("sent", "발송 완료"),
+        ("failed", "발송 실패"),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="발송 시도 횟수")
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="다음 발송 시도 시각")
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="emailoutbox_due_idx"),
+        ]
+        verbose_name = "발송 대기 이메일"
+        verbose_name_plural = "발송 대기 이메일 목록"
+
+    def __str__(self):
+        return f"[{self.get_status_display()}] {self.to_email}: {self.subject}"
+
+
+# 가입/해지 요청의 Idempotency-Key (같은 키로 재시도하면 처음 응답을 그대로 돌려줌)
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    key = models.CharField(max_length=255, help_text="클라이언트가 보낸 Idempotency-Key")
+    request_hash = models.CharField(max_length=32, help_text="메서드/경로/본문 해시 (같은 키의 다른 요청 구분)")
+    # 처리 중이면 비어 있음
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="idempotencykey_user_key")
+        ]
+        verbose_name = "멱등성 키"
+        verbose_name_plural = "멱등성 키 목록"
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.status_code or '처리 중'})"
@@ -0,0 +1,112 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# send_messages 한 번에 보낼 메일 수
+SEND_BATCH_SIZE = 50
+# 이 횟수만큼 실패하면 failed 로 두고 더 이상 재시도하지 않음
+MAX_ATTEMPTS = 5
+# 재시도 간격: 1분, 2분, 4분, ... (최대 1시간)
+RETRY_BASE_DELAY = timedelta(minutes=1)
+RETRY_MAX_DELAY = timedelta(hours=1)
+
+
+def retry_delay(attempts):
+    """attempts 번째 실패 후 다음 시도까지 기다릴 시간 (지수 백오프)"""
+    return min(RETRY_BASE_DELAY * (2 ** max(attempts - 1, 0)), RETRY_MAX_DELAY)
+
+
+def _claim_batch(batch_size):
+    """
+    발송할 시각이 된 대기 메일을 잡아 둡니다.
+    다른 워커와 겹치지 않도록 잠긴 행은 건너뛰고, 잡은 행은 next_attempt_at 을 미뤄 둡니다.
+    (발송 도중 프로세스가 죽으면 미뤄 둔 시각 이후 다시 발송 대상이 됨)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("id")[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                next_attempt_at=now + RETRY_MAX_DELAY
+            )
+    return rows
+
+
+def _mark_sent(rows):
+    EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+        status="sent", sent_at=timezone.now(), last_error=""
+    )
+
+
+def _mark_failed(rows, error):
+    """배치 전체를 실패 처리하고, 시도 횟수에 따라 재시도 시각을 정합니다."""
+    now = timezone.now()
+    for row in rows:
+        row.attempts += 1
+        row.last_error = str(error)[:1000]
+        if row.attempts >= MAX_ATTEMPTS:
+            row.status = "failed"
+        else:
+            row.next_attempt_at = now + retry_delay(row.attempts)
+    EmailOutbox.objects.bulk_update(rows, ["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def drain_email_outbox(batch_size=SEND_BATCH_SIZE, max_batches=None, connection=None):
+    """
+    발송 대기 메일을 SMTP 연결 하나로 모두 보냅니다.
+    배치마다 send_messages 로 한 번에 보내고, 배치가 실패하면 그 배치를 지수 백오프로 재시도하도록
+    표시한 뒤 이번 실행을 멈춥니다. 배치 중간에 연결이 끊긴 경우 일부 메일은 중복 발송될 수 있습니다.
+
+    :param connection: 테스트 등에서 사용할 메일 백엔드 연결 (없으면 settings.EMAIL_BACKEND)
+    :return: {"sent": 발송 수, "failed": 실패 수, "batches": 배치 수}
+    """
+    connection = connection or get_connection(fail_silently=False)
+    summary = {"sent": 0, "failed": 0, "batches": 0}
+    opened = False
+    try:
+        while max_batches is None or summary["batches"] < max_batches:
+            rows = _claim_batch(batch_size)
+            if not rows:
+                break
+            summary["batches"] += 1
+            messages = [
+                EmailMessage(
+                    row.subject,
+                    row.body,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [row.to_email],
+                    connection=connection,
+                )
+                for row in rows
+            ]
+            try:
+                if not opened:
+                    connection.open()
+                    opened = True
+                connection.send_messages(messages)
+            except Exception as e:
+                logger.error(f"발송 대기 메일 {len(rows)}건 발송 실패: {e}")
+                _mark_failed(rows, e)
+                summary["failed"] += len(rows)
+                # 메일 서버 장애일 수 있으므로 나머지는 다음 실행에서 처리
+                break
+            _mark_sent(rows)
+            summary["sent"] += len(rows)
+    finally:
+        if opened:
+            connection.close()
+    if summary["batches"]:
+        logger.info(f"발송 대기 메일 처리: {summary}")
+    return summary
@@ -0,0 +1,61 @@
+from django.db.models import CharField, F, Value
+
+from .models import DepositSubscription, SavingSubscription
+
+# 상품 종류별 가입 모델
+PORTFOLIO_SOURCES = (
+    ("deposit", DepositSubscription),
+    ("saving", SavingSubscription),
+)
+
+# 보유 상품 한 건의 응답 필드 (UNION 의 열 순서)
+HOLDING_FIELDS = (
+    "id",
+    "product_type",
+    "product_id",
+    "fin_prdt_nm",
+    "kor_co_nm",
+    "option_id",
+    "intr_rate_type",
+    "save_trm",
+    "intr_rate",
+    "intr_rate2",
+    "rsrv_type_nm",
+    "amount",
+    "subscribed_at",
+)
+
+
+def _holdings(product_type, subscription_model, user):
+    # 예금에는 적립 유형이 없으므로 NULL 로 맞춤 (UNION 양쪽의 열 구성이 같아야 함)
+    rsrv_type_nm = (
+        F("product__rsrv_type_nm") if product_type == "saving" else Value(None, output_field=CharField())
+    )
+    return (
+        subscription_model.objects.filter(user=user)
+        .annotate(
+            product_type=Value(product_type, output_field=CharField()),
+            fin_prdt_nm=F("product__fin_prdt_nm"),
+            kor_co_nm=F("product__kor_co_nm"),
+            intr_rate_type=F("option__intr_rate_type"),
+            save_trm=F("option__save_trm"),
+            intr_rate=F("option__intr_rate"),
+            intr_rate2=F("option__intr_rate2"),
+            rsrv_type_nm=rsrv_type_nm,
+        )
+        .values_list(*HOLDING_FIELDS)
+        .order_by()  # UNION 안에서는 정렬할 수 없으므로 기본 정렬(-subscribed_at) 제거
+    )
+
+
+def get_portfolio(user):
+    """
+    사용자의 예금/적금 가입 상품을 상품·옵션 정보와 함께 UNION ALL 쿼리 한 번으로 읽습니다.
+    :return: 최근 가입 순 보유 상품 딕셔너리 목록
+    """
+    deposit, saving = (
+        _holdings(product_type, subscription_model, user)
+        for product_type, subscription_model in PORTFOLIO_SOURCES
+    )
+    rows = deposit.union(saving, all=True).order_by("-subscribed_at", "-id")
+    return [dict(zip(HOLDING_FIELDS, row)) for row in rows]
@@ -0,0 +1,206 @@
+import calendar
+import hashlib
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from .portfolio import get_portfolio
+from .simulation import INTEREST_TAX_RATE, installment_interest, lump_sum_interest
+
+# 계산된 예상 현금흐름 보관 시간 (키에 가입 내역/금리/기준일이 들어 있으므로 만료는 용량 관리용)
+PROJECTION_CACHE_TIMEOUT = 60 * 60 * 24
+PROJECTION_CACHE_PREFIX = "portfolio_projection"
+
+# 예상 현금흐름에 반영하는 보유 상품 값 (이 값 중 하나라도 바뀌면 다시 계산)
+FINGERPRINT_FIELDS = (
+    "product_type",
+    "id",
+    "option_id",
+    "save_trm",
+    "intr_rate_type",
+    "intr_rate",
+    "intr_rate2",
+    "amount",
+    "subscribed_at",
+)
+
+
+def month_index(day):
+    """연/월을 하나의 정수로 (월 단위 열 번호 계산용)"""
+    return day.year * 12 + day.month - 1
+
+
+def month_label(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def add_months(day, months):
+    """day 로부터 months 개월 뒤의 날짜 (해당 월에 같은 날이 없으면 말일)"""
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    return day.replace(year=year, month=month + 1, day=min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _local_date(value):
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def _term(value):
+    try:
+        term = int(value)
+    except (TypeError, ValueError):
+        return None
+    return term if term > 0 else None
+
+
+def projection_fingerprint(holdings, rate, today):
+    """가입 내역과 적용 금리, 기준일의 지문 (가입/해지, 금액·금리 변경, 날짜가 바뀌면 달라짐)"""
+    payload = "|".join(
+        [rate, today.isoformat()]
+        + [",".join(str(holding[field]) for field in FINGERPRINT_FIELDS) for holding in holdings]
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def project_cash_flows(holdings, rate="basic", today=None):
+    """
+    보유 상품 전체의 월별 현금흐름을 (상품 수 x 개월 수) NumPy 행렬로 계산합니다.
+    열은 가장 이른 가입 월부터 가장 늦은 만기 월까지의 달력 월이고,
+    예금은 가입 월에 원금을 한 번, 적금은 가입 월부터 만기 전 달까지 매월 가입 금액을 납입하는 것으로 봅니다.
+    이자는 simulation 과 같은 공식(단리/월복리, 이자소득세 15.4%)으로 만기 월에 원금과 함께 지급됩니다.
+
+    :param rate: "basic"(기본 금리) 또는 "max"(최고 우대금리)
+    :return: {"holdings": 상품별 만기 정보, "months": 월별 합계, "excluded": 금리/기간을 알 수 없어 뺀 상품}
+    """
+    today = today or timezone.localdate()
+    rate_field = "intr_rate2" if rate == "max" else "intr_rate"
+
+    projectable, excluded = [], []
+    for holding in holdings:
+        term = _term(holding["save_trm"])
+        annual_rate = holding[rate_field] if holding[rate_field] is not None else holding["intr_rate"]
+        if term is None or annual_rate is None:
+            excluded.append({"id": holding["id"], "product_type": holding["product_type"]})
+            continue
+        projectable.append((holding, term, float(annual_rate)))
+    if not projectable:
+        return {"holdings": [], "months": [], "excluded": excluded}
+
+    start_dates = [_local_date(holding["subscribed_at"]) for holding, _, _ in projectable]
+    terms = np.array([term for _, term, _ in projectable], dtype=np.int64)
+    rates = np.array([annual_rate for _, _, annual_rate in projectable], dtype=np.float64)
+    amounts = np.array([float(holding["amount"] or 0) for holding, _, _ in projectable], dtype=np.float64)
+    compound = np.array([holding["intr_rate_type"] == "M" for holding, _, _ in projectable], dtype=bool)
+    installment = np.array([holding["product_type"] == "saving" for holding, _, _ in projectable], dtype=bool)
+
+    # 열 번호: 가장 이른 가입 월 = 0, 만기 월 = 가입 월 + 기간
+    starts = np.array([month_index(day) for day in start_dates], dtype=np.int64)
+    base_month = int(starts.min())
+    offsets = starts - base_month
+    maturity_columns = offsets + terms
+    columns = np.arange(int(maturity_columns.max()) + 1, dtype=np.int64)
+
+    # 각 월말까지 경과한 개월 수 (가입 월 = 1, 만기 전 달 = 기간, 만기 월부터는 기간으로 고정)
+    elapsed = np.clip(columns[None, :] - offsets[:, None] + 1, 0, terms[:, None])
+    active = (columns[None, :] >= offsets[:, None]) & (columns[None, :] < maturity_columns[:, None])
+    at_maturity = columns[None, :] == maturity_columns[:, None]
+
+    # 납입: 예금은 가입 월에 원금 전액, 적금은 만기 전 달까지 매월
+    contributions = np.where(
+        installment[:, None],
+        np.where(active, amounts[:, None], 0.0),
+        np.where(columns[None, :] == offsets[:, None], amounts[:, None], 0.0),
+    )
+    paid_principal = np.cumsum(contributions, axis=1)
+
+    # 월말 기준 누적 세전 이자 (만기 월에 지급되므로 그 뒤로는 잔액에서 빠짐)
+    accrued = np.where(
+        installment[:, None],
+        installment_interest(amounts[:, None], rates[:, None], elapsed, compound[:, None]),
+        lump_sum_interest(amounts[:, None], rates[:, None], elapsed, compound[:, None]),
+    )
+    interest = accrued[np.arange(len(terms)), maturity_columns]
+    tax = np.floor(interest * INTEREST_TAX_RATE)
+    principal = np.where(installment, amounts * terms, amounts)
+    maturity_amount = principal + interest - tax
+
+    payouts = np.where(at_maturity, maturity_amount[:, None], 0.0)
+    taxes = np.where(at_maturity, tax[:, None], 0.0)
+    balances = np.where(active, paid_principal + accrued, 0.0)
+    # 이번 달에 새로 붙은 이자 (원 단위로 내린 누적 이자의 월별 차이라 합계가 만기 이자와 같음, 만기 월부터는 0)
+    monthly_interest = np.diff(np.floor(accrued), axis=1, prepend=0.0)
+
+    today_column = month_index(today) - base_month
+    today_position = min(max(today_column, 0), len(columns) - 1)
+
+    projected = []
+    for position, (holding, term, annual_rate) in enumerate(projectable):
+        maturity_date = add_months(start_dates[position], term)
+        elapsed_today = int(np.clip(today_column - offsets[position] + 1, 0, term))
+        projected.append(
+            {
+                "id": holding["id"],
+                "product_type": holding["product_type"],
+                "fin_prdt_cd": holding["product_id"],
+                "fin_prdt_nm": holding["fin_prdt_nm"],
+                "kor_co_nm": holding["kor_co_nm"],
+                "intr_rate_type": "M" if compound[position] else "S",
+                "applied_rate": round(annual_rate, 2),
+                "save_trm": term,
+                "amount": int(amounts[position]),
+                "start_date": start_dates[position].isoformat(),
+                "maturity_date": maturity_date.isoformat(),
+                "matured": maturity_date <= today,
+                "elapsed_months": elapsed_today,
+                "accrued_interest": int(np.floor(accrued[position, today_position]))
+                if today_column >= offsets[position]
+                else 0,
+                "principal": int(principal[position]),
+                "interest": int(np.floor(interest[position])),
+                "tax": int(tax[position]),
+                "maturity_amount": int(np.floor(maturity_amount[position])),
+            }
+        )
+    projected.sort(key=lambda row: (row["maturity_date"], row["product_type"], row["id"]))
+
+    totals = zip(
+        contributions.sum(axis=0),
+        monthly_interest.sum(axis=0),
+        taxes.sum(axis=0),
+        np.floor(payouts.sum(axis=0)),
+        np.floor(balances.sum(axis=0)),
+    )
+    months = [
+        {
+            "month": month_label(base_month + column),
+            "contribution": int(contribution),
+            "interest": int(month_interest),
+            "tax": int(month_tax),
+            "payout": int(payout),
+            "balance": int(balance),
+        }
+        for column, (contribution, month_interest, month_tax, payout, balance) in enumerate(totals)
+    ]
+    return {"holdings": projected, "months": months, "excluded": excluded}
+
+
+def get_portfolio_projection(user, rate="basic", today=None):
+    """
+    사용자의 예상 현금흐름. 보유 상품은 UNION 쿼리 한 번으로 읽고,
+    가입 내역과 금리의 지문이 같으면 캐시에 저장된 계산 결과를 그대로 사용합니다.
+    (가입/해지, 가입 금액 변경, 옵션 금리 변경이 생기면 지문이 바뀌어 다시 계산)
+
+    :return: (지문, 예상 현금흐름)
+    """
+    today = today or timezone.localdate()
+    holdings = get_portfolio(user)
+    fingerprint = projection_fingerprint(holdings, rate, today)
+    cache_key = f"{PROJECTION_CACHE_PREFIX}_{user.pk}_{fingerprint}"
+    projection = cache.get(cache_key)
+    if projection is None:
+        projection = project_cash_flows(holdings, rate=rate, today=today)
+        cache.set(cache_key, projection, timeout=PROJECTION_CACHE_TIMEOUT)
+    return fingerprint, projection
@@ -0,0 +1,213 @@
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import defaultdict
+
+from .catalog import get_catalog_version
+from .models import DepositProduct, SavingProduct, ProductChange
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODELS = {
+    "deposit": DepositProduct,
+    "saving": SavingProduct,
+}
+
+# 검색 대상 필드와 가중치
+SEARCH_FIELDS = {
+    "fin_prdt_nm": 3.0,
+    "join_member": 1.5,
+    "spcl_cnd": 1.0,
+    "join_way": 1.0,
+    "etc_note": 0.5,
+}
+# 상품명에 검색어가 그대로 들어 있으면 추가 점수
+EXACT_NAME_BONUS = 5.0
+
+# 변경된 상품이 이보다 많으면 부분 갱신 대신 전체를 다시 만듦
+MAX_INCREMENTAL_CHANGES = 2000
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def normalize_text(text):
+    """소문자로 바꾸고 한글/영문/숫자 외 문자는 공백으로 바꿉니다."""
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def tokenize(text):
+    """
+    어절마다 2-gram 으로 나눕니다. (한 글자 어절은 그대로 사용)
+    형태소 분석 없이도 "청년", "급여이체", "비대면" 같은 부분 검색이 가능합니다.
+    """
+    grams = []
+    for word in normalize_text(text).split():
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+class SearchDocument:
+    __slots__ = ("key", "product_type", "code", "name", "company", "texts", "grams")
+
+    def __init__(self, product_type, product):
+        self.key = (product_type, product.fin_prdt_cd)
+        self.product_type = product_type
+        self.code = product.fin_prdt_cd
+        self.name = product.fin_prdt_nm
+        self.company = product.kor_co_nm
+        # 후보 검증용 (공백 제거 후 부분 문자열 비교)
+        self.texts = {
+            field: normalize_text(getattr(product, field)).replace(" ", "") for field in SEARCH_FIELDS
+        }
+        # 2-gram -> 가중치 합 (필드 가중치 x 출현 횟수)
+        grams = defaultdict(float)
+        for field, weight in SEARCH_FIELDS.items():
+            for gram in tokenize(getattr(product, field)):
+                grams[gram] += weight
+        self.grams = dict(grams)
+
+
+class SearchIndex:
+    """
+    상품명/우대조건/가입대상/유의사항/가입방법에 대한 프로세스 내 n-gram 역색인.
+    카탈로그 버전이 바뀌면 ProductChange 에서 바뀐 상품만 찾아 색인을 부분 갱신합니다.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.documents = {}
+        self.postings = defaultdict(dict)  # gram -> {문서 키: 가중치}
+        self.lock = threading.RLock()
+
+    def _remove(self, key):
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        for gram in document.grams:
+            postings = self.postings.get(gram)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[gram]
+
+    def _add(self, document):
+        self._remove(document.key)
+        self.documents[document.key] = document
+        for gram, weight in document.grams.items():
+            self.postings[gram][document.key] = weight
+
+    def _load(self, product_type, codes=None):
+        queryset = SEARCH_MODELS[product_type].objects.only(
+            "fin_prdt_cd", "kor_co_nm", *SEARCH_FIELDS
+        )
+        if codes is not None:
+            queryset = queryset.filter(fin_prdt_cd__in=codes)
+        return [SearchDocument(product_type, product) for product in queryset.iterator(chunk_size=2000)]
+
+    def rebuild(self, version):
+        with self.lock:
+            self.documents = {}
+            self.postings = defaultdict(dict)
+            for product_type in SEARCH_MODELS:
+                for document in self._load(product_type):
+                    self._add(document)
+            self.version = version
+        logger.info(f"상품 검색 색인 생성 (버전 {version}, {len(self.documents)}건)")
+
+    def refresh(self, version):
+        """색인 버전 이후 변경된 상품만 다시 읽어 갱신합니다."""
+        with self.lock:
+            if self.version == version:
+                return
+            if self.version is None or version < self.version:
+                self.rebuild(version)
+                return
+            changed = set(
+                ProductChange.objects.filter(version__gt=self.version, version__lte=version)
+                .values_list("product_type", "fin_prdt_cd")
+                .distinct()
+            )
+            if len(changed) > MAX_INCREMENTAL_CHANGES:
+                self.rebuild(version)
+                return
+            for product_type in SEARCH_MODELS:
+                codes = {code for kind, code in changed if kind == product_type}
+                if not codes:
+                    continue
+                documents = self._load(product_type, codes)
+                for code in codes - {document.code for document in documents}:
+                    self._remove((product_type, code))  # 삭제된 상품
+                for document in documents:
+                    self._add(document)
+            self.version = version
+
+    def search(self, query, product_type=None, limit=20):
+        """
+        검색어의 모든 2-gram 을 포함하는 상품을 찾고, 실제로 검색어가 들어 있는지 확인한 뒤
+        필드 가중치 x IDF 점수 순으로 반환합니다.
+        :return: (전체 일치 수, [(점수, 문서, 일치 필드 목록), ...])
+        """
+        words = [word for word in normalize_text(query).split() if word]
+        grams = list(dict.fromkeys(tokenize(query)))
+        if not grams:
+            return 0, []
+        with self.lock:
+            total_documents = max(len(self.documents), 1)
+            posting_lists = [self.postings.get(gram, {}) for gram in grams]
+            if any(not postings for postings in posting_lists):
+                return 0, []
+            # 가장 짧은 목록부터 교집합
+            posting_lists.sort(key=len)
+            candidates = set(posting_lists[0])
+            for postings in posting_lists[1:]:
+                candidates &= postings.keys()
+                if not candidates:
+                    return 0, []
+
+            # 2-gram 이 흩어져 있는 경우를 걸러 냄 (2글자 이하 어절은 gram 과 같으므로 확인 불필요)
+            needs_check = any(len(word) > 2 for word in words)
+            weights = [math.log(1 + total_documents / len(postings)) for postings in posting_lists]
+            scored = []
+            for key in candidates:
+                document = self.documents[key]
+                if product_type and document.product_type != product_type:
+                    continue
+                if needs_check and not all(
+                    any(word in text for text in document.texts.values()) for word in words
+                ):
+                    continue
+                score = sum(postings[key] * weight for postings, weight in zip(posting_lists, weights))
+                if all(word in document.texts["fin_prdt_nm"] for word in words):
+                    score += EXACT_NAME_BONUS
+                scored.append((score, document))
+
+        top = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1].name or ""))
+        results = [
+            (
+                score,
+                document,
+                [
+                    field
+                    for field, text in document.texts.items()
+                    if any(word in text for word in words)
+                ],
+            )
+            for score, document in top
+        ]
+        return len(scored), results
+
+
+_index = SearchIndex()
+
+
+def get_search_index():
+    """현재 카탈로그 버전에 맞춰 갱신된 검색 색인을 반환합니다. (버전이 바뀐 경우에만 부분 갱신)"""
+    version = get_catalog_version()
+    if _index.version != version:
+        _index.refresh(version)
+    return _index
@@ -6,6 +6,10 @@ from .models import (
     SavingOption,
     DepositSubscription,
     SavingSubscription,
+    DepositConditionTag,
+    SavingConditionTag,
+    FinancialCompany,
+    SyncRun,
 )
 
 
@@ -14,20 +18,35 @@ class DepositOptionSerializer(serializers.ModelSerializer):
         model = DepositOption
         # product 필드는 DepositProductSerializer에서 역참조하므로 여기서는 제외하거나 읽기 전용으로 설정 가능
         # 여기서는 모든 필드를 포함시키되, 상품 상세 조회 시 옵션만 필요하다면 fields 조정 가능
-        fields = "__all__"
+        exclude = ("content_hash",)  # 적재용 내부 필드 제외
         read_only_fields = ("product",)
 
 
+class DepositConditionTagSerializer(serializers.ModelSerializer):
+    label = serializers.CharField(source="get_tag_display", read_only=True)
+
+    class Meta:
+        model = DepositConditionTag
+        fields = ("tag", "label", "bonus_rate", "min_age", "max_age")
+
+
 class DepositProductSerializer(serializers.ModelSerializer):
     options = DepositOptionSerializer(many=True, read_only=True)  # 중첩 시리얼라이저
+    # 적재 시 우대조건(spcl_cnd)에서 추출한 조건 태그
+    condition_tags = DepositConditionTagSerializer(many=True, read_only=True)
     # 현재 사용자의 해당 상품 구독 여부를 반환하는 필드 추가
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
         model = DepositProduct
-        fields = "__all__"  # 모든 필드를 포함하고, options 필드를 통해 관련 옵션들을 함께 보여줌
+        # 적재용 내부 필드(content_hash)를 제외한 모든 필드를 포함하고, options 필드를 통해 관련 옵션들을 함께 보여줌
+        exclude = ("content_hash",)
 
     def get_is_subscribed(self, obj):
+        # 목록 뷰는 요청당 한 번 조회한 가입 상품 코드 집합을 context로 넘겨줌
+        subscribed_codes = self.context.get('subscribed_codes')
+        if subscribed_codes is not None:
+            return obj.fin_prdt_cd in subscribed_codes
         # 시리얼라이저가 호출될 때 context에서 request 객체를 가져옴
         request = self.context.get('request')
         # request가 있고, 사용자가 인증된 경우에만 구독 여부 확인
@@ -40,20 +59,32 @@ class DepositProductSerializer(serializers.ModelSerializer):
 class SavingOptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = SavingOption
-        fields = "__all__"
+        exclude = ("content_hash",)  # 적재용 내부 필드 제외
         read_only_fields = ("product",)
 
 
+class SavingConditionTagSerializer(serializers.ModelSerializer):
+    label = serializers.CharField(source="get_tag_display", read_only=True)
+
+    class Meta:
+        model = SavingConditionTag
+        fields = ("tag", "label", "bonus_rate", "min_age", "max_age")
+
+
 class SavingProductSerializer(serializers.ModelSerializer):
     options = SavingOptionSerializer(many=True, read_only=True)  # 중첩 시리얼라이저
+    condition_tags = SavingConditionTagSerializer(many=True, read_only=True)
     # 현재 사용자의 해당 상품 구독 여부를 반환하는 필드 추가
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
         model = SavingProduct
-        fields = "__all__"
+        exclude = ("content_hash",)
 
     def get_is_subscribed(self, obj):
+        subscribed_codes = self.context.get('subscribed_codes')
+        if subscribed_codes is not None:
+            return obj.fin_prdt_cd in subscribed_codes
         request = self.context.get('request')
         if request and hasattr(request, "user") and request.user.is_authenticated:
             # obj는 현재 SavingProduct 인스턴스
@@ -61,6 +92,65 @@ class SavingProductSerializer(serializers.ModelSerializer):
         return False
 
 
+# 목록 화면용 필드 (긴 설명 텍스트는 상세 조회에서만 반환)
+PRODUCT_LIST_FIELDS = (
+    "fin_prdt_cd",
+    "company",
+    "kor_co_nm",
+    "fin_prdt_nm",
+    "join_deny",
+    "max_limit",
+    "best_intr_rate",
+    "best_intr_rate2",
+    "best_rate_6",
+    "best_rate_12",
+    "best_rate_24",
+    "best_rate_36",
+)
+OPTION_LIST_FIELDS = ("id", "intr_rate_type", "save_trm", "intr_rate", "intr_rate2")
+
+
+class DepositOptionListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DepositOption
+        fields = OPTION_LIST_FIELDS
+
+
+class DepositProductListSerializer(serializers.ModelSerializer):
+    """예금 상품 목록용 시리얼라이저 (우대조건/가입대상/유의사항 등 긴 텍스트 제외)"""
+
+    options = DepositOptionListSerializer(many=True, read_only=True)
+    is_subscribed = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DepositProduct
+        fields = PRODUCT_LIST_FIELDS + ("options", "is_subscribed")
+
+    def get_is_subscribed(self, obj):
+        # 목록은 요청당 한 번 조회한 가입 상품 코드 집합으로만 판단
+        return obj.fin_prdt_cd in self.context.get("subscribed_codes", ())
+
+
+class SavingOptionListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavingOption
+        fields = OPTION_LIST_FIELDS
+
+
+class SavingProductListSerializer(serializers.ModelSerializer):
+    """적금 상품 목록용 시리얼라이저 (우대조건/가입대상/유의사항 등 긴 텍스트 제외)"""
+
+    options = SavingOptionListSerializer(many=True, read_only=True)
+    is_subscribed = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SavingProduct
+        fields = PRODUCT_LIST_FIELDS + ("rsrv_type", "rsrv_type_nm", "options", "is_subscribed")
+
+    def get_is_subscribed(self, obj):
+        return obj.fin_prdt_cd in self.context.get("subscribed_codes", ())
+
+
 class DepositSubscriptionSerializer(serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.fin_prdt_nm', read_only=True)
     bank_name = serializers.CharField(source='product.kor_co_nm', read_only=True)
@@ -83,3 +173,18 @@ class SavingSubscriptionSerializer(serializers.ModelSerializer):
         model = SavingSubscription
         fields = ['id', 'product_name', 'bank_name', 'interest_rate', 'period', 'amount', 'subscribed_at']
         read_only_fields = ['subscribed_at']
+
+
+class FinancialCompanySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FinancialCompany
+        fields = ['fin_co_no', 'kor_co_nm', 'top_fin_grp_no']
+
+
+class SyncRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SyncRun
+        fields = [
+            'id', 'kind', 'status', 'top_fin_grp_nos', 'max_page_nos', 'attempts', 'result',
+            'error', 'fetch_seconds', 'ingest_seconds', 'created_at', 'started_at', 'finished_at',
+        ]
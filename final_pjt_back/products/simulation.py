@@ -0,0 +1,220 @@
+import threading
+
+import numpy as np
+
+from .catalog import get_catalog_version
+from .models import DepositOption, SavingOption
+
+# 이자소득세 (소득세 14% + 지방소득세 1.4%)
+INTEREST_TAX_RATE = 0.154
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+PRODUCT_TYPES = ("deposit", "saving")
+OPTION_MODELS = {
+    "deposit": DepositOption,
+    "saving": SavingOption,
+}
+
+
+class RateMatrix:
+    """
+    한 종류(예금/적금)의 옵션 금리를 열 단위 NumPy 배열로 들고 있는 읽기 전용 행렬.
+    카탈로그 버전마다 한 번만 만들고 요청 간에 공유합니다.
+    """
+
+    def __init__(self, product_type, rows):
+        self.product_type = product_type
+        self.option_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.product_codes = np.array([row[1] for row in rows], dtype=object)
+        self.product_names = np.array([row[2] for row in rows], dtype=object)
+        self.company_names = np.array([row[3] for row in rows], dtype=object)
+        self.terms = np.array([row[4] for row in rows], dtype=np.int32)
+        self.compound = np.array([row[5] == "M" for row in rows], dtype=bool)
+        # 금리가 비어 있는 옵션은 NaN 으로 두고 계산 대상에서 제외
+        self.intr_rate = np.array(
+            [np.nan if row[6] is None else float(row[6]) for row in rows], dtype=np.float64
+        )
+        self.intr_rate2 = np.array(
+            [np.nan if row[7] is None else float(row[7]) for row in rows], dtype=np.float64
+        )
+        # 상품 단위 값 (추천 점수 계산용): 가입 한도(없으면 inf), 가입 제한
+        self.max_limits = np.array(
+            [np.inf if row[8] is None else float(row[8]) for row in rows], dtype=np.float64
+        )
+        self.join_deny = np.array([(row[9] or "").strip() for row in rows], dtype=object)
+
+    @classmethod
+    def load(cls, product_type):
+        rows = []
+        queryset = OPTION_MODELS[product_type].objects.values_list(
+            "id",
+            "product_id",
+            "product__fin_prdt_nm",
+            "product__kor_co_nm",
+            "save_trm",
+            "intr_rate_type",
+            "intr_rate",
+            "intr_rate2",
+            "product__max_limit",
+            "product__join_deny",
+        ).order_by("id")
+        for row in queryset.iterator(chunk_size=2000):
+            try:
+                term = int(row[4])
+            except (TypeError, ValueError):
+                continue
+            rows.append((row[0], row[1], row[2], row[3], term, *row[5:]))
+        return cls(product_type, rows)
+
+    def __len__(self):
+        return len(self.option_ids)
+
+
+_matrix_lock = threading.Lock()
+# derived: 금리 행렬로 만든 파생 데이터 {(version, name): value} (금리 행렬을 다시 만들면 함께 버림)
+_matrix_cache = {"version": None, "matrices": None, "derived": {}}
+
+
+def get_rate_matrices():
+    """
+    현재 카탈로그 버전의 금리 행렬을 반환합니다. (버전이 바뀐 경우에만 다시 만듦)
+    :return: (version, {product_type: RateMatrix})
+    """
+    version = get_catalog_version()
+    matrices = _matrix_cache["matrices"]
+    if _matrix_cache["version"] == version and matrices is not None:
+        return version, matrices
+    with _matrix_lock:
+        if _matrix_cache["version"] != version or _matrix_cache["matrices"] is None:
+            _matrix_cache["matrices"] = {
+                product_type: RateMatrix.load(product_type) for product_type in PRODUCT_TYPES
+            }
+            _matrix_cache["version"] = version
+            _matrix_cache["derived"] = {}
+        return version, _matrix_cache["matrices"]
+
+
+def get_derived_matrix(name, build):
+    """
+    금리 행렬로 만드는 파생 데이터(추천 특성 행렬 등)를 카탈로그 버전마다 한 번만 만들어 공유합니다.
+    DB 를 다시 읽지 않고 build({product_type: RateMatrix}) 의 결과를 금리 행렬 캐시에 함께 보관합니다.
+    """
+    version, matrices = get_rate_matrices()
+    key = (version, name)
+    value = _matrix_cache["derived"].get(key)
+    if value is not None:
+        return value
+    with _matrix_lock:
+        value = _matrix_cache["derived"].get(key)
+        if value is None:
+            value = build(matrices)
+            # 그 사이 다른 버전으로 다시 만들어졌으면 보관하지 않음
+            if _matrix_cache["version"] == version:
+                _matrix_cache["derived"][key] = value
+        return value
+
+
+def clear_rate_matrices():
+    """금리 행렬과 파생 데이터를 버립니다. (버전을 올리지 않고 옵션을 직접 수정한 경우, 테스트 등)"""
+    with _matrix_lock:
+        _matrix_cache["version"] = None
+        _matrix_cache["matrices"] = None
+        _matrix_cache["derived"] = {}
+
+
+def lump_sum_interest(principal, annual_rates, months, compound):
+    """
+    예치식(거치식) 세전 이자. 단리는 원금 x 연이율 x 개월/12,
+    복리는 월 복리 원금 x ((1 + 연이율/12)^개월 - 1) 로 계산합니다.
+    """
+    rates = annual_rates / 100.0
+    simple = principal * rates * months / 12.0
+    compounded = principal * ((1.0 + rates / 12.0) ** months - 1.0)
+    return np.where(compound, compounded, simple)
+
+
+def installment_interest(monthly, annual_rates, months, compound):
+    """
+    정액 적립식 세전 이자 (매월 초 납입, 만기 시 일괄 지급).
+    단리: 월 납입액 x 연이율/12 x n(n+1)/2
+    복리: 월 납입액 x Σ((1 + 연이율/12)^k - 1), k = 1..n
+    """
+    monthly_rates = annual_rates / 1200.0
+    simple = monthly * monthly_rates * months * (months + 1) / 2.0
+    growth = (1.0 + monthly_rates) ** months - 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        compounded = monthly * ((1.0 + monthly_rates) * growth / monthly_rates - months)
+    # 금리가 0인 옵션은 0/0 이 되므로 이자도 0으로 처리
+    compounded = np.where(monthly_rates == 0, 0.0, compounded)
+    return np.where(compound, compounded, simple)
+
+
+def top_n_indices(values, limit):
+    """
+    값이 큰 순서대로 상위 limit 개의 인덱스 (전체 정렬 없이 argpartition 사용).
+    값이 같으면 앞쪽 인덱스가 먼저 오고, limit 경계에 걸린 동점도 앞쪽 인덱스를 고릅니다. (전체 정렬과 같은 결과)
+    """
+    if limit >= len(values):
+        return np.argsort(-values, kind="stable")
+    candidates = np.argpartition(-values, limit - 1)[:limit]
+    threshold = values[candidates].min()
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[: limit - len(above)]
+    candidates = np.concatenate([above, ties])
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+def simulate(term, principal=None, monthly=None, rate="basic", limit=DEFAULT_LIMIT):
+    """
+    기간(term 개월)이 일치하는 모든 옵션의 세후 만기 수령액을 계산해 상위 limit 개를 반환합니다.
+    principal 이 있으면 예금 옵션(목돈 예치), monthly 가 있으면 적금 옵션(매월 적립)을 계산합니다.
+    rate 가 "max" 이면 최고 우대금리(intr_rate2) 기준으로 계산하고 정렬합니다.
+    """
+    version, matrices = get_rate_matrices()
+    results = []
+    for product_type, amount, interest_func in (
+        ("deposit", principal, lump_sum_interest),
+        ("saving", monthly, installment_interest),
+    ):
+        if not amount:
+            continue
+        matrix = matrices[product_type]
+        rates = matrix.intr_rate2 if rate == "max" else matrix.intr_rate
+        mask = (matrix.terms == term) & ~np.isnan(rates)
+        indices = np.flatnonzero(mask)
+        if not len(indices):
+            continue
+
+        interest = interest_func(amount, rates[indices], term, matrix.compound[indices])
+        tax = np.floor(interest * INTEREST_TAX_RATE)
+        total_principal = amount if product_type == "deposit" else amount * term
+        maturity = total_principal + interest - tax
+
+        for position in top_n_indices(maturity, limit):
+            index = indices[position]
+            results.append(
+                {
+                    "product_type": product_type,
+                    "fin_prdt_cd": matrix.product_codes[index],
+                    "fin_prdt_nm": matrix.product_names[index],
+                    "kor_co_nm": matrix.company_names[index],
+                    "option_id": int(matrix.option_ids[index]),
+                    "intr_rate_type": "M" if matrix.compound[index] else "S",
+                    "intr_rate": _rate_or_none(matrix.intr_rate[index]),
+                    "intr_rate2": _rate_or_none(matrix.intr_rate2[index]),
+                    "principal": int(total_principal),
+                    "interest": int(np.floor(interest[position])),
+                    "tax": int(tax[position]),
+                    "maturity_amount": int(np.floor(maturity[position])),
+                }
+            )
+
+    # 예금/적금을 함께 계산한 경우 수익(세후 이자)이 큰 순서로 합쳐서 자름
+    results.sort(key=lambda row: row["interest"] - row["tax"], reverse=True)
+    return version, results[:limit]
+
+
+def _rate_or_none(value):
+    return None if np.isnan(value) else round(float(value), 2)
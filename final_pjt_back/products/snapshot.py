@@ -0,0 +1,259 @@
+import hashlib
+import logging
+import threading
+from types import MappingProxyType
+
+from .catalog import get_catalog_version
+from .facets import resolve_legacy_banks
+from .models import DepositProduct, SavingProduct
+from .serializers import (
+    DepositProductSerializer,
+    DepositProductListSerializer,
+    SavingProductSerializer,
+    SavingProductListSerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+# 상품 종류별 (모델, 상세 시리얼라이저, 목록 시리얼라이저)
+SNAPSHOT_SOURCES = {
+    "deposit": (DepositProduct, DepositProductSerializer, DepositProductListSerializer),
+    "saving": (SavingProduct, SavingProductSerializer, SavingProductListSerializer),
+}
+
+# 목록 정렬에 쓰는 필드 (OrderingFilter 와 같은 이름)
+SORT_FIELDS = ("fin_prdt_nm", "kor_co_nm", "best_intr_rate", "best_intr_rate2") + tuple(
+    f"best_rate_{term}" for term in DepositProduct.BEST_RATE_TERMS
+)
+
+
+class _Descending:
+    """내림차순 정렬 키 (문자열처럼 부호를 뒤집을 수 없는 값도 비교할 수 있도록 대소를 반대로 비교)"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def sort_key(field, descending, value, kor_co_nm, code):
+    """
+    정렬 순서 안에서 항목의 위치를 정하는 키. 스냅샷의 모든 정렬 순서는
+    (값이 없는 항목은 맨 뒤, 정렬 값, 금융회사명, 상품 코드) 순으로 정렬되어 있으므로
+    커서(키셋) 페이지네이션은 이 키로 다음 위치를 이진 탐색합니다.
+    """
+    if value is None:
+        return (1, None, kor_co_nm, code)
+    return (0, _Descending(value) if descending else value, kor_co_nm, code)
+
+
+class SnapshotEntry:
+    """스냅샷 안의 상품 한 건 (직렬화 결과와 필터/정렬용 값)"""
+
+    __slots__ = (
+        "code",
+        "company_id",
+        "kor_co_nm",
+        "join_deny",
+        "terms",
+        "rate_types",
+        "conditions",
+        "sort_values",
+        "data",
+        "list_data",
+        "option_rows",
+    )
+
+    def __init__(self, product, data, list_data, option_fields):
+        self.code = product.fin_prdt_cd
+        self.company_id = product.company_id
+        self.kor_co_nm = product.kor_co_nm or ""
+        self.join_deny = product.join_deny or ""
+        # 패싯/필터용 옵션 값 (옵션은 prefetch 되어 있음)
+        options = product.options.all()
+        self.terms = frozenset(str(option.save_trm) for option in options)
+        self.rate_types = frozenset(option.intr_rate_type for option in options)
+        # 우대조건 태그 -> {"bonus_rate", "min_age", "max_age"} (조건 태그도 prefetch 되어 있음)
+        self.conditions = MappingProxyType(
+            {
+                tag.tag: {"bonus_rate": tag.bonus_rate, "min_age": tag.min_age, "max_age": tag.max_age}
+                for tag in product.condition_tags.all()
+            }
+        )
+        self.sort_values = MappingProxyType({field: getattr(product, field) for field in SORT_FIELDS})
+        self.data = MappingProxyType(dict(data))
+        self.list_data = MappingProxyType(dict(list_data))
+        # options=compact 용 옵션 배열 (표현별 option_fields 순서)
+        self.option_rows = {
+            "detail": [[option[field] for field in option_fields["detail"]] for option in data["options"]],
+            "list": [[option[field] for field in option_fields["list"]] for option in list_data["options"]],
+        }
+
+    def render(self, subscribed_codes, view="detail", fields=None, compact=False):
+        """
+        요청한 사용자의 가입 여부를 채운 응답용 사본.
+        :param view: "detail"(전체 필드) 또는 "list"(목록용 필드)
+        :param fields: 지정하면 상세 필드 중 이 필드만 반환 (sparse fieldset)
+        :param compact: 옵션을 딕셔너리 대신 배열로 반환 (열 순서는 ProductCatalog.option_fields)
+        """
+        source = self.list_data if view == "list" else self.data
+        data = dict(source) if fields is None else {field: source[field] for field in fields}
+        if "is_subscribed" in data:
+            data["is_subscribed"] = self.code in subscribed_codes
+        if compact and "options" in data:
+            data["options"] = self.option_rows[view]
+        return data
+
+
+class ProductCatalog:
+    """
+    한 종류(예금/적금)의 상품 스냅샷.
+    직렬화는 만들 때 한 번만 하고, 자주 쓰는 정렬 순서(금융회사명, 최고 금리, 기간별 최고 금리)는 미리 계산해 둡니다.
+    """
+
+    def __init__(self, product_type, entries):
+        self.product_type = product_type
+        model, serializer_class, _ = SNAPSHOT_SOURCES[product_type]
+        self.model = model
+        # fields= 로 고를 수 있는 필드 (상세 응답의 필드)
+        self.field_names = tuple(serializer_class().fields)
+        self.option_fields = self.get_option_fields(product_type)
+        # 기본 정렬: 금융회사명 (같으면 상품 코드)
+        self.entries = tuple(sorted(entries, key=lambda entry: (entry.kor_co_nm, entry.code)))
+        self.by_code = MappingProxyType({entry.code: entry for entry in self.entries})
+        self.orders = {"kor_co_nm": self.entries}
+        for field in ["best_intr_rate"] + [f"best_rate_{term}" for term in DepositProduct.BEST_RATE_TERMS]:
+            # 기간별 금리는 해당 기간 옵션이 있는 상품만 포함 (DB 의 isnull=False 필터와 같음)
+            candidates = [entry for entry in self.entries if entry.sort_values[field] is not None]
+            self.orders[field] = tuple(
+                sorted(candidates, key=lambda entry: entry.sort_values[field], reverse=True)
+            )
+        self.orders = MappingProxyType(self.orders)
+        # 기존 bank_id(2~6) -> 금융회사 코드 집합
+        self.legacy_bank_ids = MappingProxyType(resolve_legacy_banks(self.entries))
+        # 필터 조합별 패싯 결과 (facets.get_facets 가 채움, 스냅샷과 함께 버려짐)
+        self.facet_cache = {}
+        # ordering 파라미터별 정렬 결과
+        self.ordered_cache = {}
+
+    @staticmethod
+    def get_option_fields(product_type):
+        """표현별 옵션 필드 순서 (options=compact 응답의 열 이름)"""
+        _, serializer_class, list_serializer_class = SNAPSHOT_SOURCES[product_type]
+        return {
+            "detail": tuple(serializer_class().fields["options"].child.fields),
+            "list": tuple(list_serializer_class().fields["options"].child.fields),
+        }
+
+    @classmethod
+    def load(cls, product_type):
+        model, serializer_class, list_serializer_class = SNAPSHOT_SOURCES[product_type]
+        products = list(model.objects.prefetch_related("options", "condition_tags"))
+        # 가입 여부는 요청마다 채우므로 빈 집합으로 직렬화 (상세/목록 표현 모두 스냅샷을 만들 때 한 번만)
+        context = {"subscribed_codes": set()}
+        serialized = serializer_class(products, many=True, context=context).data
+        list_serialized = list_serializer_class(products, many=True, context=context).data
+        option_fields = cls.get_option_fields(product_type)
+        return cls(
+            product_type,
+            [
+                SnapshotEntry(product, data, list_data, option_fields)
+                for product, data, list_data in zip(products, serialized, list_serialized)
+            ],
+        )
+
+    def get(self, code):
+        return self.by_code.get(code)
+
+    def ordered(self, field, descending=False):
+        """
+        미리 계산하지 않은 정렬 (ordering 파라미터)은 처음 요청될 때 정렬해 스냅샷에 보관합니다.
+        None 은 항상 뒤로 보냄
+        """
+        key = (field, descending)
+        entries = self.ordered_cache.get(key)
+        if entries is None:
+            present = [entry for entry in self.entries if entry.sort_values[field] is not None]
+            missing = [entry for entry in self.entries if entry.sort_values[field] is None]
+            present.sort(key=lambda entry: entry.sort_values[field], reverse=descending)
+            entries = self.ordered_cache[key] = tuple(present + missing)
+        return entries
+
+    @staticmethod
+    def position_after(entries, field, descending, cursor_key):
+        """정렬된 entries 에서 cursor_key 다음 항목의 위치 (이진 탐색, 페이지 깊이와 무관)"""
+        low, high = 0, len(entries)
+        while low < high:
+            middle = (low + high) // 2
+            entry = entries[middle]
+            key = sort_key(field, descending, entry.sort_values[field], entry.kor_co_nm, entry.code)
+            if cursor_key < key:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+
+class CatalogSnapshot:
+    """카탈로그 버전 하나에 대한 읽기 전용 상품 스냅샷 (예금 + 적금)"""
+
+    def __init__(self, version, catalogs):
+        self.version = version
+        self.catalogs = MappingProxyType(catalogs)
+
+    def __getitem__(self, product_type):
+        return self.catalogs[product_type]
+
+
+_snapshot_lock = threading.Lock()
+_snapshot = None
+
+
+def get_catalog_snapshot():
+    """
+    현재 카탈로그 버전의 스냅샷을 반환합니다.
+    요청마다 버전만 확인하고(PK 조회 1회), 버전이 바뀐 경우에만 프로세스(워커) 안에서 다시 만듭니다.
+    """
+    global _snapshot
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            catalogs = {product_type: ProductCatalog.load(product_type) for product_type in SNAPSHOT_SOURCES}
+            _snapshot = CatalogSnapshot(version, catalogs)
+            logger.info(
+                f"상품 카탈로그 스냅샷 생성 (버전 {version}, "
+                + ", ".join(f"{kind} {len(catalog.entries)}건" for kind, catalog in catalogs.items())
+                + ")"
+            )
+        return _snapshot
+
+
+def clear_catalog_snapshot():
+    """스냅샷을 버립니다. (버전을 올리지 않고 상품을 직접 수정한 경우, 테스트 등)"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def build_etag(version, *parts):
+    """카탈로그 버전과 요청별 구성 요소(쿼리, 가입 상태 등)로 강한 ETag 를 만듭니다."""
+    payload = "|".join(str(part) for part in parts)
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+    return f'"v{version}-{digest}"'
+
+
+def subscription_fingerprint(subscribed_codes):
+    """가입 상품 코드 집합의 지문 (가입/해지하면 ETag 가 바뀌도록)"""
+    if not subscribed_codes:
+        return "-"
+    payload = ",".join(sorted(subscribed_codes))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
@@ -0,0 +1,200 @@
+"""
+금감원 금융상품 API 대역(stand-in).
+
+fixtures/products_dump.json 을 금감원 API 응답 형식(baseList / optionList, 페이지 단위)으로 바꿔
+requests 전송 어댑터로 돌려줍니다. 실제 API 를 호출하지 않고 적재를 벤치마크하거나 로컬에서 개발할 때 사용합니다.
+
+    session = build_standin_session(scale=10, latency=0.05, error_rate=0.01)
+    result = ingest_product_pages(DEPOSIT_SPEC, fetch_products("deposit", session=session))
+
+settings.FSS_STANDIN 에 같은 옵션을 딕셔너리로 지정하면 fetchers.build_session 이 실제 API 대신 대역을 사용합니다.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import BaseAdapter
+
+from .fetchers import DEFAULT_TOP_FIN_GRP_NOS, FSS_API_BASE_URL, PRODUCT_ENDPOINTS
+from .models import DepositProduct
+
+DEFAULT_FIXTURE_PATH = Path(settings.BASE_DIR) / "fixtures" / "products_dump.json"
+
+# 금감원 API 한 페이지의 상품 수
+PAGE_SIZE = 20
+
+# 덤프 모델명 -> (상품 종류, 상품/옵션)
+FIXTURE_MODELS = {
+    "products.depositproduct": ("deposit", "product"),
+    "products.depositoption": ("deposit", "option"),
+    "products.savingproduct": ("saving", "product"),
+    "products.savingoption": ("saving", "option"),
+}
+# 덤프에 있을 수 있는 모델 전용 필드 (API 응답에는 없음)
+DUMP_OMITTED_FIELDS = ("content_hash", "company", "best_intr_rate", "best_intr_rate2") + tuple(
+    f"best_rate_{term}" for term in DepositProduct.BEST_RATE_TERMS
+)
+
+
+def _stable_number(value, modulo):
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=4).hexdigest()
+    return int(digest, 16) % modulo
+
+
+def _shift_rate(value, shift):
+    if value is None or shift == 0:
+        return value
+    return str((Decimal(str(value)) + Decimal(str(shift))).quantize(Decimal("0.01")))
+
+
+class StandInCatalog:
+    """
+    덤프를 API 형식으로 바꾼 상품 목록.
+
+    :param scale: 상품을 몇 배로 늘릴지 (복제본은 상품 코드에 -x<n> 접미사를 붙이고 금리를 조금씩 바꿈)
+    :param rate_shift: 모든 금리에 더할 값 (금리 변경 적재를 재현할 때 사용)
+    :param top_fin_grp_nos: 금융회사를 나눠 담을 권역 코드
+    """
+
+    def __init__(self, fixture_path=None, scale=1, rate_shift=0, top_fin_grp_nos=DEFAULT_TOP_FIN_GRP_NOS):
+        self.scale = max(int(scale), 1)
+        self.rate_shift = Decimal(str(rate_shift))
+        self.top_fin_grp_nos = tuple(top_fin_grp_nos)
+
+        with open(fixture_path or DEFAULT_FIXTURE_PATH, encoding="utf-8") as f:
+            dump = json.load(f)
+
+        products = {"deposit": [], "saving": []}
+        options = {"deposit": {}, "saving": {}}
+        for row in dump:
+            if row["model"] not in FIXTURE_MODELS:
+                continue
+            kind, part = FIXTURE_MODELS[row["model"]]
+            fields = {key: value for key, value in row["fields"].items() if key not in DUMP_OMITTED_FIELDS}
+            if part == "product":
+                products[kind].append(dict(fields, fin_prdt_cd=row["pk"]))
+            else:
+                code = fields.pop("product")
+                options[kind].setdefault(code, []).append(dict(fields, fin_prdt_cd=code))
+
+        # pages[kind][권역 코드] = [(base, options), ...]
+        self.pages = {}
+        for kind in products:
+            groups = {grp_no: [] for grp_no in self.top_fin_grp_nos}
+            for copy_no in range(self.scale):
+                for product in products[kind]:
+                    base, product_options = self._build_entry(product, options[kind], copy_no)
+                    grp_no = self.top_fin_grp_nos[
+                        _stable_number(base["kor_co_nm"], len(self.top_fin_grp_nos))
+                    ]
+                    groups[grp_no].append((base, product_options))
+            self.pages[kind] = groups
+
+    def _build_entry(self, product, options_by_code, copy_no):
+        code = product["fin_prdt_cd"]
+        suffix = f"-x{copy_no}" if copy_no else ""
+        # 복제본은 0.01%p 단위로 금리를 달리해 같은 값이 반복되지 않게 함
+        shift = self.rate_shift + Decimal("0.01") * copy_no
+        base = dict(
+            product,
+            fin_prdt_cd=f"{code}{suffix}",
+            fin_co_no=f"9{_stable_number(product['kor_co_nm'], 10 ** 6):06d}",
+            dcls_month=str(product.get("dcls_strt_day") or "")[:6],
+        )
+        product_options = [
+            dict(
+                option,
+                fin_prdt_cd=base["fin_prdt_cd"],
+                intr_rate=_shift_rate(option.get("intr_rate"), shift),
+                intr_rate2=_shift_rate(option.get("intr_rate2"), shift),
+            )
+            for option in options_by_code.get(code, [])
+        ]
+        return base, product_options
+
+    def product_count(self, kind):
+        return sum(len(entries) for entries in self.pages[kind].values())
+
+    def page(self, kind, top_fin_grp_no, page_no):
+        """금감원 API 의 result 딕셔너리 한 페이지"""
+        entries = self.pages[kind].get(top_fin_grp_no, [])
+        max_page_no = max((len(entries) + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+        chunk = entries[(page_no - 1) * PAGE_SIZE : page_no * PAGE_SIZE]
+        return {
+            "prdt_div": "D" if kind == "deposit" else "S",
+            "total_count": str(len(entries)),
+            "max_page_no": str(max_page_no),
+            "now_page_no": str(page_no),
+            "err_cd": "000",
+            "err_msg": "정상",
+            "baseList": [base for base, _ in chunk],
+            "optionList": [option for _, options in chunk for option in options],
+        }
+
+
+class FssStandInAdapter(BaseAdapter):
+    """
+    금감원 API URL 로 나가는 요청을 StandInCatalog 응답으로 바꿔 주는 requests 전송 어댑터.
+
+    :param latency: 응답마다 기다릴 시간(초)
+    :param error_rate: 이 확률로 503 응답을 돌려줌 (재시도/이어받기 확인용)
+    :param seed: 오류 발생 순서를 재현하기 위한 난수 시드
+    """
+
+    def __init__(self, catalog, latency=0.0, error_rate=0.0, seed=0):
+        super().__init__()
+        self.catalog = catalog
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.request_count += 1
+            fail = self.error_rate and self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urlparse(request.url)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rsplit("/", 1)[-1]
+        kinds = {value: key for key, value in PRODUCT_ENDPOINTS.items()}
+
+        if fail:
+            return self._build_response(request, 503, {"error": "injected failure"})
+        if endpoint not in kinds:
+            return self._build_response(request, 404, {"error": "unknown endpoint"})
+        result = self.catalog.page(
+            kinds[endpoint], params.get("topFinGrpNo", ""), int(params.get("pageNo", 1))
+        )
+        return self._build_response(request, 200, {"result": result})
+
+    def _build_response(self, request, status_code, payload):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        response.headers["Content-Type"] = "application/json;charset=UTF-8"
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def build_standin_session(scale=1, latency=0.0, error_rate=0.0, seed=0, rate_shift=0, fixture_path=None):
+    """금감원 API 주소를 대역 어댑터로 연결한 requests 세션"""
+    catalog = StandInCatalog(fixture_path, scale=scale, rate_shift=rate_shift)
+    session = requests.Session()
+    session.mount(FSS_API_BASE_URL, FssStandInAdapter(catalog, latency, error_rate, seed))
+    return session
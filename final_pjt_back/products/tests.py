@@ -1,3 +1,1394 @@
-from django.test import TestCase
+import importlib
+import re
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.apps import apps
+from django.contrib.admin import site
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from . import jobs
+from .catalog import bump_catalog_version, lock_catalog_state
+from .conditions import extract_condition_tags
+from .fetchers import FssApiError, fetch_products, iter_product_pages
+from .ingest import (
+    DEPOSIT_SPEC,
+    ingest_deposit_products,
+    ingest_product_pages,
+    ingest_saving_products,
+    update_options,
+    upsert_companies,
+)
+from .outbox import drain_email_outbox
+from .projection import project_cash_flows
+from .simulation import clear_rate_matrices, installment_interest, lump_sum_interest, top_n_indices
+from .snapshot import clear_catalog_snapshot
+from .models import (
+    DepositProduct,
+    DepositOption,
+    SavingProduct,
+    SavingOption,
+    DepositSubscription,
+    SavingSubscription,
+    EmailOutbox,
+    FinancialCompany,
+    ProductChange,
+    DepositOptionRateHistory,
+    SavingConditionTag,
+    IdempotencyKey,
+    SyncRun,
+    SyncRunPage,
+)
+
+
+class ProductListQueryCountTests(APITestCase):
+    """상품 목록 조회 쿼리 수가 페이지 크기와 무관하게 일정한지 확인 (스냅샷이 만들어진 뒤 기준)"""
+
+    PRODUCT_COUNT = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="tester", email="tester@example.com", password="password"
+        )
+        for product_model, option_model, subscription_model in (
+            (DepositProduct, DepositOption, DepositSubscription),
+            (SavingProduct, SavingOption, SavingSubscription),
+        ):
+            products = product_model.objects.bulk_create(
+                [
+                    product_model(
+                        fin_prdt_cd=f"P{i:03d}",
+                        kor_co_nm=f"은행{i % 5}",
+                        fin_prdt_nm=f"상품{i}",
+                        best_intr_rate=Decimal("3.00") + i,
+                    )
+                    for i in range(cls.PRODUCT_COUNT)
+                ]
+            )
+            option_model.objects.bulk_create(
+                [
+                    option_model(
+                        product=product,
+                        intr_rate_type="S",
+                        intr_rate_type_nm="단리",
+                        save_trm=save_trm,
+                        intr_rate=Decimal("3.00"),
+                        intr_rate2=Decimal("3.50"),
+                    )
+                    for product in products
+                    for save_trm in ("6", "12")
+                ]
+            )
+            for product in products[:3]:
+                subscription_model.objects.create(user=cls.user, product=product)
+
+    def setUp(self):
+        clear_catalog_snapshot()
+
+    def _count_queries(self, url, page_size):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"page_size": page_size, "sort_by": "rate"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return len(context.captured_queries), response
+
+    def _assert_constant(self, url, expected):
+        self.client.get(url)  # 스냅샷 생성
+        small, _ = self._count_queries(url, 5)
+        large, response = self._count_queries(url, self.PRODUCT_COUNT)
+        self.assertEqual(small, large)
+        self.assertEqual(large, expected)
+        return response
+
+    def test_deposit_list_anonymous(self):
+        # 카탈로그 버전 확인
+        self._assert_constant("/api/v1/products/deposit-products/", 1)
+
+    def test_saving_list_anonymous(self):
+        self._assert_constant("/api/v1/products/saving-products/", 1)
+
+    def test_deposit_list_authenticated(self):
+        self.client.force_authenticate(self.user)
+        # 카탈로그 버전 확인 + 가입 상품 코드
+        response = self._assert_constant("/api/v1/products/deposit-products/", 2)
+        subscribed = {row["fin_prdt_cd"] for row in response.data["results"] if row["is_subscribed"]}
+        self.assertEqual(subscribed, {"P000", "P001", "P002"})
+
+    def test_saving_list_authenticated(self):
+        self.client.force_authenticate(self.user)
+        response = self._assert_constant("/api/v1/products/saving-products/", 2)
+        self.assertTrue(all(len(row["options"]) == 2 for row in response.data["results"]))
+
+
+class ProductSnapshotETagTests(APITestCase):
+    """스냅샷 응답의 ETag / 304 처리 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="tester", email="tester@example.com", password="password"
+        )
+        cls.product = DepositProduct.objects.create(
+            fin_prdt_cd="P001", kor_co_nm="은행", fin_prdt_nm="상품"
+        )
+
+    def setUp(self):
+        clear_catalog_snapshot()
+
+    def test_list_not_modified(self):
+        url = "/api/v1/products/deposit-products/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # 쿼리가 다르면 다른 ETag
+        response = self.client.get(url, {"sort_by": "rate"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_etag_changes_with_version_and_subscription(self):
+        url = "/api/v1/products/deposit-products/P001/"
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        DepositSubscription.objects.create(user=self.user, product=self.product)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["is_subscribed"])
+
+        etag = response["ETag"]
+        DepositProduct.objects.filter(pk="P001").update(fin_prdt_nm="새 상품")
+        bump_catalog_version(lock_catalog_state())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["fin_prdt_nm"], "새 상품")
+
+    def test_detail_not_found(self):
+        self.assertEqual(self.client.get("/api/v1/products/deposit-products/NONE/").status_code, 404)
+
+
+class FailingEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("smtp unavailable")
+
+
+class RateChangeOutboxTests(APITestCase):
+    """금리 변경 안내 메일이 발송 대기열을 거쳐 발송되는지 확인"""
+
+    BASE = [{"fin_co_no": "0010001", "kor_co_nm": "은행", "fin_prdt_cd": "P001", "fin_prdt_nm": "상품"}]
+
+    def _options(self, rate, terms=("12",)):
+        return [
+            {
+                "fin_prdt_cd": "P001",
+                "intr_rate_type": "S",
+                "intr_rate_type_nm": "단리",
+                "save_trm": save_trm,
+                "intr_rate": rate,
+                "intr_rate2": "3.50",
+            }
+            for save_trm in terms
+        ]
+
+    def setUp(self):
+        ingest_deposit_products(self.BASE, self._options("3.00", terms=("6", "12")))
+        self.user = get_user_model().objects.create_user(
+            username="tester", email="tester@example.com", password="password"
+        )
+        option = DepositOption.objects.get(save_trm="12")
+        DepositSubscription.objects.create(user=self.user, product=option.product, option=option)
+
+    def test_rate_change_is_queued_then_sent(self):
+        result = ingest_deposit_products(self.BASE, self._options("3.20", terms=("6", "12")))
+        self.assertEqual(result["queued_emails"], 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        summary = drain_email_outbox()
+        self.assertEqual(summary, {"sent": 1, "failed": 0, "batches": 1})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("3.00% -> 3.20%", mail.outbox[0].body)
+        self.assertEqual(EmailOutbox.objects.get().status, "sent")
+
+    def test_changes_are_coalesced_per_user(self):
+        option = DepositOption.objects.get(save_trm="6")
+        DepositSubscription.objects.create(user=self.user, product=option.product, option=option)
+        result = ingest_deposit_products(self.BASE, self._options("3.20", terms=("6", "12")))
+        self.assertEqual(result["queued_emails"], 1)
+        body = EmailOutbox.objects.get().body
+        self.assertIn("[상품 (6개월 - 단리)]", body)
+        self.assertIn("[상품 (12개월 - 단리)]", body)
+
+    def test_option_save_is_single_statement(self):
+        option = DepositOption.objects.get(save_trm="12")
+        option.intr_rate = Decimal("3.10")
+        with CaptureQueriesContext(connection) as context:
+            option.save()
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_update_options_emits_change_events(self):
+        options = list(DepositOption.objects.order_by("save_trm"))
+        for option in options:
+            option.intr_rate = Decimal("3.40")
+        changed = update_options(DEPOSIT_SPEC, options, ["intr_rate"])
+        self.assertEqual(changed, 2)
+        self.assertEqual(ProductChange.objects.filter(change_type="updated").count(), 2)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+    def test_admin_edit_is_restored_by_next_sync(self):
+        option = DepositOption.objects.get(save_trm="12")
+        option.intr_rate = Decimal("9.99")
+        site._registry[DepositOption].save_model(None, option, None, True)
+        # 수정한 값으로 해시를 다시 계산해 두므로, 원래 응답을 적재하면 API 금리로 되돌아감
+        result = ingest_deposit_products(self.BASE, self._options("3.00", terms=("6", "12")))
+        self.assertEqual(result["updated_options"], 1)
+        option.refresh_from_db()
+        self.assertEqual(option.intr_rate, Decimal("3.00"))
+        options = self.client.get("/api/v1/products/deposit-products/P001/").data["options"]
+        self.assertEqual({str(row["save_trm"]): row["intr_rate"] for row in options}["12"], "3.00")
+
+    def test_failed_batch_is_retried_later(self):
+        ingest_deposit_products(self.BASE, self._options("3.20", terms=("6", "12")))
+        summary = drain_email_outbox(connection=FailingEmailBackend())
+        self.assertEqual(summary["failed"], 1)
+        message = EmailOutbox.objects.get()
+        self.assertEqual((message.status, message.attempts), ("pending", 1))
+        # 재시도 시각 전에는 다시 보내지 않음
+        self.assertEqual(drain_email_outbox()["sent"], 0)
+
+
+class RateHistoryTests(APITestCase):
+    """금리 이력이 금리가 바뀔 때만 기록되고 API 로 조회되는지 확인"""
+
+    def _ingest(self, rate, name="상품"):
+        ingest_deposit_products(
+            [{"fin_co_no": "0010001", "kor_co_nm": "은행", "fin_prdt_cd": "P001", "fin_prdt_nm": name}],
+            [
+                {
+                    "fin_prdt_cd": "P001",
+                    "intr_rate_type": "S",
+                    "intr_rate_type_nm": "단리",
+                    "save_trm": "12",
+                    "intr_rate": rate,
+                    "intr_rate2": "3.50",
+                }
+            ],
+        )
+
+    def test_history_written_on_rate_change_only(self):
+        self._ingest("3.00")
+        self._ingest("3.00", name="이름 변경")
+        self.assertEqual(DepositOptionRateHistory.objects.count(), 1)
+        self._ingest("3.20")
+        # 같은 날 다시 바뀌면 그날의 마지막 금리로 갱신
+        self.assertEqual(
+            list(DepositOptionRateHistory.objects.values_list("intr_rate", flat=True)), [Decimal("3.20")]
+        )
+
+        response = self.client.get("/api/v1/products/P001/rate-history/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["series"][0]["intr_rate"], [3.2])
+        self.assertEqual(response.data["bank"]["avg_intr_rate2"], [3.5])
+        self.assertEqual(list(response.data["terms"]), ["12"])
+
+
+class ProductFacetTests(APITestCase):
+    """패싯 개수가 자기 필터를 뺀 나머지 필터 기준으로 계산되는지 확인"""
+
+    def setUp(self):
+        clear_catalog_snapshot()
+        ingest_deposit_products(
+            [
+                {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "P1", "fin_prdt_nm": "상품1", "join_deny": "1"},
+                {"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "P2", "fin_prdt_nm": "상품2", "join_deny": "3"},
+            ],
+            [
+                {"fin_prdt_cd": "P1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12", "intr_rate": "3.00", "intr_rate2": "3.00"},
+                {"fin_prdt_cd": "P2", "intr_rate_type": "M", "intr_rate_type_nm": "복리", "save_trm": "6", "intr_rate": "3.00", "intr_rate2": "3.00"},
+            ],
+        )
+
+    def test_facets_exclude_own_filter(self):
+        response = self.client.get("/api/v1/products/facets/", {"bank_id": "A"})
+        self.assertEqual(response.data["total"], 1)
+        facets = response.data["facets"]
+        # 금융회사 패싯은 은행 필터를 빼고 계산하므로 두 은행 모두 표시
+        self.assertEqual({item["value"] for item in facets["bank"]}, {"A", "B"})
+        self.assertEqual([item["value"] for item in facets["term"]], ["12"])
+        self.assertEqual(facets["join_deny"], [{"value": "1", "count": 1, "label": "제한없음"}])
+
+        response = self.client.get("/api/v1/products/deposit-products/", {"rate_type": "M"})
+        self.assertEqual([row["fin_prdt_cd"] for row in response.data["results"]], ["P2"])
+
+    def test_legacy_bank_id_resolved_from_snapshot(self):
+        ingest_deposit_products(
+            [{"fin_co_no": "K", "kor_co_nm": "주식회사 국민은행", "fin_prdt_cd": "P3", "fin_prdt_nm": "상품3"}],
+            [{"fin_prdt_cd": "P3", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12", "intr_rate": "3.00", "intr_rate2": "3.00"}],
+        )
+        self.client.get("/api/v1/products/deposit-products/")  # 스냅샷 생성
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/products/deposit-products/", {"bank_id": "2"})
+        self.assertEqual([row["fin_prdt_cd"] for row in response.data["results"]], ["P3"])
+        # 기존 bank_id 를 금융회사 테이블에서 이름으로 찾지 않음 (카탈로그 버전 확인만)
+        self.assertFalse(any("financialcompany" in query["sql"] for query in queries.captured_queries))
+
+        response = self.client.get("/api/v1/products/deposit-products/", {"bank_id": "K,A"})
+        self.assertEqual({row["fin_prdt_cd"] for row in response.data["results"]}, {"P1", "P3"})
+
+
+class FinancialCompanyTests(APITestCase):
+    """상품의 company_id 가 항상 금융회사 행을 가리키는지 확인 (적재와 0007 마이그레이션 백필)"""
+
+    def test_company_saved_without_name(self):
+        upsert_companies([{"fin_co_no": "A", "kor_co_nm": " ", "top_fin_grp_no": "020000"}])
+        self.assertEqual(
+            FinancialCompany.objects.values_list("fin_co_no", "kor_co_nm", "top_fin_grp_no").get(),
+            ("A", "", "020000"),
+        )
+
+        # 이름이 들어오면 채우고, 다시 비어서 들어와도 저장된 이름/권역 코드를 유지
+        upsert_companies([{"fin_co_no": "A", "kor_co_nm": "가은행"}])
+        upsert_companies([{"fin_co_no": "A", "kor_co_nm": ""}, {"fin_co_no": "", "kor_co_nm": "나은행"}])
+        self.assertEqual(
+            FinancialCompany.objects.values_list("fin_co_no", "kor_co_nm", "top_fin_grp_no").get(),
+            ("A", "가은행", "020000"),
+        )
+
+    def test_migration_backfill_from_stored_pages(self):
+        DepositProduct.objects.create(fin_prdt_cd="P1", kor_co_nm="가은행", fin_prdt_nm="상품1", content_hash="x")
+        DepositProduct.objects.create(fin_prdt_cd="P2", kor_co_nm="나은행", fin_prdt_nm="상품2", content_hash="y")
+        run = SyncRun.objects.create(kind="deposit", status="failed")
+        SyncRunPage.objects.create(
+            run=run, top_fin_grp_no="020000", page_no=1,
+            base_list=[{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "P1"}],
+        )
+
+        migration = importlib.import_module("products.migrations.0007_financialcompany")
+        migration.backfill_companies(apps, None)
+        company = FinancialCompany.objects.get(pk="A")
+        self.assertEqual((company.kor_co_nm, company.top_fin_grp_no), ("가은행", "020000"))
+        self.assertEqual(
+            dict(DepositProduct.objects.values_list("fin_prdt_cd", "company_id")), {"P1": "A", "P2": None}
+        )
+        # 페이지가 없어 채우지 못한 상품은 다음 동기화에서 다시 쓰이도록 해시를 비움
+        self.assertEqual(DepositProduct.objects.get(pk="P2").content_hash, "")
+
+        ingest_deposit_products(
+            [{"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "P2", "fin_prdt_nm": "상품2"}], []
+        )
+        self.assertEqual(DepositProduct.objects.get(pk="P2").company_id, "B")
+
+
+class ProductSearchTests(APITestCase):
+    """n-gram 검색과 적재 후 색인 부분 갱신 확인"""
+
+    def _ingest(self, name):
+        ingest_deposit_products(
+            [
+                {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "P1", "fin_prdt_nm": name,
+                 "spcl_cnd": "급여이체 실적 보유 시 우대금리 0.1%p"},
+                {"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "P2", "fin_prdt_nm": "비대면 정기예금",
+                 "join_member": "실명의 개인"},
+            ],
+            [],
+        )
+
+    def test_search_ranks_and_refreshes(self):
+        self._ingest("청년도약 예금")
+        response = self.client.get("/api/v1/products/search/", {"q": "급여 이체"})
+        self.assertEqual([row["fin_prdt_cd"] for row in response.data["results"]], ["P1"])
+        self.assertEqual(response.data["results"][0]["matched_fields"], ["spcl_cnd"])
+        # 2-gram 은 모두 있지만 붙어 있지 않은 경우는 제외 ("대면정" 은 없음)
+        self.assertEqual(self.client.get("/api/v1/products/search/", {"q": "대면정"}).data["count"], 0)
+
+        self._ingest("사회초년생 예금")
+        self.assertEqual(self.client.get("/api/v1/products/search/", {"q": "청년"}).data["count"], 0)
+        self.assertEqual(self.client.get("/api/v1/products/search/", {"q": "초년"}).data["count"], 1)
+
+
+class ConditionTagTests(APITestCase):
+    """우대조건 태그 추출/필터와 내 조건 기준 최고 금리 계산 확인"""
+
+    def setUp(self):
+        clear_catalog_snapshot()
+
+    def _ingest(self, spcl_cnd):
+        ingest_saving_products(
+            [
+                {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "S1", "fin_prdt_nm": "주거래적금",
+                 "spcl_cnd": spcl_cnd},
+                {"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "S2", "fin_prdt_nm": "일반적금",
+                 "spcl_cnd": "없음"},
+            ],
+            [
+                {"fin_prdt_cd": "S1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+                 "intr_rate": "3.00", "intr_rate2": "4.00"},
+                {"fin_prdt_cd": "S2", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+                 "intr_rate": "3.50", "intr_rate2": "3.50"},
+            ],
+        )
+
+    def test_extract_tags(self):
+        tags = extract_condition_tags(
+            "최고 연 1.5%p\n1. 당행 급여이체 실적 6개월 이상\n   인 경우 : 연 1.0%p\n"
+            "2. MZ세대(만 19~34세) 우대금리 : 0.5%p\n3. 카드 결제계좌 지정"
+        )
+        self.assertEqual(tags["salary"]["bonus_rate"], Decimal("1.00"))
+        self.assertEqual((tags["age"]["min_age"], tags["age"]["max_age"]), (19, 34))
+        self.assertIsNone(tags["card"]["bonus_rate"])
+        self.assertEqual(extract_condition_tags("해당없음"), {})
+
+    def test_command_fills_tags_for_existing_products(self):
+        self._ingest("1. 급여이체 : 연 0.7%p\n2. 비대면 가입 : 연 0.2%p")
+        # 0010 마이그레이션 직후처럼 태그가 비어 있는 상태
+        SavingConditionTag.objects.all().delete()
+        version = lock_catalog_state().version
+
+        call_command("refresh_condition_tags", stdout=StringIO())
+        self.assertEqual(
+            dict(SavingConditionTag.objects.values_list("tag", "bonus_rate")),
+            {"salary": Decimal("0.70"), "online": Decimal("0.20")},
+        )
+        self.assertEqual(lock_catalog_state().version, version + 1)
+
+    def test_filter_and_achievable_rates(self):
+        self._ingest("1. 급여이체 : 연 0.7%p\n2. 비대면 가입 : 연 0.2%p")
+        self.assertEqual(
+            set(SavingConditionTag.objects.values_list("tag", flat=True)), {"salary", "online"}
+        )
+        response = self.client.get("/api/v1/products/saving-products/", {"condition": "salary"})
+        self.assertEqual([row["fin_prdt_cd"] for row in response.data["results"]], ["S1"])
+
+        # 조건 없음: 기본 금리 순, 급여이체 + 비대면: 3.00 + 0.9 = 3.90
+        response = self.client.get("/api/v1/products/achievable-rates/")
+        self.assertEqual([row["fin_prdt_cd"] for row in response.data["results"]], ["S2", "S1"])
+        response = self.client.get("/api/v1/products/achievable-rates/", {"conditions": "salary,online"})
+        top = response.data["results"][0]
+        self.assertEqual((top["fin_prdt_cd"], top["achievable_rate"]), ("S1", 3.9))
+        self.assertEqual(top["met_conditions"], ["online", "salary"])
+        self.assertEqual(
+            self.client.get("/api/v1/products/achievable-rates/", {"conditions": "vip"}).status_code, 400
+        )
+
+        # 우대조건 텍스트가 바뀐 상품만 태그를 다시 추출
+        self._ingest("첫 거래 고객 연 2.0%p")
+        self.assertEqual(list(SavingConditionTag.objects.values_list("tag", flat=True)), ["first"])
+        response = self.client.get("/api/v1/products/achievable-rates/", {"conditions": "first"})
+        # 최고 우대금리(4.00)를 넘지 않음
+        self.assertEqual(response.data["results"][0]["achievable_rate"], 4.0)
+
+
+class ProductRepresentationTests(APITestCase):
+    """목록/상세 표현, fields= 와 options=compact 확인"""
+
+    def setUp(self):
+        clear_catalog_snapshot()
+        ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "P1", "fin_prdt_nm": "상품1",
+              "spcl_cnd": "급여이체 시 0.1%p", "etc_note": "유의사항"}],
+            [{"fin_prdt_cd": "P1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": "3.00", "intr_rate2": "3.10"}],
+        )
+
+    def test_list_is_slim_and_detail_is_full(self):
+        row = self.client.get("/api/v1/products/deposit-products/").data["results"][0]
+        self.assertNotIn("spcl_cnd", row)
+        self.assertEqual(set(row["options"][0]), {"id", "intr_rate_type", "save_trm", "intr_rate", "intr_rate2"})
+        detail = self.client.get("/api/v1/products/deposit-products/P1/").data
+        self.assertEqual(detail["spcl_cnd"], "급여이체 시 0.1%p")
+
+    def test_sparse_fields_and_compact_options(self):
+        response = self.client.get(
+            "/api/v1/products/deposit-products/", {"fields": "fin_prdt_cd,etc_note,options", "options": "compact"}
+        )
+        row = response.data["results"][0]
+        self.assertEqual(list(row), ["fin_prdt_cd", "etc_note", "options"])
+        columns = response.data["option_fields"]
+        self.assertEqual(row["options"][0][columns.index("intr_rate")], "3.00")
+        self.assertEqual(
+            self.client.get("/api/v1/products/deposit-products/", {"fields": "password"}).status_code, 400
+        )
+
+
+class ProductCursorPaginationTests(APITestCase):
+    """커서 페이지를 끝까지 넘긴 결과가 전체 목록과 같은지 확인"""
+
+    def setUp(self):
+        clear_catalog_snapshot()
+        base_lst, option_lst = [], []
+        for i in range(7):
+            code = f"P{i}"
+            base_lst.append({"fin_co_no": f"C{i % 3}", "kor_co_nm": f"은행{i % 3}", "fin_prdt_cd": code,
+                             "fin_prdt_nm": f"상품{i}"})
+            # 금리가 같은 상품을 섞어 동순위 처리 확인
+            option_lst.append({"fin_prdt_cd": code, "intr_rate_type": "S", "intr_rate_type_nm": "단리",
+                               "save_trm": "12" if i % 2 else "6", "intr_rate": f"3.{i % 3}0",
+                               "intr_rate2": "4.00"})
+        ingest_deposit_products(base_lst, option_lst)
+
+    def _walk(self, params):
+        codes = []
+        response = self.client.get("/api/v1/products/deposit-products/", dict(params, pagination="cursor", page_size=2))
+        while True:
+            self.assertEqual(response.status_code, 200)
+            codes.extend(row["fin_prdt_cd"] for row in response.data["results"])
+            if not response.data["next"]:
+                return codes, response
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_pages_match_full_list(self):
+        for params in ({}, {"sort_by": "rate"}, {"sort_by": "rate", "period": "12"},
+                       {"ordering": "-fin_prdt_nm"}, {"bank_id": "C1"}):
+            expected = [
+                row["fin_prdt_cd"]
+                for row in self.client.get("/api/v1/products/deposit-products/", params).data["results"]
+            ]
+            codes, _ = self._walk(params)
+            self.assertEqual(codes, expected, params)
+
+        _, response = self._walk({"with_total": "true", "period": "12"})
+        self.assertEqual(response.data["total"], 3)
+        response = self.client.get("/api/v1/products/deposit-products/", {"cursor": "broken"})
+        self.assertEqual(response.status_code, 400)
+
+
+class BestRateColumnTests(APITestCase):
+    """상품별 최고 금리 컬럼: 마이그레이션 백필, 옵션 변경/삭제 후 재계산, 금리순 정렬"""
+
+    def payload(self, p1_rate="3.50", p2_terms=("12", "24")):
+        base_lst = [
+            {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "P1", "fin_prdt_nm": "예금1"},
+            {"fin_co_no": "B", "kor_co_nm": "나은행", "fin_prdt_cd": "P2", "fin_prdt_nm": "예금2"},
+        ]
+        rates = {("P1", "6"): "3.00", ("P1", "12"): p1_rate, ("P2", "12"): "3.20", ("P2", "24"): "3.80"}
+        option_lst = [
+            {"fin_prdt_cd": code, "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": save_trm,
+             "intr_rate": rate, "intr_rate2": "4.00" if code == "P1" else "3.90"}
+            for (code, save_trm), rate in rates.items()
+            if code == "P1" or save_trm in p2_terms
+        ]
+        return base_lst, option_lst
+
+    def best(self, code):
+        return DepositProduct.objects.values(
+            "best_intr_rate", "best_intr_rate2", "best_rate_6", "best_rate_12", "best_rate_24"
+        ).get(fin_prdt_cd=code)
+
+    def setUp(self):
+        clear_catalog_snapshot()
+        ingest_deposit_products(*self.payload())
+
+    def test_migration_backfill(self):
+        expected = {code: self.best(code) for code in ("P1", "P2")}
+        DepositProduct.objects.update(
+            best_intr_rate=0, best_intr_rate2=0, best_rate_6=None, best_rate_12=None, best_rate_24=None
+        )
+        migration = importlib.import_module("products.migrations.0006_product_best_rates")
+        migration.backfill_best_rates(apps, None)
+        self.assertEqual({code: self.best(code) for code in ("P1", "P2")}, expected)
+        self.assertEqual(
+            expected["P2"],
+            {"best_intr_rate": Decimal("3.80"), "best_intr_rate2": Decimal("3.90"), "best_rate_6": None,
+             "best_rate_12": Decimal("3.20"), "best_rate_24": Decimal("3.80")},
+        )
+
+    def test_recomputed_after_rate_change_and_option_removal(self):
+        ingest_deposit_products(*self.payload(p1_rate="3.10"))
+        self.assertEqual(
+            (self.best("P1")["best_intr_rate"], self.best("P1")["best_rate_12"]),
+            (Decimal("3.10"), Decimal("3.10")),
+        )
+
+        # 응답에서 빠진 24개월 옵션이 지워지면 해당 기간 컬럼도 비워짐
+        result = ingest_deposit_products(*self.payload(p1_rate="3.10", p2_terms=("12",)), prune=True)
+        self.assertEqual(result["removed_options"], 1)
+        self.assertEqual(
+            (self.best("P2")["best_intr_rate"], self.best("P2")["best_rate_24"]), (Decimal("3.20"), None)
+        )
+
+    def test_sort_by_best_rate_columns(self):
+        def codes(params):
+            response = self.client.get("/api/v1/products/deposit-products/", params)
+            self.assertEqual(response.status_code, 200)
+            return [row["fin_prdt_cd"] for row in response.data["results"]]
+
+        self.assertEqual(codes({"sort_by": "rate"}), ["P2", "P1"])
+        self.assertEqual(codes({"sort_by": "rate", "period": "12"}), ["P1", "P2"])
+        # 해당 기간 옵션이 없는 상품은 기간 정렬에서 제외
+        self.assertEqual(codes({"sort_by": "rate", "period": "6"}), ["P1"])
+        self.assertEqual(codes({"ordering": "best_intr_rate"}), ["P1", "P2"])
+        self.assertEqual(codes({"ordering": "-best_intr_rate2"}), ["P1", "P2"])
+
+
+class SubscriptionStatusTests(APITestCase):
+    """가입 상태 일괄 조회가 한 번의 쿼리로 예금/적금을 함께 반환하는지 확인"""
+
+    def setUp(self):
+        ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1"}],
+            [{"fin_prdt_cd": "D1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": "3.00", "intr_rate2": "3.00"}],
+        )
+        ingest_saving_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "S1", "fin_prdt_nm": "적금1"}],
+            [{"fin_prdt_cd": "S1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": "3.00", "intr_rate2": "3.00"}],
+        )
+        self.user = get_user_model().objects.create_user(username="status", password="pw", email="s@example.com")
+        DepositSubscription.objects.create(user=self.user, product_id="D1", option=DepositOption.objects.get())
+        SavingSubscription.objects.create(user=self.user, product_id="S1", option=SavingOption.objects.get())
+        self.client.force_authenticate(self.user)
+
+    def test_batch_status(self):
+        payload = {"deposit": ["D1", "D9"], "saving": ["S1"]}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/v1/products/subscriptions/status/", payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            response.data["deposit"],
+            {
+                "D1": {"is_subscribed": True, "option_ids": [DepositOption.objects.get().pk]},
+                "D9": {"is_subscribed": False, "option_ids": []},
+            },
+        )
+        self.assertEqual(response.data["saving"]["S1"]["option_ids"], [SavingOption.objects.get().pk])
+
+        response = self.client.post("/api/v1/products/subscriptions/status/", {"deposit": "D1"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class PortfolioTests(APITestCase):
+    """예금/적금 가입 상품을 쿼리 한 번으로 합쳐 반환하는지 확인"""
+
+    def test_portfolio_single_query(self):
+        ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1"}],
+            [{"fin_prdt_cd": "D1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": "3.00", "intr_rate2": "3.50"}],
+        )
+        ingest_saving_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "S1", "fin_prdt_nm": "적금1",
+              "rsrv_type": "F", "rsrv_type_nm": "자유적립식"}],
+            [{"fin_prdt_cd": "S1", "intr_rate_type": "M", "intr_rate_type_nm": "복리", "save_trm": "24",
+              "intr_rate": "4.00", "intr_rate2": "4.20"}],
+        )
+        user = get_user_model().objects.create_user(username="folio", password="pw")
+        DepositSubscription.objects.create(
+            user=user, product_id="D1", option=DepositOption.objects.get(), amount=1000000
+        )
+        SavingSubscription.objects.create(
+            user=user, product_id="S1", option=SavingOption.objects.get(), amount=300000
+        )
+        self.client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/products/portfolio/")
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data["total_amount"], 1300000)
+        # 최근 가입 순
+        saving, deposit = response.data["holdings"]
+        self.assertEqual(
+            (saving["product_type"], saving["fin_prdt_cd"], saving["save_trm"], saving["intr_rate2"], saving["rsrv_type_nm"]),
+            ("saving", "S1", "24", 4.2, "자유적립식"),
+        )
+        self.assertEqual((deposit["product_type"], deposit["intr_rate"], deposit["amount"]), ("deposit", 3.0, 1000000))
+
+        response = self.client.get("/api/v1/products/subscriptions/")
+        self.assertEqual(response.data["deposit_subscriptions"][0]["product_name"], "예금1")
+        self.assertEqual(response.data["saving_subscriptions"][0]["product_type"], "saving")
+
+
+class PortfolioProjectionTests(APITestCase):
+    """보유 상품의 만기 수령액과 월별 현금흐름 계산, 가입 내역이 바뀔 때 다시 계산되는지 확인"""
+
+    def holding(self, product_type, amount, save_trm, intr_rate, intr_rate_type="S", subscribed_at=None):
+        return {
+            "id": 1,
+            "product_type": product_type,
+            "product_id": "P1",
+            "fin_prdt_nm": "상품",
+            "kor_co_nm": "가은행",
+            "option_id": 1,
+            "intr_rate_type": intr_rate_type,
+            "save_trm": save_trm,
+            "intr_rate": Decimal(intr_rate),
+            "intr_rate2": None,
+            "rsrv_type_nm": None,
+            "amount": Decimal(amount),
+            "subscribed_at": subscribed_at or datetime(2025, 1, 15, tzinfo=dt_timezone.utc),
+        }
+
+    def test_cash_flow_matrix(self):
+        deposit = self.holding("deposit", 1000000, "12", "3.00")
+        saving = dict(self.holding("saving", 100000, "12", "4.00"), id=2)
+        projection = project_cash_flows([deposit, saving], today=date(2025, 7, 1))
+
+        by_type = {holding["product_type"]: holding for holding in projection["holdings"]}
+        # 예금 단리: 1,000,000 x 3% = 30,000 / 세금 4,620
+        self.assertEqual(
+            (by_type["deposit"]["interest"], by_type["deposit"]["tax"], by_type["deposit"]["maturity_amount"]),
+            (30000, 4620, 1025380),
+        )
+        # 적금 단리: 100,000 x 4%/12 x 78 = 26,000
+        self.assertEqual((by_type["saving"]["principal"], by_type["saving"]["interest"]), (1200000, 26000))
+        self.assertEqual(by_type["saving"]["maturity_date"], "2026-01-15")
+        self.assertEqual(by_type["saving"]["elapsed_months"], 7)
+        self.assertFalse(by_type["saving"]["matured"])
+
+        months = projection["months"]
+        self.assertEqual((months[0]["month"], months[-1]["month"]), ("2025-01", "2026-01"))
+        self.assertEqual(months[0]["contribution"], 1100000)
+        self.assertEqual(sum(month["contribution"] for month in months), 2200000)
+        self.assertEqual(sum(month["interest"] for month in months), 56000)
+        # 만기 월에 두 상품의 세후 수령액이 지급되고 잔액은 0
+        self.assertEqual(months[-1]["payout"], 1025380 + 1200000 + 26000 - 4004)
+        self.assertEqual(months[-1]["balance"], 0)
+
+    def test_excludes_holdings_without_rate(self):
+        holding = self.holding("deposit", 1000000, "12", "3.00")
+        holding["intr_rate"] = None
+        projection = project_cash_flows([holding])
+        self.assertEqual(projection["holdings"], [])
+        self.assertEqual(projection["excluded"], [{"id": 1, "product_type": "deposit"}])
+
+    def test_projection_endpoint_recomputes_on_change(self):
+        ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1"}],
+            [{"fin_prdt_cd": "D1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": "3.00", "intr_rate2": "3.50"}],
+        )
+        user = get_user_model().objects.create_user(username="projector", password="pw")
+        subscription = DepositSubscription.objects.create(
+            user=user, product_id="D1", option=DepositOption.objects.get(), amount=1000000
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.get("/api/v1/products/portfolio/projection/")
+        self.assertEqual(response.data["summary"]["maturity_amount"], 1025380)
+        etag = response["ETag"]
+        response = self.client.get("/api/v1/products/portfolio/projection/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get("/api/v1/products/portfolio/projection/?rate=max")
+        self.assertEqual(response.data["summary"]["interest"], 35000)
+
+        # 가입 금액이 바뀌면 지문이 바뀌어 다시 계산
+        subscription.amount = 2000000
+        subscription.save()
+        response = self.client.get("/api/v1/products/portfolio/projection/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["summary"]["principal"], 2000000)
+
+        response = self.client.get("/api/v1/products/portfolio/projection/?rate=best")
+        self.assertEqual(response.status_code, 400)
+
+
+class SubscriptionWriteTests(APITestCase):
+    """PUT/DELETE 가입/해지가 한 문장으로 처리되고, Idempotency-Key 재시도가 안전한지 확인"""
+
+    def setUp(self):
+        ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": "D1", "fin_prdt_nm": "예금1"}],
+            [{"fin_prdt_cd": "D1", "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": "3.00", "intr_rate2": "3.50"}],
+        )
+        self.option = DepositOption.objects.get()
+        self.user = get_user_model().objects.create_user(username="writer", password="pw")
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/products/deposits/D1/{self.option.id}/subscribe/"
+
+    def test_put_and_delete_are_idempotent(self):
+        for amount in (1000000, 2000000):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.put(self.url, {"amount": amount}, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["message"], "'예금1' 상품에 가입되었습니다.")
+            # 옵션 확인을 겸한 INSERT ... SELECT 1회 + 안내 문구용 상품명 조회 1회
+            self.assertEqual(len(queries), 2)
+        subscription = DepositSubscription.objects.get()
+        self.assertEqual((subscription.option_id, subscription.amount), (self.option.id, 2000000))
+
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.delete(self.url)
+            self.assertEqual(response.status_code, 204)
+            self.assertEqual(len(queries), 1)
+        self.assertFalse(DepositSubscription.objects.exists())
+
+        response = self.client.put("/api/v1/products/deposits/D1/999/subscribe/", {}, format="json")
+        self.assertEqual(response.status_code, 404)
+        # 다른 상품의 옵션으로는 가입되지 않음
+        response = self.client.put(f"/api/v1/products/deposits/D2/{self.option.id}/subscribe/", {}, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(DepositSubscription.objects.exists())
+        response = self.client.put(self.url, {"amount": "-1"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_toggle_removed(self):
+        response = self.client.post(self.url, {"amount": 500000}, format="json")
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(DepositSubscription.objects.exists())
+
+    def test_idempotency_key_replays_first_response(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "subscribe-1"}
+        first = self.client.put(self.url, {"amount": 500000}, format="json", **headers)
+        DepositSubscription.objects.update(amount=1)
+        retry = self.client.put(self.url, {"amount": 500000}, format="json", **headers)
+        self.assertEqual(first.status_code, 200)
+        # 재시도는 다시 쓰지 않고 처음 응답을 돌려줌
+        self.assertEqual((retry.status_code, retry.data), (200, first.data))
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(DepositSubscription.objects.get().amount, 1)
+
+        response = self.client.put(self.url, {"amount": 2}, format="json", **headers)
+        self.assertEqual(response.status_code, 422)
+
+        # 응답이 저장되지 않은 채 남은 키 (이전 방식에서 처리 도중 죽은 요청)
+        IdempotencyKey.objects.filter(key="subscribe-1").update(status_code=None, response_body=None)
+        response = self.client.put(self.url, {"amount": 500000}, format="json", **headers)
+        self.assertEqual(response.status_code, 409)
+
+    def test_failed_write_releases_key(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "subscribe-2"}
+        with mock.patch("products.views._upsert_subscription", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                self.client.put(self.url, {"amount": 500000}, format="json", **headers)
+        # 키 선점과 쓰기가 함께 롤백되므로 같은 키로 다시 시도하면 처리됨
+        self.assertFalse(IdempotencyKey.objects.filter(key="subscribe-2").exists())
+        response = self.client.put(self.url, {"amount": 500000}, format="json", **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DepositSubscription.objects.get().amount, 500000)
+
+
+class IngestProductsTests(APITestCase):
+    """집합 단위 적재: 신규/갱신 건수, (상품, 기간, 이자율 종류) 기준 옵션 upsert, 건수와 무관한 쿼리 수"""
+
+    def batch(self, count, rate="3.00"):
+        base_lst = [
+            {"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": f"P{i:03d}", "fin_prdt_nm": f"예금{i}"}
+            for i in range(count)
+        ]
+        option_lst = [
+            {"fin_prdt_cd": f"P{i:03d}", "intr_rate_type": "S", "intr_rate_type_nm": "단리",
+             "save_trm": save_trm, "intr_rate": rate, "intr_rate2": "3.50"}
+            for i in range(count)
+            for save_trm in ("6", "12")
+        ]
+        return base_lst, option_lst
+
+    def test_first_load_and_reload_counts(self):
+        result = ingest_deposit_products(*self.batch(3))
+        self.assertEqual((result["new_products"], result["updated_products"]), (3, 0))
+        self.assertEqual(result["new_options"], 6)
+
+        # 같은 응답을 다시 적재하면 신규 없이 전부 갱신 대상(기존 상품)이고 실제 변경은 없음
+        result = ingest_deposit_products(*self.batch(3))
+        self.assertEqual((result["new_products"], result["updated_products"]), (0, 3))
+        self.assertEqual((result["changed_products"], result["new_options"], result["updated_options"]), (0, 0, 0))
+
+    def test_option_upsert_by_product_term_rate_type(self):
+        ingest_deposit_products(*self.batch(2))
+        option_ids = set(DepositOption.objects.values_list("id", flat=True))
+
+        base_lst, option_lst = self.batch(2, rate="3.20")
+        option_lst.append(
+            {"fin_prdt_cd": "P000", "intr_rate_type": "M", "intr_rate_type_nm": "복리",
+             "save_trm": "12", "intr_rate": "3.30", "intr_rate2": "3.60"}
+        )
+        result = ingest_deposit_products(base_lst, option_lst)
+        # 기존 4개 옵션은 같은 행을 갱신하고, 이자율 종류가 다른 옵션만 새로 생성
+        self.assertEqual((result["updated_options"], result["new_options"]), (4, 1))
+        self.assertTrue(option_ids < set(DepositOption.objects.values_list("id", flat=True)))
+        self.assertEqual(
+            DepositOption.objects.get(product_id="P001", save_trm="12", intr_rate_type="S").intr_rate,
+            Decimal("3.20"),
+        )
+
+    def test_unchanged_payload_writes_nothing(self):
+        ingest_deposit_products(*self.batch(3))
+        journal = ProductChange.objects.count()
+        with CaptureQueriesContext(connection) as queries:
+            result = ingest_deposit_products(*self.batch(3))
+        # 해시가 같으면 읽기만 하고 INSERT/UPDATE/DELETE 는 한 번도 실행하지 않음
+        writes = [
+            query["sql"] for query in queries
+            if query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertEqual(writes, [])
+        self.assertEqual(result["changes"], 0)
+        self.assertEqual(ProductChange.objects.count(), journal)
+
+    def test_single_field_change_journals_one_row(self):
+        first = ingest_deposit_products(*self.batch(3))
+
+        base_lst, option_lst = self.batch(3)
+        base_lst[1]["fin_prdt_nm"] = "예금1 특판"
+        result = ingest_deposit_products(base_lst, option_lst)
+        self.assertEqual((result["changed_products"], result["changes"]), (1, 1))
+        self.assertEqual(result["version"], first["version"] + 1)
+        change = ProductChange.objects.get(sync_id=result["sync_id"])
+        self.assertEqual(
+            (change.fin_prdt_cd, change.change_type, change.changed_fields, change.version),
+            ("P001", "updated", ["fin_prdt_nm"], result["version"]),
+        )
+
+        # 옵션은 바뀐 금리 필드만 기록하고 이전/이후 금리를 함께 남김
+        option_lst[0]["intr_rate2"] = "3.70"
+        result = ingest_deposit_products(base_lst, option_lst)
+        self.assertEqual((result["updated_options"], result["changes"]), (1, 1))
+        change = ProductChange.objects.get(sync_id=result["sync_id"])
+        self.assertEqual(
+            (change.fin_prdt_cd, change.save_trm, change.change_type, change.changed_fields),
+            ("P000", "6", "updated", ["intr_rate2"]),
+        )
+        self.assertEqual((change.old_intr_rate2, change.new_intr_rate2), (Decimal("3.50"), Decimal("3.70")))
+        self.assertEqual((change.old_intr_rate, change.new_intr_rate), (Decimal("3.00"), Decimal("3.00")))
+
+    def test_pages_ingested_as_one_sync(self):
+        base_lst, option_lst = self.batch(4)
+        pages = iter([(base_lst[:2], option_lst[:4]), (base_lst[2:], option_lst[4:])])
+        result = ingest_product_pages(DEPOSIT_SPEC, pages, prune=True)
+        self.assertEqual((result["new_products"], result["new_options"], result["changes"]), (4, 8, 12))
+        # 페이지가 여러 개여도 카탈로그 버전은 한 번만 올라감
+        self.assertEqual(
+            set(ProductChange.objects.filter(sync_id=result["sync_id"]).values_list("version", flat=True)),
+            {result["version"]},
+        )
+
+        # 응답에서 빠진 상품은 모든 페이지를 받은 뒤에 정리
+        pages = iter([(base_lst[:2], option_lst[:4]), (base_lst[2:3], option_lst[4:6])])
+        result = ingest_product_pages(DEPOSIT_SPEC, pages, prune=True)
+        self.assertEqual((result["updated_products"], result["removed_products"]), (3, 1))
+        self.assertFalse(DepositProduct.objects.filter(fin_prdt_cd="P003").exists())
+
+    def test_query_count_independent_of_batch_size(self):
+        # 금융회사/카탈로그 상태 행을 먼저 만들어 두고 상품만 지운 뒤 비교
+        ingest_deposit_products(*self.batch(1))
+        counts = []
+        # (SQLite 는 한 문장의 파라미터 수 제한으로 bulk 쿼리를 나누므로 한 배치 안의 크기로 비교)
+        for count in (3, 15):
+            DepositProduct.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                result = ingest_deposit_products(*self.batch(count))
+            self.assertEqual(result["new_products"], count)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """금감원 API 대신 {(권역 코드, 페이지): result} 를 돌려주는 세션 (조회한 페이지를 기록)"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, params=None, timeout=None):
+        key = (params["topFinGrpNo"], params["pageNo"])
+        self.requested.append(key)
+        return StubResponse({"result": self.pages[key]})
+
+
+def stub_page(grp_no, page_no, max_page_no, err_cd="000"):
+    code = f"{grp_no}-{page_no}"
+    return {
+        "err_cd": err_cd,
+        "err_msg": "오류" if err_cd != "000" else "정상",
+        "max_page_no": max_page_no,
+        "baseList": [{"fin_prdt_cd": code}],
+        "optionList": [{"fin_prdt_cd": code, "save_trm": "12"}],
+    }
+
+
+class ProductPageFetcherTests(APITestCase):
+    """권역별 1페이지에서 max_page_no 를 읽어 나머지 페이지를 동시에 조회하는 페이저 확인"""
+
+    def pages(self):
+        return {
+            ("020000", 1): stub_page("020000", 1, 3),
+            ("020000", 2): stub_page("020000", 2, 3),
+            ("020000", 3): stub_page("020000", 3, 3),
+            ("030300", 1): stub_page("030300", 1, 2),
+            ("030300", 2): stub_page("030300", 2, 2),
+        }
+
+    def test_fetches_every_page_of_every_group(self):
+        session = StubSession(self.pages())
+        # 페이지마다 (baseList, optionList) 묶음 하나씩
+        batches = list(fetch_products("deposit", ["020000", "030300"], session=session, max_workers=4))
+        self.assertEqual(sorted(session.requested), sorted(self.pages()))
+        self.assertEqual(len(batches), 5)
+        base_lst = [entry for base, _ in batches for entry in base]
+        self.assertEqual(
+            sorted(entry["fin_prdt_cd"] for entry in base_lst),
+            sorted(f"{grp}-{page}" for grp, page in self.pages()),
+        )
+        # 상품에는 권역 코드가 붙음
+        self.assertTrue(all(entry["top_fin_grp_no"] == entry["fin_prdt_cd"][:6] for entry in base_lst))
+        self.assertEqual(sum(len(options) for _, options in batches), 5)
+
+    def test_resume_skips_stored_pages(self):
+        session = StubSession(self.pages())
+        fetched = list(
+            iter_product_pages(
+                "deposit",
+                ["020000", "030300"],
+                session=session,
+                skip_pages={("020000", 1), ("020000", 2), ("030300", 2)},
+                max_page_nos={"020000": 3},
+            )
+        )
+        # 020000 은 max_page_no 를 알고 있으므로 1페이지도 다시 받지 않음
+        self.assertEqual(sorted(session.requested), [("020000", 3), ("030300", 1)])
+        self.assertEqual(sorted((grp, page) for grp, page, _ in fetched), [("020000", 3), ("030300", 1)])
+
+    def test_page_error_propagates(self):
+        pages = self.pages()
+        pages[("020000", 2)] = stub_page("020000", 2, 3, err_cd="010")
+        with self.assertRaises(FssApiError):
+            list(fetch_products("deposit", ["020000", "030300"], session=StubSession(pages), max_workers=2))
+
+
+class BenchIngestCommandTests(APITestCase):
+    """bench_ingest 명령이 금감원 API 대역으로 모든 단계를 실행하고 쓰기를 롤백하는지 확인"""
+
+    def test_deposit_phases(self):
+        out = StringIO()
+        call_command("bench_ingest", kind=["deposit"], workers=1, stdout=out)
+        lines = {line.split()[0]: line for line in out.getvalue().splitlines()[1:-1]}
+        self.assertEqual(
+            list(lines),
+            ["deposit:fetch", "deposit:ingest:initial", "deposit:ingest:unchanged",
+             "deposit:ingest:rate-change", "deposit:ingest:prune"],
+        )
+        pages, products, options = map(int, re.findall(r"(\d+) (?:pages|products|options)", lines["deposit:fetch"]))
+        self.assertTrue(0 < pages <= 5)
+        self.assertIn(f"new_products={products}, new_options={options}", lines["deposit:ingest:initial"])
+        self.assertTrue(lines["deposit:ingest:unchanged"].endswith("no changes"))
+        self.assertIn(f"updated_options={options}", lines["deposit:ingest:rate-change"])
+        self.assertIn("removed_products=", lines["deposit:ingest:prune"])
+        self.assertIn("rolled back", out.getvalue())
+        self.assertFalse(DepositProduct.objects.exists())
+
+
+class CatalogChangesFeedTests(APITestCase):
+    """since 버전 이후 바뀐 상품만 내려주는 변경 피드 확인"""
+
+    def ingest(self, codes, changed_rate=None):
+        return ingest_deposit_products(
+            [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": code, "fin_prdt_nm": code} for code in codes],
+            [{"fin_prdt_cd": code, "intr_rate_type": "S", "intr_rate_type_nm": "단리", "save_trm": "12",
+              "intr_rate": changed_rate if code == "D1" and changed_rate else "3.00", "intr_rate2": "3.50"}
+             for code in codes],
+            prune=True,
+        )
+
+    def test_changes_since_version(self):
+        first = self.ingest(["D1", "D2", "D3"])["version"]
+        # D1 금리 변경, D2 삭제, D3 그대로
+        second = self.ingest(["D1", "D3"], changed_rate="3.10")["version"]
+        self.ingest(["D1", "D3"], changed_rate="3.10")
+
+        response = self.client.get(f"/api/v1/products/changes/?since={first}")
+        self.assertEqual(response.data["version"], second)
+        self.assertFalse(response.data["full"])
+        deposits = response.data["deposit_products"]
+        self.assertEqual([product["fin_prdt_cd"] for product in deposits["upserted"]], ["D1"])
+        self.assertEqual(deposits["removed"], ["D2"])
+        self.assertEqual(response.data["saving_products"], {"upserted": [], "removed": []})
+
+        response = self.client.get("/api/v1/products/changes/?since=0")
+        self.assertTrue(response.data["full"])
+        self.assertEqual(len(response.data["deposit_products"]["upserted"]), 2)
+
+    def test_empty_feed_at_current_version(self):
+        version = self.ingest(["D1"])["version"]
+        response = self.client.get(f"/api/v1/products/changes/?since={version}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["deposit_products"], {"upserted": [], "removed": []})
+
+    def test_malformed_since(self):
+        for since in ("", "abc", "1.5", "-1"):
+            response = self.client.get(f"/api/v1/products/changes/?since={since}")
+            self.assertEqual(response.status_code, 400, since)
+            self.assertIn("error", response.data)
+
+
+def sync_page(page_no, max_page_no):
+    code = f"D{page_no}"
+    return {
+        "err_cd": "000",
+        "max_page_no": max_page_no,
+        "baseList": [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": code, "fin_prdt_nm": code}],
+        "optionList": [{"fin_prdt_cd": code, "intr_rate_type": "S", "intr_rate_type_nm": "단리",
+                        "save_trm": "12", "intr_rate": "3.00", "intr_rate2": "3.50"}],
+    }
+
+
+class SyncRunClaimTests(APITestCase):
+    """동기화 실행의 이어받기/선점: 한 실행은 한 워커만 처리"""
+
+    def setUp(self):
+        self.session = StubSession({("020000", 1): sync_page(1, 2), ("020000", 2): sync_page(2, 2)})
+        patcher = mock.patch.object(
+            jobs,
+            "iter_product_pages",
+            lambda *args, **kwargs: iter_product_pages(*args, session=self.session, **kwargs),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_run(self, **fields):
+        return SyncRun.objects.create(kind="deposit", top_fin_grp_nos=["020000"], **fields)
+
+    def test_resume_failed_run_from_stored_pages(self):
+        run = self.create_run(status="failed", attempts=1, max_page_nos={"020000": 2})
+        page = sync_page(1, 2)
+        SyncRunPage.objects.create(
+            run=run, top_fin_grp_no="020000", page_no=1,
+            base_list=page["baseList"], option_list=page["optionList"],
+        )
+        self.assertEqual(jobs.find_resumable_run("deposit"), run)
+
+        run = jobs.execute_sync_run(run)
+        self.assertEqual((run.status, run.attempts), ("success", 2))
+        # 받아 둔 1페이지는 다시 조회하지 않음
+        self.assertEqual(self.session.requested, [("020000", 2)])
+        self.assertEqual(set(DepositProduct.objects.values_list("fin_prdt_cd", flat=True)), {"D1", "D2"})
+
+    def test_stale_running_run_is_taken_over(self):
+        fresh = self.create_run(status="running", attempts=1, started_at=timezone.now())
+        self.assertIsNone(jobs.find_resumable_run("deposit"))
+        fresh.delete()
+
+        stale = self.create_run(
+            status="running", attempts=1, started_at=timezone.now() - jobs.STALE_RUNNING_AFTER - timedelta(minutes=1)
+        )
+        self.assertEqual(jobs.find_resumable_run("deposit"), stale)
+        run = jobs.execute_sync_run(stale)
+        self.assertEqual((run.status, run.attempts), ("success", 2))
+
+    def test_enqueue_does_not_duplicate(self):
+        from market_indices.jobs import scheduler
+
+        with mock.patch.object(scheduler, "add_job") as add_job:
+            first = jobs.enqueue_sync_run("deposit")
+            second = jobs.enqueue_sync_run("deposit")
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(add_job.call_count, 1)
+        self.assertEqual(SyncRun.objects.count(), 1)
+
+    def test_run_is_claimed_once(self):
+        run = self.create_run()
+        self.assertTrue(jobs.claim_sync_run(run))
+        self.assertFalse(jobs.claim_sync_run(run))
+
+        # 다른 워커가 처리 중인 실행은 조회/적재하지 않음
+        run = jobs.execute_sync_run(run)
+        self.assertEqual((run.status, run.attempts), ("running", 1))
+        self.assertEqual(self.session.requested, [])
+
+        # 매일 작업도 대기/실행 중인 실행은 건너뜀
+        SyncRun.objects.create(kind="saving", status="pending", top_fin_grp_nos=["020000"])
+        with mock.patch.object(jobs, "execute_sync_run") as execute:
+            jobs.sync_fss_products_job()
+        execute.assert_not_called()
+
+
+class SyncRateChangeDigestTests(APITestCase):
+    """매일 동기화에서 예금/적금 금리가 함께 바뀌어도 사용자마다 안내 메일은 한 통"""
+
+    def page(self, code, name, rate):
+        return {
+            "err_cd": "000",
+            "max_page_no": 1,
+            "baseList": [{"fin_co_no": "A", "kor_co_nm": "가은행", "fin_prdt_cd": code, "fin_prdt_nm": name}],
+            "optionList": [{"fin_prdt_cd": code, "intr_rate_type": "S", "intr_rate_type_nm": "단리",
+                            "save_trm": "12", "intr_rate": rate, "intr_rate2": "3.50"}],
+        }
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="tester", email="tester@example.com", password="password"
+        )
+        for ingest, page in (
+            (ingest_deposit_products, self.page("D1", "정기예금", "3.00")),
+            (ingest_saving_products, self.page("S1", "자유적금", "3.00")),
+        ):
+            ingest(page["baseList"], page["optionList"])
+        option = DepositOption.objects.get()
+        DepositSubscription.objects.create(user=user, product=option.product, option=option)
+        option = SavingOption.objects.get()
+        SavingSubscription.objects.create(user=user, product=option.product, option=option)
+
+        sessions = {
+            "deposit": StubSession({("020000", 1): self.page("D1", "정기예금", "3.20")}),
+            "saving": StubSession({("020000", 1): self.page("S1", "자유적금", "3.40")}),
+        }
+        for name, replacement in (
+            ("iter_product_pages",
+             lambda kind, *args, **kwargs: iter_product_pages(kind, *args, session=sessions[kind], **kwargs)),
+            ("get_top_fin_grp_nos", lambda: ("020000",)),
+        ):
+            patcher = mock.patch.object(jobs, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_one_digest_per_user_per_sync(self):
+        jobs.sync_fss_products_job()
+        runs = list(SyncRun.objects.order_by("kind"))
+        self.assertEqual([(run.kind, run.status) for run in runs], [("deposit", "success"), ("saving", "success")])
+        self.assertEqual([run.result["queued_emails"] for run in runs], [1, 1])
+
+        body = EmailOutbox.objects.get().body
+        self.assertIn("정기예금", body)
+        self.assertIn("자유적금", body)
+        self.assertIn("3.00% -> 3.40%", body)
+        # 이미 메일을 넣은 실행은 다시 넣지 않음
+        self.assertEqual(jobs.notify_sync_runs(), 0)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+
+class SimulationTests(APITestCase):
+    """만기 수령액 계산기: 단리/월복리 공식, 상위 N개 정렬과 동점 처리, 금리 없는 옵션 제외, 파라미터 검증"""
+
+    URL = "/api/v1/products/simulate/"
+
+    @classmethod
+    def setUpTestData(cls):
+        # (상품 코드, 금리 유형, 기간, 기본 금리, 최고 우대금리)
+        for product_model, option_model, rows in (
+            (
+                DepositProduct,
+                DepositOption,
+                [
+                    ("D1", "S", "12", "3.00", "3.50"),
+                    ("D2", "M", "12", "3.00", None),
+                    ("D3", "S", "12", None, None),
+                    ("D4", "S", "6", "5.00", "5.00"),
+                    ("D5", "S", "12", "3.00", None),
+                ],
+            ),
+            (
+                SavingProduct,
+                SavingOption,
+                [
+                    ("S1", "S", "12", "4.00", None),
+                    ("S2", "M", "12", "4.00", None),
+                ],
+            ),
+        ):
+            for code, rate_type, save_trm, intr_rate, intr_rate2 in rows:
+                product = product_model.objects.create(fin_prdt_cd=code, kor_co_nm="가은행", fin_prdt_nm=code)
+                option_model.objects.create(
+                    product=product,
+                    intr_rate_type=rate_type,
+                    intr_rate_type_nm="월복리" if rate_type == "M" else "단리",
+                    save_trm=save_trm,
+                    intr_rate=intr_rate and Decimal(intr_rate),
+                    intr_rate2=intr_rate2 and Decimal(intr_rate2),
+                )
+
+    def setUp(self):
+        clear_rate_matrices()
+
+    def simulate(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_lump_sum_interest(self):
+        interest = lump_sum_interest(1000000, np.array([3.0, 3.0]), 12, np.array([False, True]))
+        # 단리: 1,000,000 x 3% = 30,000 / 월복리: 1,000,000 x ((1 + 0.0025)^12 - 1)
+        self.assertAlmostEqual(interest[0], 30000.0)
+        self.assertAlmostEqual(interest[1], 1000000 * (1.0025**12 - 1))
+
+    def test_installment_interest(self):
+        interest = installment_interest(100000, np.array([4.0, 4.0, 0.0]), 12, np.array([False, True, True]))
+        # 단리: 100,000 x 4%/12 x 78 = 26,000 / 월복리: 100,000 x Σ((1 + 0.04/12)^k - 1), k = 1..12
+        self.assertAlmostEqual(interest[0], 26000.0)
+        self.assertAlmostEqual(interest[1], sum(100000 * ((1 + 0.04 / 12) ** k - 1) for k in range(1, 13)))
+        # 금리 0 복리는 0/0 이 아니라 이자 0
+        self.assertEqual(interest[2], 0.0)
+
+    def test_top_n_indices_ties(self):
+        values = np.array([1.0, 3.0, 2.0, 3.0, 3.0])
+        self.assertEqual(top_n_indices(values, 5).tolist(), [1, 3, 4, 2, 0])
+        # limit 경계에 걸린 동점도 전체 정렬과 같이 앞쪽 인덱스가 선택됨
+        self.assertEqual(top_n_indices(values, 2).tolist(), [1, 3])
+        self.assertEqual(top_n_indices(values, 4).tolist(), [1, 3, 4, 2])
+
+    def test_deposit_maturity_and_ordering(self):
+        results = self.simulate(term=12, principal=1000000)
+        # 금리가 없는 D3, 기간이 다른 D4 는 제외 / 같은 금액의 D1, D5 는 옵션 순서대로
+        self.assertEqual([row["fin_prdt_cd"] for row in results], ["D2", "D1", "D5"])
+        # 월복리: 이자 30,415 / 세금 floor(30,415.96 x 15.4%) = 4,684
+        self.assertEqual(
+            (results[0]["interest"], results[0]["tax"], results[0]["maturity_amount"]), (30415, 4684, 1025731)
+        )
+        # 단리: 이자 30,000 / 세금 4,620
+        self.assertEqual(
+            (results[1]["interest"], results[1]["tax"], results[1]["maturity_amount"]), (30000, 4620, 1025380)
+        )
+
+    def test_saving_maturity(self):
+        results = self.simulate(term=12, monthly=100000)
+        self.assertEqual([row["fin_prdt_cd"] for row in results], ["S2", "S1"])
+        # 월복리: 이자 26,320 / 세금 floor(26,320.44 x 15.4%) = 4,053
+        self.assertEqual(
+            (results[0]["principal"], results[0]["interest"], results[0]["tax"], results[0]["maturity_amount"]),
+            (1200000, 26320, 4053, 1222267),
+        )
+        # 단리: 이자 26,000 / 세금 4,004
+        self.assertEqual((results[1]["interest"], results[1]["tax"]), (26000, 4004))
+
+    def test_limit_keeps_first_of_ties(self):
+        results = self.simulate(term=12, principal=1000000, limit=2)
+        self.assertEqual([row["fin_prdt_cd"] for row in results], ["D2", "D1"])
+
+    def test_max_rate_skips_missing_rates(self):
+        results = self.simulate(term=12, principal=1000000, rate="max")
+        # 최고 우대금리가 없는 D2, D5 는 계산하지 않음
+        self.assertEqual([row["fin_prdt_cd"] for row in results], ["D1"])
+        self.assertEqual(results[0]["interest"], 35000)
+
+    def test_deposit_and_saving_merged_by_after_tax_interest(self):
+        results = self.simulate(term=12, principal=1000000, monthly=100000, limit=4)
+        self.assertEqual([row["fin_prdt_cd"] for row in results], ["D2", "D1", "D5", "S2"])
+
+    def test_invalid_params(self):
+        for params in (
+            {"principal": 1000000},
+            {"term": 12},
+            {"term": 0, "principal": 1000000},
+            {"term": "abc", "principal": 1000000},
+            {"term": 12, "principal": -1},
+            {"term": 12, "monthly": "1.5"},
+            {"term": 12, "principal": 1000000, "limit": 0},
+            {"term": 12, "principal": 1000000, "rate": "best"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.URL, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.data)
@@ -9,10 +9,45 @@ urlpatterns = [
         "save-deposit-products/",
         views.save_deposit_products,
         name="save_deposit_products",
-    ),  # GET: 금감원 API에서 예금 상품 정보를 가져와 DB에 저장/업데이트
+    ),  # GET: 예금 상품 동기화 실행 등록 (실제 저장/업데이트는 스케줄러 작업에서 처리)
     path(
         "save-saving-products/", views.save_saving_products, name="save_saving_products"
-    ),  # 금융감독원 API로부터 적금 정보 받아와서 저장
+    ),  # GET: 적금 상품 동기화 실행 등록 (실제 저장/업데이트는 스케줄러 작업에서 처리)
+    path(
+        "sync-runs/<int:pk>/",
+        views.SyncRunDetailAPIView.as_view(),
+        name="sync_run_detail",
+    ),  # GET: 상품 동기화 실행 상태/소요 시간 조회
+    path(
+        "changes/",
+        views.product_catalog_changes,
+        name="product_catalog_changes",
+    ),  # GET: since 버전 이후 변경된 상품만 조회 (증분 동기화용)
+    path(
+        "companies/",
+        views.FinancialCompanyListAPIView.as_view(),
+        name="financial_company_list",
+    ),  # GET: 금융회사 목록 (은행 필터의 bank_id 값으로 fin_co_no 사용)
+    path(
+        "simulate/",
+        views.simulate_products,
+        name="simulate_products",
+    ),  # GET: 기간/금액 기준 세후 만기 수령액 상위 상품 계산
+    path(
+        "facets/",
+        views.product_facets,
+        name="product_facets",
+    ),  # GET: 필터별 상품 수 (금융회사/기간/이자율 종류/가입 제한)
+    path(
+        "achievable-rates/",
+        views.achievable_rates,
+        name="achievable_rates",
+    ),  # GET: 내 우대조건(급여이체/카드/첫 거래/비대면/나이)으로 받을 수 있는 최고 금리 순위
+    path(
+        "search/",
+        views.search_products,
+        name="search_products",
+    ),  # GET: 상품명/우대조건/가입대상 등 전문 검색 (?q=)
     # 예금 상품 API (클라이언트 조회용)
     path(
         "deposit-products/",
@@ -68,6 +103,27 @@ urlpatterns = [
         name="subscribe_saving",
     ),
     path("subscriptions/", views.get_user_subscriptions, name="get_user_subscriptions"),
+    path(
+        "portfolio/",
+        views.user_portfolio,
+        name="user_portfolio",
+    ),  # GET: 내 예금/적금 가입 상품 전체 (상품/옵션/금리/가입 금액, 쿼리 1회)
+    path(
+        "portfolio/projection/",
+        views.portfolio_projection,
+        name="portfolio_projection",
+    ),  # GET: 내 가입 상품의 만기일/만기 수령액과 월별 예상 현금흐름
+    path(
+        "subscriptions/status/",
+        views.subscription_status,
+        name="subscription_status",
+    ),  # POST: 여러 상품의 가입 여부/가입 옵션 일괄 조회
+    # 금리 이력 API (예금/적금 공통, 상품 코드로 조회)
+    path(
+        "<str:product_code>/rate-history/",
+        views.product_rate_history,
+        name="product_rate_history",
+    ),  # GET: 옵션별 금리 이력(열 배열) + 금융회사/기간별 월 평균 금리
     # 상품 가입 여부 확인 API
     path(
         "deposits/<str:product_code>/is_subscribed/",
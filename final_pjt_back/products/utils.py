@@ -3,13 +3,13 @@ from django.conf import settings
 from django.template.loader import render_to_string  # HTML 템플릿을 사용할 경우
 
 
-def send_rate_change_email(user_email, product_name, option_info, changes):
+def build_rate_change_email(product_name, option_info, changes):
     """
-    금리 변경 안내 이메일을 발송합니다.
-    :param user_email: 수신자 이메일 주소
+    금리 변경 안내 이메일의 제목과 본문을 만듭니다.
     :param product_name: 상품명
     :param option_info: 옵션 정보 (예: "6개월 - 단리")
     :param changes: 변경된 내용 딕셔너리 (예: {'기본 금리': ('3.00', '3.20'), '최고 우대금리': ('3.50', '3.70')})
+    :return: (subject, message_plain)
     """
     subject = (
         f"[안내] 고객님이 가입하신 금융상품의 정보가 변경되었습니다: {product_name}"
@@ -36,49 +36,125 @@ def send_rate_change_email(user_email, product_name, option_info, changes):
     #     'option_info': option_info,
     #     'changes': changes,
     # })
+    return subject, message_plain
+
 
+def send_rate_change_email(user_email, product_name, option_info, changes):
+    """
+    금리 변경 안내 이메일을 즉시 발송합니다.
+    (금리 변경 알림은 enqueue_rate_change_emails 로 발송 대기열에 넣어 처리합니다)
+    """
+    subject, message_plain = build_rate_change_email(product_name, option_info, changes)
     try:
         send_mail(
             subject,
             message_plain,
             settings.DEFAULT_FROM_EMAIL,  # settings.py에 정의된 발신자 이메일
             [user_email],
-            # html_message=html_message, # HTML 이메일을 사용하려면 주석 해제
             fail_silently=False,
         )
     except Exception as e:
         print(f"Error sending email to {user_email} for {product_name}: {e}")
 
 
-def get_subscribers_and_send_emails(option_instance, changes):
+def _format_rate(value):
+    return f"{value:.2f}" if value is not None else "N/A"
+
+
+def build_rate_changes(old_rate, old_rate2, new_rate, new_rate2):
     """
-    옵션에 가입한 사용자들을 찾아 변경 사항 이메일을 발송합니다.
+    이전/이후 금리를 비교해 안내 메일에 쓰는 변경 사항 딕셔너리를 만듭니다.
+    변경이 없으면 빈 딕셔너리를 반환합니다.
     """
-    product_name = option_instance.product.fin_prdt_nm
-    # 옵션의 __str__ 메소드가 너무 많은 정보를 포함할 수 있으므로, 필요한 정보만 추출합니다.
-    option_info_str = (
-        f"{option_instance.save_trm}개월 - {option_instance.intr_rate_type_nm}"
+    changes = {}
+    if old_rate != new_rate:
+        changes["기본 금리"] = (_format_rate(old_rate), _format_rate(new_rate))
+    if old_rate2 != new_rate2:
+        changes["최고 우대금리"] = (_format_rate(old_rate2), _format_rate(new_rate2))
+    return changes
+
+
+def build_rate_change_digest(items):
+    """
+    한 사용자에게 보낼 금리 변경 묶음 안내 메일의 제목과 본문을 만듭니다.
+    변경된 옵션이 하나뿐이면 기존 단건 안내 메일과 같은 형식을 사용합니다.
+    :param items: (상품명, 옵션 정보, 변경 사항 딕셔너리) 목록
+    :return: (subject, message_plain)
+    """
+    if len(items) == 1:
+        return build_rate_change_email(*items[0])
+
+    product_names = list(dict.fromkeys(product_name for product_name, _, _ in items))
+    subject = (
+        f"[안내] 고객님이 가입하신 금융상품 {len(product_names)}개의 정보가 변경되었습니다: "
+        f"{product_names[0]}" + (f" 외 {len(product_names) - 1}개" if len(product_names) > 1 else "")
     )
 
-    # DepositOption과 SavingOption 모두 related_name='subscriptions'를 사용합니다.
-    # isintance()를 사용하여 타입을 확인하고 처리하는 것이 더 안전합니다.
-    from .models import (
-        DepositOption,
-        SavingOption,
-    )  # 순환 참조 방지를 위해 함수 내에서 import
-
-    if isinstance(option_instance, DepositOption) or isinstance(
-        option_instance, SavingOption
-    ):
-        subscriptions = option_instance.subscriptions.all()
-    else:
-        subscriptions = []
-
-    sent_emails = set()
-
-    for sub in subscriptions:
-        if sub.user and sub.user.email and sub.user.email not in sent_emails:
-            send_rate_change_email(
-                sub.user.email, product_name, option_info_str, changes
+    sections = []
+    for product_name, option_info, changes in items:
+        changed_items = "\n".join(
+            f"  - {field}: {old_val}% -> {new_val}%" for field, (old_val, new_val) in changes.items()
+        )
+        sections.append(f"[{product_name} ({option_info})]\n{changed_items}")
+    changes_description = "\n\n".join(sections)
+
+    message_plain = f"""
+안녕하세요, 고객님.
+고객님이 가입하신 금융상품의 정보가 다음과 같이 변경되어 안내드립니다.
+
+{changes_description}
+
+항상 저희 Fin Sense를 이용해주셔서 감사합니다.
+    """
+    return subject, message_plain
+
+
+def enqueue_rate_change_emails(option_changes):
+    """
+    금리가 바뀐 옵션들의 가입자에게 보낼 안내 메일을 EmailOutbox 에 저장합니다.
+    한 번의 동기화에서 여러 옵션이 바뀌어도 사용자마다 메일 한 통으로 묶어서 저장합니다.
+    호출한 쪽의 트랜잭션 안에서 저장되므로 금리 변경이 롤백되면 메일도 함께 취소되고,
+    실제 발송은 백그라운드 작업(outbox.drain_email_outbox)이 처리합니다.
+
+    :param option_changes: (옵션 인스턴스, 변경 사항 딕셔너리) 목록
+    :return: 저장한 메일 수
+    """
+    from .models import EmailOutbox  # 순환 참조 방지를 위해 함수 내에서 import
+
+    # 옵션 모델(예금/적금)별로 가입자 이메일을 한 번에 조회
+    options_by_model = {}
+    for option, changes in option_changes:
+        options_by_model.setdefault(type(option), {})[option.pk] = (option, changes)
+
+    items_by_email = {}
+    for option_model, options in options_by_model.items():
+        # DepositOption과 SavingOption 모두 related_name='subscriptions'를 사용합니다.
+        subscription_model = option_model.subscriptions.rel.related_model
+        recipients = (
+            subscription_model.objects.filter(option_id__in=options)
+            .exclude(user__email="")
+            .values_list("option_id", "user__email")
+            .distinct()
+        )
+        for option_id, email in recipients:
+            option, changes = options[option_id]
+            option_info = f"{option.save_trm}개월 - {option.intr_rate_type_nm}"
+            items_by_email.setdefault(email, []).append(
+                (option.product.fin_prdt_nm, option_info, changes)
             )
-            sent_emails.add(sub.user.email)
+
+    messages = []
+    for email, items in items_by_email.items():
+        items.sort(key=lambda item: (item[0], item[1]))
+        subject, body = build_rate_change_digest(items)
+        messages.append(EmailOutbox(to_email=email, subject=subject, body=body))
+
+    EmailOutbox.objects.bulk_create(messages, batch_size=500)
+    return len(messages)
+
+
+def get_subscribers_and_send_emails(option_instance, changes):
+    """
+    옵션에 가입한 사용자들에게 변경 사항 안내 메일을 발송 대기열에 넣습니다.
+    """
+    return enqueue_rate_change_emails([(option_instance, changes)])
@@ -1,8 +1,11 @@
-from django.shortcuts import render
+import base64
+import binascii
+import json
+from decimal import Decimal
+
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework import status
-from django.conf import settings
 from .models import (
     DepositProduct,
     DepositOption,
@@ -10,276 +13,84 @@ from .models import (
     SavingOption,
     DepositSubscription,
     SavingSubscription,
+    DepositOptionRateHistory,
+    SavingOptionRateHistory,
+    FinancialCompany,
+    ProductChange,
+    SyncRun,
 )
 from .serializers import (
     DepositProductSerializer,
-    DepositOptionSerializer,
     SavingProductSerializer,
-    SavingOptionSerializer,
-    DepositSubscriptionSerializer,
-    SavingSubscriptionSerializer,
+    FinancialCompanySerializer,
+    SyncRunSerializer,
+)
+from .catalog import get_catalog_version
+from .jobs import enqueue_sync_run
+from .conditions import CONDITION_LABELS, rank_achievable_rates
+from .facets import ProductFilters, get_facets, get_list_param
+from .idempotency import idempotent
+from .portfolio import get_portfolio
+from .projection import get_portfolio_projection
+from .search import get_search_index
+from .snapshot import (
+    ProductCatalog,
+    build_etag,
+    get_catalog_snapshot,
+    sort_key,
+    subscription_fingerprint,
+)
+from .simulation import (
+    DEFAULT_LIMIT as DEFAULT_SIMULATION_LIMIT,
+    MAX_LIMIT as MAX_SIMULATION_LIMIT,
+    simulate,
 )
-import requests
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, FloatField
-from django.db.models.functions import Cast
-from rest_framework.filters import OrderingFilter
-from django.db.models import F, ExpressionWrapper, Max
-
-# 금융위원회 API 키 설정
-FIN_API_KEY = settings.FIN_API_KEY
-
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.exceptions import NotFound
+from django.utils.http import parse_etags
+from django.db import connection
+from django.db.models import Avg, CharField, Count, Max, Value
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 @api_view(["GET"])
 @permission_classes([AllowAny])  # 인증 제외
 def save_deposit_products(request):
     """
-    금융위원회 API에서 예금 상품 정보를 가져와서 데이터베이스에 저장하는 함수
+    예금 상품 동기화 실행을 등록하고 실행 ID를 반환하는 함수
+    (금감원 API 조회와 DB 적재는 스케줄러 작업에서 처리, 진행 상황은 sync-runs/<id>/ 로 확인)
     """
-    try:
-        base_lst = []
-        option_lst = []
-
-        # 4페이지까지의 데이터를 가져옴
-        for page_no in range(1, 5):  # 1~4 페이지까지 가져오기
-            # 금융위원회 API 호출
-            r = requests.get(
-                f"http://finlife.fss.or.kr/finlifeapi/depositProductsSearch.json?auth={FIN_API_KEY}&topFinGrpNo=020000&pageNo={page_no}"
-            )
-            response = r.json()
-
-            if "result" not in response:
-                continue
-
-            page_base_lst = response.get("result", {}).get("baseList", [])
-            page_option_lst = response.get("result", {}).get("optionList", [])
-
-            if page_base_lst and page_option_lst:
-                base_lst.extend(page_base_lst)
-                option_lst.extend(page_option_lst)
-
-        if not base_lst or not option_lst:
-            return Response(
-                {"error": "No data available"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        result = save_deposit_data(base_lst, option_lst)
-
-        return Response(
-            {
-                "message": f"예금 상품 정보 저장 성공",
-                "details": {
-                    "total_products": len(base_lst),
-                    "new_products": result["new_products"],
-                    "updated_products": result["updated_products"],
-                },
-            },
-            status=status.HTTP_200_OK,
-        )
-    except requests.exceptions.RequestException as e:
-        return Response(
-            {"error": "Failed to fetch data from API"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-def save_deposit_data(base_lst, option_lst):
-    """
-    API에서 받아온 예금 상품 정보를 데이터베이스에 저장하는 함수
-    """
-    # 기존 상품 코드 목록 가져오기
-    existing_product_codes = set(
-        DepositProduct.objects.values_list("fin_prdt_cd", flat=True)
+    run = enqueue_sync_run("deposit")
+    return Response(
+        {"message": "예금 상품 동기화가 등록되었습니다.", "run_id": run.pk, "status": run.status},
+        status=status.HTTP_202_ACCEPTED,
     )
 
-    # 새로운 상품 개수 카운트
-    new_products_count = 0
-    updated_products_count = 0
-
-    for entry in base_lst:
-        # DepositProduct 모델 필드에 맞게 API 응답 필드 매핑
-        product_data = {
-            "kor_co_nm": entry.get("kor_co_nm"),
-            "fin_prdt_nm": entry.get("fin_prdt_nm"),
-            "join_way": entry.get("join_way"),
-            "mtrt_int": entry.get("mtrt_int"),
-            "spcl_cnd": entry.get("spcl_cnd"),
-            "join_deny": entry.get("join_deny"),
-            "join_member": entry.get("join_member"),
-            "etc_note": entry.get("etc_note"),
-            "max_limit": entry.get("max_limit"),
-            "dcls_strt_day": entry.get("dcls_strt_day"),
-            "dcls_end_day": entry.get("dcls_end_day"),
-            "fin_co_subm_day": entry.get("fin_co_subm_day"),
-        }
-
-        # 상품 코드가 이미 존재하는지 확인
-        is_new = entry["fin_prdt_cd"] not in existing_product_codes
-
-        # 상품 생성 또는 업데이트
-        product, created = DepositProduct.objects.update_or_create(
-            fin_prdt_cd=entry["fin_prdt_cd"],
-            defaults=product_data,
-        )
-
-        if created:
-            new_products_count += 1
-        else:
-            updated_products_count += 1
-
-    # 옵션 데이터 처리
-    for entry in option_lst:
-        try:
-            parent_product = DepositProduct.objects.get(
-                fin_prdt_cd=entry["fin_prdt_cd"]
-            )
-            # DepositOption 모델 필드에 맞게 API 응답 필드 매핑
-            option_data = {
-                "intr_rate_type": entry.get("intr_rate_type"),
-                "intr_rate_type_nm": entry.get("intr_rate_type_nm"),
-                "save_trm": entry.get("save_trm"),
-                "intr_rate": entry.get("intr_rate"),
-                "intr_rate2": entry.get("intr_rate2"),
-            }
-            # 숫자형 필드, 필수 필드에 대한 유효성 검사 및 형 변환 강화
-            for key in ["intr_rate", "intr_rate2"]:
-                if option_data[key] is None:
-                    option_data[key] = 0.0  # None 대신 0.0으로 설정
-                else:
-                    try:
-                        option_data[key] = float(option_data[key])
-                    except (ValueError, TypeError):
-                        option_data[key] = 0.0
-
-            DepositOption.objects.update_or_create(
-                product=parent_product,
-                intr_rate_type=option_data["intr_rate_type"],
-                save_trm=option_data["save_trm"],
-                defaults=option_data,
-            )
-        except DepositProduct.DoesNotExist:
-            print(
-                f"Warning: Product with code {entry['fin_prdt_cd']} not found for option"
-            )
-            continue
-        except Exception as e:
-            print(f"Error saving option for product {entry['fin_prdt_cd']}: {str(e)}")
-            continue
-
-    return {
-        "new_products": new_products_count,
-        "updated_products": updated_products_count,
-    }
-
 
 @api_view(["GET"])
 @permission_classes([AllowAny])  # 인증 제외
 def save_saving_products(request):
     """
-    금융위원회 API에서 적금 상품 정보를 가져와서 데이터베이스에 저장하는 함수
+    적금 상품 동기화 실행을 등록하고 실행 ID를 반환하는 함수
+    (금감원 API 조회와 DB 적재는 스케줄러 작업에서 처리, 진행 상황은 sync-runs/<id>/ 로 확인)
     """
-    api_url = f"http://finlife.fss.or.kr/finlifeapi/savingProductsSearch.json?auth={FIN_API_KEY}&topFinGrpNo=020000&pageNo=1"
-    try:
-        response = requests.get(api_url)
-        response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
-        data = response.json()
-
-        if "result" not in data:
-            return Response(
-                {"error": "Invalid API response format from savingProductsSearch"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        base_list = data.get("result", {}).get("baseList", [])
-        option_list = data.get("result", {}).get("optionList", [])
-
-        if not base_list:
-            return Response(
-                {"error": "No base data available for saving products"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        # 옵션 리스트는 비어있을 수도 있음 (상품은 있으나 옵션 정보가 없는 경우)
-
-        save_saving_data(base_list, option_list)
-
-        return Response(
-            {"message": "적금 상품 정보 저장 성공"}, status=status.HTTP_200_OK
-        )
-    except requests.exceptions.RequestException as e:
-        return Response(
-            {"error": f"Failed to fetch saving products data from API: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-    except Exception as e:
-        return Response(
-            {
-                "error": f"An unexpected error occurred while saving saving products: {str(e)}"
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
+    run = enqueue_sync_run("saving")
+    return Response(
+        {"message": "적금 상품 동기화가 등록되었습니다.", "run_id": run.pk, "status": run.status},
+        status=status.HTTP_202_ACCEPTED,
+    )
 
-def save_saving_data(base_list, option_list):
-    """
-    API에서 받아온 적금 상품 정보를 데이터베이스에 저장하는 함수
-    """
-    for entry in base_list:
-        product_data = {
-            "kor_co_nm": entry.get("kor_co_nm"),
-            "fin_prdt_nm": entry.get("fin_prdt_nm"),
-            "join_way": entry.get("join_way"),
-            "mtrt_int": entry.get("mtrt_int"),
-            "spcl_cnd": entry.get("spcl_cnd"),
-            "join_deny": entry.get("join_deny"),
-            "join_member": entry.get("join_member"),
-            "etc_note": entry.get("etc_note"),
-            "max_limit": entry.get("max_limit"),
-            "dcls_strt_day": entry.get("dcls_strt_day"),
-            "dcls_end_day": entry.get("dcls_end_day"),
-            "fin_co_subm_day": entry.get("fin_co_subm_day"),
-            # 적금 특화 필드 추가
-            "rsrv_type": entry.get("rsrv_type"),
-            "rsrv_type_nm": entry.get("rsrv_type_nm"),
-        }
-        SavingProduct.objects.update_or_create(
-            fin_prdt_cd=entry["fin_prdt_cd"],
-            defaults=product_data,
-        )
 
-    for entry in option_list:
-        try:
-            parent_product = SavingProduct.objects.get(fin_prdt_cd=entry["fin_prdt_cd"])
-            option_data = {
-                "intr_rate_type": entry.get("intr_rate_type"),
-                "intr_rate_type_nm": entry.get("intr_rate_type_nm"),
-                "save_trm": entry.get("save_trm"),
-                "intr_rate": entry.get("intr_rate"),
-                "intr_rate2": entry.get("intr_rate2"),
-                # 적금 옵션 특화 필드 추가
-                "acc_type_nm": entry.get("acc_type_nm"),
-            }
-            for key in ["intr_rate", "intr_rate2"]:
-                if option_data[key] is None:
-                    option_data[key] = None
-
-            SavingOption.objects.update_or_create(
-                product=parent_product,
-                intr_rate_type=option_data["intr_rate_type"],
-                save_trm=option_data["save_trm"],
-                defaults=option_data,
-            )
-        except SavingProduct.DoesNotExist:
-            # 로깅 권장: print(f"Warning: Saving product with code {entry['fin_prdt_cd']} not found for option. Skipping option.")
-            continue
-        except Exception as e:
-            # 로깅 권장: print(f"Error saving saving option for product {entry['fin_prdt_cd']}: {str(e)}")
-            continue
+# 상품 동기화 실행 상태 조회
+class SyncRunDetailAPIView(generics.RetrieveAPIView):
+    queryset = SyncRun.objects.all()
+    serializer_class = SyncRunSerializer
+    permission_classes = [AllowAny]
 
 
 # 사용자가 특정 예금 상품에 가입
@@ -358,10 +169,16 @@ def saving_product_subscribe(request, product_code):
 @permission_classes([IsAuthenticated])
 def subscribed_deposit_products_list(request):
     user = request.user
-    subscriptions = DepositSubscription.objects.filter(user=user)
-    print("subscriptions",subscriptions)
+    # 상품과 옵션/조건 태그를 함께 읽어 가입 건마다 상품을 다시 조회하지 않음
+    subscriptions = DepositSubscription.objects.filter(user=user).select_related("product").prefetch_related(
+        "product__options", "product__condition_tags"
+    )
     subscribed_products = [sub.product for sub in subscriptions]
-    serializer = DepositProductSerializer(subscribed_products, many=True)
+    serializer = DepositProductSerializer(
+        subscribed_products,
+        many=True,
+        context={"subscribed_codes": {product.fin_prdt_cd for product in subscribed_products}},
+    )
     return Response(serializer.data)
 
 
@@ -370,9 +187,15 @@ def subscribed_deposit_products_list(request):
 @permission_classes([IsAuthenticated])
 def subscribed_saving_products_list(request):
     user = request.user
-    subscriptions = SavingSubscription.objects.filter(user=user)
+    subscriptions = SavingSubscription.objects.filter(user=user).select_related("product").prefetch_related(
+        "product__options", "product__condition_tags"
+    )
     subscribed_products = [sub.product for sub in subscriptions]
-    serializer = SavingProductSerializer(subscribed_products, many=True)
+    serializer = SavingProductSerializer(
+        subscribed_products,
+        many=True,
+        context={"subscribed_codes": {product.fin_prdt_cd for product in subscribed_products}},
+    )
     return Response(serializer.data)
 
 
@@ -394,269 +217,541 @@ class StandardResultsSetPagination(PageNumberPagination):
         )
 
 
-# 예금 상품 목록 및 상세 조회
-class DepositProductListAPIView(generics.ListAPIView):
-    serializer_class = DepositProductSerializer
-    permission_classes = [AllowAny]  # 인증 제외
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [OrderingFilter]
-    ordering_fields = ["fin_prdt_nm", "options__intr_rate"]
+class SnapshotCursorPagination:
+    """
+    스냅샷 정렬 순서 위의 커서(키셋) 페이지네이션. (?pagination=cursor 로 시작, 이후 응답의 next 사용)
+    커서에는 마지막 항목의 정렬 키(정렬 필드, 정렬 값, 금융회사명, 상품 코드)를 담고,
+    다음 페이지는 그 키 다음 위치를 이진 탐색해 필터를 통과하는 항목만 page_size 개 모읍니다.
+    전체 개수 계산이나 앞 페이지 건너뛰기가 없으므로 페이지가 깊어져도 응답 시간이 같습니다.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def encode_cursor(self, field, descending, entry):
+        value = entry.sort_values[field]
+        payload = [
+            ("-" if descending else "") + field,
+            None if value is None else str(value),
+            entry.kor_co_nm,
+            entry.code,
+        ]
+        return base64.urlsafe_b64encode(json.dumps(payload, ensure_ascii=False).encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, token, field, descending):
+        """커서를 정렬 키로 바꿉니다. 형식이 잘못됐거나 다른 정렬의 커서이면 ValueError"""
+        try:
+            ordering, value, kor_co_nm, code = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            if not all(isinstance(part, str) for part in (ordering, kor_co_nm, code)):
+                raise ValueError
+            if value is not None and field.startswith("best_"):
+                value = Decimal(value)
+            elif value is not None and not isinstance(value, str):
+                raise ValueError
+        except (TypeError, ValueError, ArithmeticError, binascii.Error):
+            raise ValueError("잘못된 cursor 입니다.")
+        if ordering != ("-" if descending else "") + field:
+            raise ValueError("cursor 가 현재 정렬 순서와 다릅니다.")
+        return sort_key(field, descending, value, kor_co_nm, code)
+
+    def paginate(self, entries, field, descending, accept, request):
+        """
+        :param accept: 필터 함수 (entry -> bool)
+        :return: (페이지 항목 목록, 다음 페이지 링크)
+        """
+        page_size = self.get_page_size(request)
+        start = 0
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            cursor_key = self.decode_cursor(token, field, descending)
+            start = ProductCatalog.position_after(entries, field, descending, cursor_key)
+
+        page = []
+        has_next = False
+        for index in range(start, len(entries)):
+            entry = entries[index]
+            if not accept(entry):
+                continue
+            if len(page) == page_size:
+                has_next = True
+                break
+            page.append(entry)
+
+        next_link = None
+        if has_next:
+            url = request.build_absolute_uri()
+            next_link = replace_query_param(
+                url, self.cursor_query_param, self.encode_cursor(field, descending, page[-1])
+            )
+            next_link = remove_query_param(next_link, "pagination")
+        return page, next_link
+
+
+def get_subscribed_product_codes(request, subscription_model):
+    """
+    로그인한 사용자가 가입한 상품 코드 집합을 한 번의 쿼리로 조회합니다.
+    비로그인 사용자는 빈 집합을 반환합니다.
+    """
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        return set()
+    return set(
+        subscription_model.objects.filter(user=user).values_list("product_id", flat=True)
+    )
+
+
+class FinancialCompanyListAPIView(generics.ListAPIView):
+    """
+    금융회사 목록 (은행 필터 버튼용). ?top_fin_grp_no=020000 으로 권역을 지정할 수 있습니다.
+    """
 
-    def get_serializer_context(self):
-        # 시리얼라이저에 request 객체를 context로 전달
-        return {"request": self.request}
+    serializer_class = FinancialCompanySerializer
+    permission_classes = [AllowAny]
 
     def get_queryset(self):
-        queryset = DepositProduct.objects.all()
-
-        # 은행 필터링
-        bank_id = self.request.query_params.get("bank_id")
-        if bank_id:
-            bank_map = {
-                "2": "국민은행",
-                "3": "신한은행",
-                "4": "우리은행",
-                "5": "하나은행",
-                "6": "농협은행",
-            }
-            bank_name = bank_map.get(bank_id)
-            if bank_name:
-                queryset = queryset.filter(
-                    kor_co_nm__icontains=bank_name
-                )  # 부분 일치로 변경
+        queryset = FinancialCompany.objects.all()
+        top_fin_grp_no = self.request.query_params.get("top_fin_grp_no")
+        if top_fin_grp_no:
+            queryset = queryset.filter(top_fin_grp_no=top_fin_grp_no)
+        return queryset
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+
+
+def with_etag(response, etag, request):
+    response["ETag"] = etag
+    # 매번 재검증하되 본문은 304 로 생략 (로그인 사용자 응답은 공유 캐시에 저장하지 않음)
+    response["Cache-Control"] = "private, no-cache" if request.user.is_authenticated else "no-cache"
+    return response
+
+
+class SnapshotProductMixin:
+    """
+    프로세스 안의 카탈로그 스냅샷으로 상품을 응답하는 공통 로직.
+    ETag 는 카탈로그 버전, 요청 경로/쿼리, 로그인 사용자의 가입 상품 지문으로 만들기 때문에
+    같은 버전에서 같은 요청을 다시 보낸 클라이언트는 DB 조회 없이 304 를 받습니다.
+    """
+
+    product_type = None
+    subscription_model = None
+    # 기본 응답 표현 ("list": 목록용 필드, "detail": 전체 필드)
+    representation = "detail"
+    permission_classes = [AllowAny]  # 인증 제외
+
+    def get_render_options(self, catalog):
+        """
+        ?fields=fin_prdt_cd,fin_prdt_nm,options (sparse fieldset, 상세 필드 중에서 선택)와
+        ?options=compact (옵션을 배열로) 파라미터를 읽습니다.
+        :return: (view, fields, compact)
+        :raises ValueError: 알 수 없는 필드/옵션 형식
+        """
+        fields = None
+        if self.request.query_params.get("fields"):
+            fields = list(
+                dict.fromkeys(
+                    field.strip()
+                    for field in self.request.query_params["fields"].split(",")
+                    if field.strip()
+                )
+            )
+            unknown = [field for field in fields if field not in catalog.field_names]
+            if unknown:
+                raise ValueError(f"알 수 없는 필드입니다: {', '.join(unknown)}")
+        options = self.request.query_params.get("options", "full")
+        if options not in ("full", "compact"):
+            raise ValueError("options 는 full 또는 compact 여야 합니다.")
+        # 필드를 직접 고르면 상세 표현에서 골라 냄
+        view = self.representation if fields is None else "detail"
+        return view, fields, options == "compact"
+
+    def render_error(self, message):
+        return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
+
+    def get_etag(self, snapshot, subscribed_codes):
+        request = self.request
+        return build_etag(
+            snapshot.version,
+            self.product_type,
+            request.path,
+            sorted(request.query_params.lists()),
+            subscription_fingerprint(subscribed_codes),
+        )
+
+    def not_modified(self, etag):
+        return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag, self.request)
+
+
+# 예금/적금 상품 목록 조회 공통 로직
+class BaseProductListAPIView(SnapshotProductMixin, generics.GenericAPIView):
+    """
+    상품 목록 조회 공통 뷰. product_type 속성만 다르게 지정해서 사용합니다.
+    필터/정렬은 스냅샷에 미리 계산해 둔 정렬 순서(적재 시 계산한 best_* 값 기준) 위에서 처리하므로
+    요청당 DB 조회는 카탈로그 버전 확인(+ 로그인 시 가입 상품 코드)뿐입니다.
+    """
+
+    pagination_class = StandardResultsSetPagination
+    ordering_fields = ["fin_prdt_nm", "kor_co_nm", "best_intr_rate", "best_intr_rate2"]
+    # 목록은 긴 설명 텍스트를 뺀 목록용 표현이 기본 (전체 필드는 상세 조회 또는 ?fields=)
+    representation = "list"
 
+    def get(self, request, *args, **kwargs):
+        snapshot = get_catalog_snapshot()
+        catalog = snapshot[self.product_type]
+        try:
+            view, fields, compact = self.get_render_options(catalog)
+        except ValueError as e:
+            return self.render_error(str(e))
+        subscribed_codes = get_subscribed_product_codes(request, self.subscription_model)
+        etag = self.get_etag(snapshot, subscribed_codes)
+        if etag_matches(request, etag):
+            return self.not_modified(etag)
+
+        if self.use_cursor_pagination():
+            try:
+                response = self.get_cursor_page(catalog, subscribed_codes, view, fields, compact)
+            except ValueError as e:
+                return self.render_error(str(e))
+        else:
+            entries = self.filter_entries(catalog)
+            page = self.paginate_queryset(entries)
+            data = [entry.render(subscribed_codes, view, fields, compact) for entry in page]
+            response = self.get_paginated_response(data)
+        if compact:
+            response.data["option_fields"] = catalog.option_fields[view]
+        return with_etag(response, etag, request)
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return "cursor" in params or params.get("pagination") == "cursor"
+
+    def get_cursor_page(self, catalog, subscribed_codes, view, fields, compact):
+        """
+        커서 페이지 응답. ?with_total=true 이면 필터 조합별 전체 수를 함께 반환합니다.
+        (패싯 캐시에 보관되므로 같은 필터로 스크롤하는 동안에는 다시 세지 않음)
+        """
+        entries, field, descending, period_field = self.get_sorted_entries(catalog)
+        filters = ProductFilters.from_request(self.request, catalog, include_terms=False)
+
+        def accept(entry):
+            if period_field and entry.sort_values[period_field] is None:
+                return False
+            return filters.matches(entry)
+
+        paginator = SnapshotCursorPagination()
+        page, next_link = paginator.paginate(entries, field, descending, accept, self.request)
+        data = {
+            "next": next_link,
+            "results": [entry.render(subscribed_codes, view, fields, compact) for entry in page],
+        }
+        if self.request.query_params.get("with_total") in ("1", "true"):
+            total_filters = ProductFilters.from_request(
+                self.request, catalog, include_terms=period_field is not None
+            )
+            data["total"] = get_facets(catalog, total_filters)["total"]
+        return Response(data)
+
+    def get_sorted_entries(self, catalog):
+        """
+        요청의 정렬 순서로 정렬된 스냅샷 항목.
+        :return: (entries, 정렬 필드, 내림차순 여부, 기간별 금리 필드)
+        """
         # 기간 필터링 (period가 'all'이거나 없을 때는 모든 기간의 상품을 보여줌)
+        # 해당 기간 옵션이 있는 상품만 기간별 최고 금리 값이 채워져 있음
+        period_field = None
         period = self.request.query_params.get("period")
         if period and period != "all":
-            period_map = {"6": "6", "12": "12", "24": "24", "36": "36"}
-            period_value = period_map.get(period)
-            if period_value:
-                queryset = queryset.filter(options__save_trm=period_value)
-
-        # 정렬
-        sort_by = self.request.query_params.get("sort_by")
-        if sort_by == "rate":
-            # 금리를 숫자로 변환하여 정렬
-            from django.db.models import F, ExpressionWrapper, FloatField
-
-            queryset = queryset.annotate(
-                rate_value=Cast("options__intr_rate", FloatField())
-            ).order_by(F("rate_value").desc(nulls_last=True), "kor_co_nm")
+            period_field = catalog.model.best_rate_field(period)
+
+        # 정렬 (기간을 지정했으면 그 기간의 최고 금리 기준)
+        ordering = self.get_ordering()
+        if ordering:
+            field, descending = ordering.lstrip("-"), ordering.startswith("-")
+            entries = catalog.ordered(field, descending=descending)
+        elif self.request.query_params.get("sort_by") == "rate":
+            field, descending = period_field or "best_intr_rate", True
+            entries = catalog.orders[field]
         else:
-            queryset = queryset.order_by("kor_co_nm")
+            field, descending = "kor_co_nm", False
+            entries = catalog.orders["kor_co_nm"]
+        return entries, field, descending, period_field
+
+    def filter_entries(self, catalog):
+        entries, _, _, period_field = self.get_sorted_entries(catalog)
+        if period_field:
+            entries = [entry for entry in entries if entry.sort_values[period_field] is not None]
+
+        # 은행(금융회사 코드 여러 개 지정 가능), 이자율 종류, 가입 제한, 우대조건 태그 필터링
+        return ProductFilters.from_request(self.request, catalog, include_terms=False).apply(entries)
+
+    def get_ordering(self):
+        # OrderingFilter 와 같은 ?ordering=-best_intr_rate 형식 (첫 번째 유효한 필드만 사용)
+        for field in self.request.query_params.get("ordering", "").split(","):
+            field = field.strip()
+            if field.lstrip("-") in self.ordering_fields:
+                return field
+        return None
+
+
+class BaseProductDetailAPIView(SnapshotProductMixin, generics.GenericAPIView):
+    """상품 상세 조회 공통 뷰 (스냅샷에서 조회)"""
+
+    def get(self, request, fin_prdt_cd, *args, **kwargs):
+        snapshot = get_catalog_snapshot()
+        catalog = snapshot[self.product_type]
+        entry = catalog.get(fin_prdt_cd)
+        if entry is None:
+            raise NotFound("상품을 찾을 수 없습니다.")
+        try:
+            view, fields, compact = self.get_render_options(catalog)
+        except ValueError as e:
+            return self.render_error(str(e))
+        subscribed_codes = set()
+        if request.user.is_authenticated and self.subscription_model.objects.filter(
+            user=request.user, product_id=fin_prdt_cd
+        ).exists():
+            subscribed_codes.add(fin_prdt_cd)
+        etag = self.get_etag(snapshot, subscribed_codes)
+        if etag_matches(request, etag):
+            return self.not_modified(etag)
+        data = entry.render(subscribed_codes, view, fields, compact)
+        if compact and "options" in data:
+            data["option_fields"] = catalog.option_fields[view]
+        return with_etag(Response(data), etag, request)
 
-        # SQLite에서 작동하는 방식으로 중복 제거
-        return queryset.distinct()
+
+# 예금 상품 목록 및 상세 조회
+class DepositProductListAPIView(BaseProductListAPIView):
+    product_type = "deposit"
+    subscription_model = DepositSubscription
 
 
-class DepositProductDetailAPIView(generics.RetrieveAPIView):
-    queryset = DepositProduct.objects.all()
-    serializer_class = DepositProductSerializer
-    lookup_field = "fin_prdt_cd"  # URL에서 상품 코드로 조회
-    permission_classes = [AllowAny]  # 모든 유저에게 조회 기능 제공
+class DepositProductDetailAPIView(BaseProductDetailAPIView):
+    product_type = "deposit"
+    subscription_model = DepositSubscription
 
 
 # 적금 상품 목록 및 상세 조회
-class SavingProductListAPIView(generics.ListAPIView):
-    serializer_class = SavingProductSerializer
-    permission_classes = [AllowAny]  # 인증 제외
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [OrderingFilter]
-    ordering_fields = ["fin_prdt_nm", "options__intr_rate"]
+class SavingProductListAPIView(BaseProductListAPIView):
+    product_type = "saving"
+    subscription_model = SavingSubscription
 
-    def get_serializer_context(self):
-        # 시리얼라이저에 request 객체를 context로 전달
-        return {"request": self.request}
 
-    def get_queryset(self):
-        queryset = SavingProduct.objects.all()
-
-        # 은행 필터링 (예금과 동일한 로직 사용)
-        bank_id = self.request.query_params.get("bank_id")
-        if bank_id:
-            bank_map = {
-                "2": "국민은행",
-                "3": "신한은행",
-                "4": "우리은행",
-                "5": "하나은행",
-                "6": "농협은행",
-            }
-            bank_name = bank_map.get(bank_id)
-            if bank_name:
-                queryset = queryset.filter(kor_co_nm__icontains=bank_name)
+class SavingProductDetailAPIView(BaseProductDetailAPIView):
+    product_type = "saving"
+    subscription_model = SavingSubscription
 
-        # 기간 필터링 (예금과 동일한 로직 사용)
-        period = self.request.query_params.get("period")
-        if period and period != "all":
-            period_map = {"6": "6", "12": "12", "24": "24", "36": "36"}
-            period_value = period_map.get(period)
-            if period_value:
-                queryset = queryset.filter(options__save_trm=period_value)
-
-        # 정렬 (예금과 동일한 로직 사용)
-        sort_by = self.request.query_params.get("sort_by")
-        if sort_by == "rate":
-            from django.db.models import F, ExpressionWrapper, FloatField
-
-            queryset = queryset.annotate(
-                rate_value=Cast("options__intr_rate", FloatField())
-            ).order_by(F("rate_value").desc(nulls_last=True), "kor_co_nm")
-        else:
-            queryset = queryset.order_by("kor_co_nm")
 
-        return queryset.distinct()
+# 상품 종류별 (옵션 모델, 가입 모델)
+SUBSCRIPTION_SOURCES = {
+    "deposit": (DepositOption, DepositSubscription),
+    "saving": (SavingOption, SavingSubscription),
+}
 
 
-class SavingProductDetailAPIView(generics.RetrieveAPIView):
-    queryset = SavingProduct.objects.all()
-    serializer_class = SavingProductSerializer
-    lookup_field = "fin_prdt_cd"  # URL에서 상품 코드로 조회
-    permission_classes = [AllowAny]  # 모든 유저에게 조회 기능 제공
+def _subscription_amount(request):
+    """가입 금액 (본문의 amount, 없으면 0). 0 이상의 정수가 아니면 ValueError"""
+    amount = request.data.get("amount", 0)
+    amount = int(str(amount or 0).replace(",", ""))
+    if amount < 0:
+        raise ValueError("amount")
+    return amount
 
 
-@api_view(["POST"])
-@permission_classes([IsAuthenticated])
-def subscribe_deposit(request, product_id, option_id):
-    try:
-        product = DepositProduct.objects.get(fin_prdt_cd=product_id)
-        option = DepositOption.objects.get(id=option_id, product=product)
-        amount = request.data.get("amount", 0)
+def _upsert_subscription(option_model, subscription_model, user, product_id, option_id, amount):
+    """
+    가입 행을 INSERT ... SELECT ... ON CONFLICT DO UPDATE 한 문장으로 저장합니다.
+    옵션이 그 상품의 옵션인지는 같은 문장의 SELECT 가 확인하므로, 먼저 조회하고 쓰는 사이에
+    옵션이 삭제되어도 없는 옵션으로 가입되지 않습니다.
+    :return: 저장한 행 수 (옵션이 없으면 0)
+    """
+    quote = connection.ops.quote_name
+    option_meta, meta = option_model._meta, subscription_model._meta
+    columns = {name: quote(meta.get_field(name).column) for name in ("user", "product", "option", "amount")}
+    subscribed_at = meta.get_field("subscribed_at")
+    sql = (
+        f"INSERT INTO {quote(meta.db_table)} "
+        f"({columns['user']}, {columns['product']}, {columns['option']}, {columns['amount']}, "
+        f"{quote(subscribed_at.column)}) "
+        f"SELECT %s, {quote(option_meta.get_field('product').column)}, {quote(option_meta.pk.column)}, %s, %s "
+        f"FROM {quote(option_meta.db_table)} "
+        f"WHERE {quote(option_meta.pk.column)} = %s AND {quote(option_meta.get_field('product').column)} = %s "
+        f"ON CONFLICT ({columns['user']}, {columns['product']}, {columns['option']}) "
+        f"DO UPDATE SET {columns['amount']} = EXCLUDED.{columns['amount']}"
+    )
+    params = [
+        user.pk,
+        meta.get_field("amount").get_db_prep_save(amount, connection),
+        subscribed_at.get_db_prep_save(timezone.now(), connection),
+        option_id,
+        product_id,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def subscription_write(request, product_type, product_id, option_id):
+    """
+    가입/해지 요청 처리.
+    - PUT: 가입 (이미 가입했으면 가입 금액만 갱신). 옵션 확인과 저장을 INSERT ... SELECT 한 문장으로 처리
+    - DELETE: 해지 (가입하지 않았어도 성공). DELETE 한 문장
+    """
+    option_model, subscription_model = SUBSCRIPTION_SOURCES[product_type]
 
-        # 이전의 get_or_create 로직 대신, 가입과 해지를 분리하여 명시적으로 처리
-        try:
-            # 먼저 user와 product, 그리고 프론트에서 넘어온 option_id로 구독 객체를 찾아본다.
-            subscription = DepositSubscription.objects.get(
-                user=request.user, product=product, option=option # option은 options[0].id에 해당하는 객체
-            )
-            # 구독 객체가 존재하면 -> 해지 요청으로 간주하고 삭제
-            subscription.delete()
-            return Response(
-                {"message": f"'{product.fin_prdt_nm}' 상품 가입이 해지되었습니다."},
-                status=status.HTTP_200_OK,
-            )
-        except DepositSubscription.DoesNotExist:
-
-            
-            # 일단 현재 프론트가 options[0].id만 보내므로, 해당 옵션으로만 가입/해지 시도
-            new_subscription = DepositSubscription.objects.create(
-                user=request.user,
-                product=product,
-                option=option, # 프론트에서 받은 options[0].id에 해당하는 옵션
-                amount=amount,
-            )
-            serializer = DepositSubscriptionSerializer(new_subscription)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+    if request.method == "DELETE":
+        # 가입 모델을 참조하는 테이블이 없으므로 조회 없이 DELETE 한 번으로 끝남
+        subscription_model.objects.filter(
+            user=request.user, product_id=product_id, option_id=option_id
+        ).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-    except DepositProduct.DoesNotExist:
+    try:
+        amount = _subscription_amount(request)
+    except (TypeError, ValueError):
         return Response(
-            {"error": "상품을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
+            {"error": "amount 는 0 이상의 정수여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
-    except DepositOption.DoesNotExist:
+    if not _upsert_subscription(option_model, subscription_model, request.user, product_id, option_id, amount):
         return Response(
-            {"error": "상품 옵션을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
+            {"error": "상품 또는 상품 옵션을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
         )
+    product_name = (
+        option_model.objects.filter(id=option_id).values_list("product__fin_prdt_nm", flat=True).first()
+    )
+    return Response(
+        {
+            "product_type": product_type,
+            "fin_prdt_cd": product_id,
+            "option_id": option_id,
+            "amount": amount,
+            "is_subscribed": True,
+            "message": f"'{product_name}' 상품에 가입되었습니다.",
+        },
+        status=status.HTTP_200_OK,
+    )
 
 
-@api_view(["POST"])
+@api_view(["PUT", "DELETE"])
 @permission_classes([IsAuthenticated])
-def subscribe_saving(request, product_id, option_id):
-    try:
-        product = SavingProduct.objects.get(fin_prdt_cd=product_id)
-        option = SavingOption.objects.get(id=option_id, product=product)
-        amount = request.data.get("amount", 0)
+@idempotent
+def subscribe_deposit(request, product_id, option_id):
+    return subscription_write(request, "deposit", product_id, option_id)
 
-        # 구독 정보 조회 또는 생성
-        subscription, created = SavingSubscription.objects.get_or_create(
-            user=request.user,
-            product=product, # product_id로 조회한 상품 객체
-            option=option,   # option_id로 조회한 옵션 객체
-            defaults={"amount": amount},
-        )
 
-        if not created:
-            # 이미 구독 중인 경우 (created == False) -> 해지 처리
-            subscription.delete() # 여기서 subscription 객체가 정확히 해지 대상이어야 함
-            return Response(
-                {"message": f"'{product.fin_prdt_nm}' 상품 가입이 해지되었습니다."},
-                status=status.HTTP_200_OK,
-            )
+@api_view(["PUT", "DELETE"])
+@permission_classes([IsAuthenticated])
+@idempotent
+def subscribe_saving(request, product_id, option_id):
+    return subscription_write(request, "saving", product_id, option_id)
 
-        serializer = SavingSubscriptionSerializer(subscription)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    except SavingProduct.DoesNotExist:
-        return Response(
-            {"error": "상품을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
-        )
-    except SavingOption.DoesNotExist:
-        return Response(
-            {"error": "상품 옵션을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
-        )
+def _holding_to_subscription(holding):
+    """보유 상품 한 건을 기존 subscriptions/ 응답 형식으로 바꿉니다."""
+    return {
+        "id": holding["id"],
+        "subscribed_at": holding["subscribed_at"],
+        "product_type": holding["product_type"],
+        "product_name": holding["fin_prdt_nm"],
+        "bank_name": holding["kor_co_nm"],
+        "interest_rate": holding["intr_rate"],
+        "interest_rate2": holding["intr_rate2"],
+        "period": holding["save_trm"],
+        "rsrv_type_nm": holding["rsrv_type_nm"],
+    }
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def user_subscriptions(request):
-    deposit_subscriptions = DepositSubscription.objects.filter(user=request.user)
-    saving_subscriptions = SavingSubscription.objects.filter(user=request.user)
-
-    deposit_serializer = DepositSubscriptionSerializer(deposit_subscriptions, many=True)
-    saving_serializer = SavingSubscriptionSerializer(saving_subscriptions, many=True)
-
+def get_user_subscriptions(request):
+    """예금/적금 가입 목록 (포트폴리오 UNION 쿼리 한 번으로 조회해 종류별로 나눔)"""
+    holdings = get_portfolio(request.user)
     return Response(
         {
-            "deposit_subscriptions": deposit_serializer.data,
-            "saving_subscriptions": saving_serializer.data,
+            "deposit_subscriptions": [
+                _holding_to_subscription(holding) for holding in holdings if holding["product_type"] == "deposit"
+            ],
+            "saving_subscriptions": [
+                _holding_to_subscription(holding) for holding in holdings if holding["product_type"] == "saving"
+            ],
         }
     )
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_user_subscriptions(request):
-    try:
-        user = request.user
-
-        # 예금 상품 구독 조회
-        deposit_subscriptions = (
-            DepositSubscription.objects.filter(user=user)
-            .select_related("product","option")
-            .values(
-                "id",
-                "subscribed_at",
-                product_name=F("product__fin_prdt_nm"),
-                bank_name=F("product__kor_co_nm"),
-                interest_rate=F("option__intr_rate"),
-                period=F("option__save_trm"),
-            )
-        )
-        # 적금 상품 구독 조회
-        saving_subscriptions = (
-            SavingSubscription.objects.filter(user=user)
-            .select_related("product", "option")
-            .values(
-                "id",
-                "subscribed_at",
-                product_name=F("product__fin_prdt_nm"),
-                bank_name=F("product__kor_co_nm"),
-                interest_rate=F("option__intr_rate"),
-                period=F("option__save_trm"),
-            )
-        )
+def user_portfolio(request):
+    """
+    내 가입 상품 전체 (예금 + 적금)를 상품/옵션/금리/가입 금액과 함께 한 번에 반환합니다.
+    나의 가입 상품 화면은 이 응답 하나로 목록과 금리 비교 차트를 그립니다.
+    """
+    holdings = get_portfolio(request.user)
+    for holding in holdings:
+        holding["fin_prdt_cd"] = holding.pop("product_id")
+        holding["intr_rate"] = _rate_to_float(holding["intr_rate"])
+        holding["intr_rate2"] = _rate_to_float(holding["intr_rate2"])
+        holding["amount"] = int(holding["amount"] or 0)
+    return Response(
+        {
+            "count": len(holdings),
+            "total_amount": sum(holding["amount"] for holding in holdings),
+            "holdings": holdings,
+        },
+        status=status.HTTP_200_OK,
+    )
 
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def portfolio_projection(request):
+    """
+    내 가입 상품 전체의 만기일/만기 수령액과 월별 예상 현금흐름 (납입, 이자, 세금, 만기 지급, 잔액).
+    rate=max 이면 최고 우대금리 기준으로 계산합니다.
+    계산 결과는 가입 내역과 금리가 바뀔 때까지 캐시되며, 결과가 같으면 ETag 로 304 를 반환합니다.
+    """
+    rate = request.query_params.get("rate", "basic")
+    if rate not in ("basic", "max"):
         return Response(
-            {
-                "deposit_subscriptions": list(deposit_subscriptions),
-                "saving_subscriptions": list(saving_subscriptions),
-            }
-        )
-    except Exception as e:
-        print(f"Error in get_user_subscriptions: {str(e)}")
-        return Response(
-            {"error": "구독 정보를 가져오는 중 오류가 발생했습니다."},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {"error": "rate 는 basic 또는 max 여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
 
+    fingerprint, projection = get_portfolio_projection(request.user, rate=rate)
+    etag = f'"p-{fingerprint}"'
+    if etag_matches(request, etag):
+        return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag, request)
+
+    holdings = projection["holdings"]
+    summary = {
+        "count": len(holdings),
+        "principal": sum(holding["principal"] for holding in holdings),
+        "interest": sum(holding["interest"] for holding in holdings),
+        "tax": sum(holding["tax"] for holding in holdings),
+        "maturity_amount": sum(holding["maturity_amount"] for holding in holdings),
+        "next_maturity_date": next(
+            (holding["maturity_date"] for holding in holdings if not holding["matured"]), None
+        ),
+    }
+    return with_etag(
+        Response({"rate": rate, "summary": summary, **projection}, status=status.HTTP_200_OK),
+        etag,
+        request,
+    )
+
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
@@ -692,3 +787,448 @@ def check_saving_subscription_status(request, product_code):
         user=user, product=product_obj
     ).exists()
     return Response({"is_subscribed": is_subscribed}, status=status.HTTP_200_OK)
+
+
+# 가입 상태 일괄 조회에서 종류별로 받을 수 있는 최대 상품 코드 수
+MAX_STATUS_CODES = 200
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def subscription_status(request):
+    """
+    여러 상품의 가입 여부와 가입한 옵션 ID 를 한 번에 조회합니다.
+    요청: {"deposit": ["상품코드", ...], "saving": ["상품코드", ...]} (종류별 최대 200개)
+    응답: {"deposit": {"상품코드": {"is_subscribed": true, "option_ids": [1, 2]}, ...}, "saving": {...}}
+    예금/적금 가입 내역은 UNION ALL 쿼리 한 번으로 읽습니다.
+    """
+    codes = {}
+    for product_type in ("deposit", "saving"):
+        values = request.data.get(product_type) or []
+        if not isinstance(values, list) or not all(isinstance(code, str) for code in values):
+            return Response(
+                {"error": f"{product_type} 는 상품 코드 문자열 목록이어야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(values) > MAX_STATUS_CODES:
+            return Response(
+                {"error": f"한 번에 종류별 최대 {MAX_STATUS_CODES}개까지 조회할 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        codes[product_type] = set(values)
+
+    result = {
+        product_type: {code: {"is_subscribed": False, "option_ids": []} for code in sorted(values)}
+        for product_type, values in codes.items()
+    }
+    querysets = [
+        subscription_model.objects.filter(user=request.user, product_id__in=codes[product_type])
+        .annotate(product_type=Value(product_type, output_field=CharField()))
+        .values_list("product_type", "product_id", "option_id")
+        .order_by()  # 기본 정렬(-subscribed_at)은 UNION 안에서 쓸 수 없으므로 제거
+        for product_type, subscription_model in (
+            ("deposit", DepositSubscription),
+            ("saving", SavingSubscription),
+        )
+        if codes[product_type]
+    ]
+    if querysets:
+        rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+        for product_type, product_id, option_id in rows:
+            item = result[product_type][product_id]
+            item["is_subscribed"] = True
+            if option_id is not None:
+                item["option_ids"].append(option_id)
+    for items in result.values():
+        for item in items.values():
+            item["option_ids"].sort()
+    return Response(result, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def product_catalog_changes(request):
+    """
+    since 버전 이후 추가/변경/삭제된 예금·적금 상품만 반환합니다.
+    클라이언트는 응답의 version 을 저장해 두었다가 다음 요청의 since 로 보냅니다.
+    since=0 이면 전체 카탈로그를 반환합니다 (full=true).
+    """
+    try:
+        since = int(request.query_params.get("since", ""))
+    except ValueError:
+        return Response(
+            {"error": "since 파라미터(정수 카탈로그 버전)가 필요합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if since < 0:
+        return Response(
+            {"error": "since 는 0 이상이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    version = get_catalog_version()
+    full = since == 0
+    changed_codes = {"deposit": set(), "saving": set()}
+    if not full and since < version:
+        for product_type, code in (
+            ProductChange.objects.filter(version__gt=since, version__lte=version)
+            .values_list("product_type", "fin_prdt_cd")
+            .distinct()
+        ):
+            changed_codes[product_type].add(code)
+
+    data = {"since": since, "version": version, "full": full}
+    for product_type, model, subscription_model, serializer_class in (
+        ("deposit", DepositProduct, DepositSubscription, DepositProductSerializer),
+        ("saving", SavingProduct, SavingSubscription, SavingProductSerializer),
+    ):
+        context = {
+            "request": request,
+            "subscribed_codes": get_subscribed_product_codes(request, subscription_model),
+        }
+        codes = changed_codes[product_type]
+        if full:
+            queryset = model.objects.all()
+        else:
+            queryset = model.objects.filter(fin_prdt_cd__in=codes)
+        products = list(
+            queryset.prefetch_related("options", "condition_tags").order_by("fin_prdt_cd")
+        )
+        # 변경 이력이 있지만 지금은 없는 상품 = 삭제된 상품
+        removed = sorted(codes - {product.fin_prdt_cd for product in products})
+        data[f"{product_type}_products"] = {
+            "upserted": serializer_class(products, many=True, context=context).data,
+            "removed": removed,
+        }
+    return Response(data, status=status.HTTP_200_OK)
+
+
+def _positive_int_param(request, name):
+    """양의 정수 쿼리 파라미터를 읽습니다. 없으면 None, 형식이 잘못되면 ValueError"""
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return None
+    value = int(value.replace(",", ""))
+    if value <= 0:
+        raise ValueError(name)
+    return value
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def simulate_products(request):
+    """
+    만기 수령액 계산기.
+    term(개월)이 일치하는 모든 예금 옵션(principal: 예치 금액)과 적금 옵션(monthly: 월 납입액)의
+    세후(15.4%) 만기 수령액을 계산해 세후 이자가 큰 순서로 limit 개를 반환합니다.
+    rate=max 이면 최고 우대금리 기준으로 계산합니다.
+    """
+    try:
+        term = _positive_int_param(request, "term")
+        principal = _positive_int_param(request, "principal")
+        monthly = _positive_int_param(request, "monthly")
+        limit = _positive_int_param(request, "limit") or DEFAULT_SIMULATION_LIMIT
+    except ValueError:
+        return Response(
+            {"error": "term, principal, monthly, limit 은 양의 정수여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if term is None or (principal is None and monthly is None):
+        return Response(
+            {"error": "term 과 principal 또는 monthly 중 하나 이상이 필요합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    rate = request.query_params.get("rate", "basic")
+    if rate not in ("basic", "max"):
+        return Response(
+            {"error": "rate 는 basic 또는 max 여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    version, results = simulate(
+        term,
+        principal=principal,
+        monthly=monthly,
+        rate=rate,
+        limit=min(limit, MAX_SIMULATION_LIMIT),
+    )
+    return Response(
+        {
+            "version": version,
+            "term": term,
+            "principal": principal,
+            "monthly": monthly,
+            "rate": rate,
+            "results": results,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+# 상품 종류별 (상품 모델, 금리 이력 모델)
+RATE_HISTORY_SOURCES = {
+    "deposit": (DepositProduct, DepositOptionRateHistory),
+    "saving": (SavingProduct, SavingOptionRateHistory),
+}
+
+
+def _rate_to_float(value):
+    return None if value is None else round(float(value), 2)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def product_rate_history(request, product_code):
+    """
+    상품의 옵션별 금리 이력을 차트용 열 배열(dates / intr_rate / intr_rate2)로 반환합니다.
+    같은 금융회사의 월별 평균 금리(bank)와, 이 상품이 가진 저축 기간별 전체 시장 월별 평균 금리(terms)를
+    SQL 집계로 함께 반환합니다.
+    ?type=deposit|saving 으로 상품 종류를 지정할 수 있고, ?since=YYYY-MM-DD 로 시작일을 제한할 수 있습니다.
+    """
+    product_type = request.query_params.get("type")
+    if product_type and product_type not in RATE_HISTORY_SOURCES:
+        return Response(
+            {"error": "type 은 deposit 또는 saving 이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    since = None
+    if request.query_params.get("since"):
+        since = parse_date(request.query_params["since"])
+        if since is None:
+            return Response(
+                {"error": "since 는 YYYY-MM-DD 형식이어야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    product = None
+    for kind in [product_type] if product_type else list(RATE_HISTORY_SOURCES):
+        product_model, history_model = RATE_HISTORY_SOURCES[kind]
+        product = product_model.objects.filter(fin_prdt_cd=product_code).first()
+        if product is not None:
+            product_type = kind
+            break
+    if product is None:
+        return Response(
+            {"error": "상품을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    history = history_model.objects.all()
+    if since:
+        history = history.filter(date__gte=since)
+
+    # 옵션별 시계열
+    series = {}
+    for option_id, intr_rate_type, save_trm, date, intr_rate, intr_rate2 in (
+        history.filter(option__product_id=product.fin_prdt_cd)
+        .order_by("option_id", "date")
+        .values_list(
+            "option_id", "option__intr_rate_type", "option__save_trm", "date", "intr_rate", "intr_rate2"
+        )
+    ):
+        item = series.setdefault(
+            option_id,
+            {
+                "option_id": option_id,
+                "intr_rate_type": intr_rate_type,
+                "save_trm": save_trm,
+                "dates": [],
+                "intr_rate": [],
+                "intr_rate2": [],
+            },
+        )
+        item["dates"].append(date.isoformat())
+        item["intr_rate"].append(_rate_to_float(intr_rate))
+        item["intr_rate2"].append(_rate_to_float(intr_rate2))
+
+    # 금융회사 월별 평균 금리 (금융회사 정보가 아직 없으면 금융회사명으로 비교)
+    if product.company_id:
+        bank_history = history.filter(option__product__company_id=product.company_id)
+    else:
+        bank_history = history.filter(option__product__kor_co_nm=product.kor_co_nm)
+    bank = {"months": [], "avg_intr_rate": [], "avg_intr_rate2": [], "max_intr_rate2": [], "changes": []}
+    for row in (
+        bank_history.annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(
+            avg_intr_rate=Avg("intr_rate"),
+            avg_intr_rate2=Avg("intr_rate2"),
+            max_intr_rate2=Max("intr_rate2"),
+            changes=Count("id"),
+        )
+        .order_by("month")
+    ):
+        bank["months"].append(row["month"].strftime("%Y-%m"))
+        bank["avg_intr_rate"].append(_rate_to_float(row["avg_intr_rate"]))
+        bank["avg_intr_rate2"].append(_rate_to_float(row["avg_intr_rate2"]))
+        bank["max_intr_rate2"].append(_rate_to_float(row["max_intr_rate2"]))
+        bank["changes"].append(row["changes"])
+
+    # 이 상품의 저축 기간별 시장 전체 월별 평균 금리
+    terms = {}
+    product_terms = {item["save_trm"] for item in series.values()}
+    for row in (
+        history.filter(option__save_trm__in=product_terms)
+        .annotate(month=TruncMonth("date"))
+        .values("option__save_trm", "month")
+        .annotate(avg_intr_rate=Avg("intr_rate"), avg_intr_rate2=Avg("intr_rate2"))
+        .order_by("option__save_trm", "month")
+    ):
+        item = terms.setdefault(
+            row["option__save_trm"], {"months": [], "avg_intr_rate": [], "avg_intr_rate2": []}
+        )
+        item["months"].append(row["month"].strftime("%Y-%m"))
+        item["avg_intr_rate"].append(_rate_to_float(row["avg_intr_rate"]))
+        item["avg_intr_rate2"].append(_rate_to_float(row["avg_intr_rate2"]))
+
+    return Response(
+        {
+            "fin_prdt_cd": product.fin_prdt_cd,
+            "product_type": product_type,
+            "fin_prdt_nm": product.fin_prdt_nm,
+            "kor_co_nm": product.kor_co_nm,
+            "series": list(series.values()),
+            "bank": bank,
+            "terms": terms,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def product_facets(request):
+    """
+    비교 화면 필터용 패싯 개수 (금융회사, 저축 기간, 이자율 종류, 가입 제한, 우대조건).
+    목록과 같은 필터(bank_id, period, rate_type, join_deny, condition; 여러 값은 쉼표로 구분)를 받아
+    각 패싯은 자기 자신을 뺀 나머지 필터를 적용한 개수를 반환합니다.
+    ?type=deposit|saving (기본: deposit). 결과는 카탈로그 버전이 바뀔 때까지 필터 조합별로 캐시됩니다.
+    """
+    product_type = request.query_params.get("type", "deposit")
+    if product_type not in ("deposit", "saving"):
+        return Response(
+            {"error": "type 은 deposit 또는 saving 이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    snapshot = get_catalog_snapshot()
+    catalog = snapshot[product_type]
+    result = get_facets(catalog, ProductFilters.from_request(request, catalog))
+    return Response(
+        {"version": snapshot.version, "type": product_type, **result},
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def search_products(request):
+    """
+    상품명, 우대조건, 가입대상, 유의사항, 가입방법 전문 검색 (예: ?q=청년, ?q=급여이체).
+    ?type=deposit|saving 으로 상품 종류를, ?limit= 으로 결과 수(기본 20, 최대 100)를 지정할 수 있습니다.
+    """
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return Response(
+            {"error": "검색어(q)가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    product_type = request.query_params.get("type")
+    if product_type and product_type not in ("deposit", "saving"):
+        return Response(
+            {"error": "type 은 deposit 또는 saving 이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        limit = min(int(request.query_params.get("limit", 20)), 100)
+    except ValueError:
+        limit = 20
+
+    count, results = get_search_index().search(query, product_type=product_type, limit=max(limit, 1))
+    return Response(
+        {
+            "query": query,
+            "count": count,
+            "results": [
+                {
+                    "product_type": document.product_type,
+                    "fin_prdt_cd": document.code,
+                    "fin_prdt_nm": document.name,
+                    "kor_co_nm": document.company,
+                    "score": round(score, 3),
+                    "matched_fields": matched_fields,
+                }
+                for score, document, matched_fields in results
+            ],
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def achievable_rates(request):
+    """
+    내 조건으로 받을 수 있는 최고 금리 순위.
+    ?conditions=salary,card,first,online 에 충족하는 우대조건을, ?age= 에 나이를 지정하면
+    적재 시 추출한 우대조건 태그의 우대금리를 기본 금리에 더해(상품의 최고 우대금리 이내) 높은 순으로 반환합니다.
+    ?type=deposit|saving (기본: saving), ?period= 저축 기간, ?limit= 결과 수(기본 20, 최대 100).
+    목록과 같은 필터(bank_id, rate_type, join_deny, condition)도 함께 쓸 수 있습니다.
+    """
+    product_type = request.query_params.get("type", "saving")
+    if product_type not in ("deposit", "saving"):
+        return Response(
+            {"error": "type 은 deposit 또는 saving 이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    conditions = get_list_param(request, "conditions") or set()
+    unknown = conditions - CONDITION_LABELS.keys()
+    if unknown:
+        return Response(
+            {"error": f"알 수 없는 우대조건입니다: {', '.join(sorted(unknown))}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        age = _positive_int_param(request, "age")
+        limit = _positive_int_param(request, "limit") or 20
+    except ValueError:
+        return Response(
+            {"error": "age, limit 은 양의 정수여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    snapshot = get_catalog_snapshot()
+    catalog = snapshot[product_type]
+    rate_field = "best_intr_rate"
+    period = request.query_params.get("period")
+    if period and period != "all":
+        rate_field = catalog.model.best_rate_field(period)
+        if rate_field is None:
+            return Response(
+                {"error": "period 는 6, 12, 24, 36 중 하나여야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    entries = ProductFilters.from_request(request, catalog, include_terms=False).apply(catalog.entries)
+    ranked = rank_achievable_rates(entries, rate_field, conditions, age=age, limit=min(limit, 100))
+    return Response(
+        {
+            "version": snapshot.version,
+            "type": product_type,
+            "conditions": sorted(conditions),
+            "age": age,
+            "period": period if rate_field != "best_intr_rate" else None,
+            "results": [
+                {
+                    "fin_prdt_cd": entry.code,
+                    "fin_prdt_nm": entry.data["fin_prdt_nm"],
+                    "kor_co_nm": entry.kor_co_nm,
+                    "base_rate": _rate_to_float(base_rate),
+                    "bonus_rate": _rate_to_float(bonus_rate),
+                    "achievable_rate": _rate_to_float(rate),
+                    "max_rate": _rate_to_float(entry.sort_values["best_intr_rate2"]),
+                    "met_conditions": met,
+                    "unpriced_conditions": unpriced,
+                }
+                for entry, (rate, base_rate, bonus_rate, met, unpriced) in ranked
+            ],
+        },
+        status=status.HTTP_200_OK,
+    )